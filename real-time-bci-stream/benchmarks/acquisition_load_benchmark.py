@@ -0,0 +1,335 @@
+"""
+Load benchmark for the acquisition layer: BrainFlowBoardSetup and the consumers built on it.
+
+Drives BrainFlowBoardSetup with SYNTHETIC_BOARD (16 channels at 250 Hz) and with PLAYBACK_FILE_BOARD replaying
+generated files at any channel count and sampling rate up to 32 channels x 1000 Hz (the offline dataset's format).
+For every configuration, each consumer runs in its own thread, as it does in the games, and the benchmark reports:
+    - read latency: duration of the get_current_board_data() call and age of the newest sample (percentiles)
+    - processing time per update (percentiles) and CPU use of each consumer thread
+    - peak memory per update (peak memory traced above the baseline during one update, measured afterwards under
+      tracemalloc): the working set an update needs, not the total it allocates
+    - stream health (dropped samples, effective rate) and CPU use of the whole process
+
+Consumers:
+    cursor      BoardCursor reads every 20 ms (the acquisition layer alone)
+    band_power  2 s window every 200 ms, per-channel Welch band powers (Red-Light-Green-Light realtime_bandpower_plot.py)
+    cca         1000-sample window every 500 ms, bandpass + sklearn CCA at 5/10/15/20 Hz (Maze-With-Mind final.py),
+                on all configured channels rather than the game's 3 so the cost scales with the channel count
+
+Usage (from the repository root):
+    python real-time-bci-stream/benchmarks/acquisition_load_benchmark.py --channels 8 32 --rates 250 1000 --json load.json
+"""
+import argparse
+import importlib.metadata
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+
+EXAMPLE_SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "example-scripts"))
+sys.path.insert(0, EXAMPLE_SCRIPTS_DIR)
+
+from brainflow.board_shim import BoardIds, BoardShim
+from brainflow.data_filter import DataFilter
+
+from brainflow_stream import BrainFlowBoardSetup, get_board_descr
+
+# Smallest board layout with at least this many EEG channels, used as master board for playback files
+PLAYBACK_MASTER_BOARDS = (
+    (8, BoardIds.CYTON_BOARD.value),
+    (16, BoardIds.CYTON_DAISY_BOARD.value),
+    (32, BoardIds.FREEEEG32_BOARD.value),
+)
+SSVEP_FREQS = (5, 10, 15, 20)
+PERCENTILES = (50, 95, 99)
+
+
+#######
+# Consumers (copies of the processing done by the submissions, so their imports stay out of the benchmark)
+######
+def band_power_update(eeg, sfreq):
+    """
+    One update of realtime_bandpower_plot.py: DC removal and per-channel Welch band powers.
+    """
+    from scipy.signal import welch
+
+    eeg = eeg - np.mean(eeg, axis=1, keepdims=True)
+    bands = {"delta": (1, 4), "theta": (4, 8), "alpha": (8, 12), "beta": (12, 30), "gamma": (30, 100)}
+    band_powers = {band: np.zeros(eeg.shape[0]) for band in bands}
+    for ch in range(eeg.shape[0]):
+        seg = max(min(256, eeg.shape[1]), 64)
+        freqs, psd = welch(eeg[ch], sfreq, nperseg=seg)
+        for band, (low, high) in bands.items():
+            idx = (freqs >= low) & (freqs <= high)
+            band_powers[band][ch] = np.trapezoid(psd[idx], freqs[idx]) if np.any(idx) else 0.0
+    return band_powers
+
+
+def cca_update(eeg, sfreq):
+    """
+    One update of the Maze-With-Mind CCA loop: DC removal, 5-30 Hz bandpass and sklearn CCA per frequency.
+    """
+    from scipy.signal import butter, filtfilt
+    from sklearn.cross_decomposition import CCA
+    from sklearn.preprocessing import StandardScaler
+
+    eeg = eeg - np.mean(eeg, axis=1, keepdims=True)
+    b, a = butter(4, [5.0 / (0.5 * sfreq), 30.0 / (0.5 * sfreq)], btype="band")
+    filtered = filtfilt(b, a, eeg, axis=1)
+    t = np.arange(filtered.shape[1]) / sfreq
+    xs = StandardScaler().fit_transform(filtered.T)
+    scores = {}
+    for f in SSVEP_FREQS:
+        ref = np.column_stack([np.sin(2 * np.pi * f * t), np.cos(2 * np.pi * f * t),
+                               np.sin(2 * np.pi * 2 * f * t), np.cos(2 * np.pi * 2 * f * t)])
+        rs = StandardScaler().fit_transform(ref)
+        u, v = CCA(n_components=1).fit_transform(xs, rs)
+        scores[f] = float(np.abs(np.corrcoef(u[:, 0], v[:, 0])[0, 1]))
+    return scores
+
+
+# name: (update function, window in seconds or None for samples, window samples, interval in seconds)
+CONSUMERS = {
+    "cursor": (None, None, None, 0.02),
+    "band_power": (band_power_update, 2.0, None, 0.2),
+    "cca": (cca_update, None, 1000, 0.5),
+}
+
+
+class ConsumerThread(threading.Thread):
+    """
+    Runs one consumer against a board on a fixed schedule and records per-update timings.
+    """
+
+    def __init__(self, name, board_setup, eeg_rows, sfreq, stop_event):
+        super().__init__(name=f"consumer {name}", daemon=True)
+        self.consumer = name
+        self.update_fn, window_s, window_samples, self.interval = CONSUMERS[name]
+        self.window = window_samples or int((window_s or 0) * sfreq)
+        self.board_setup = board_setup
+        self.eeg_rows = eeg_rows
+        self.sfreq = sfreq
+        self.stop_event = stop_event
+        self.read_us = []
+        self.process_ms = []
+        self.sample_age_ms = []
+        self.cpu_s = 0.0
+        self.errors = 0
+        self.last_window = None
+
+    def run(self):
+        timestamp_channel = self.board_setup.timestamp_channel
+        cursor = self.board_setup.create_cursor() if self.update_fn is None else None
+        cpu_start = time.thread_time()
+        next_update = time.perf_counter()
+        while not self.stop_event.is_set():
+            t0 = time.perf_counter()
+            data = cursor.read() if cursor is not None else self.board_setup.get_current_board_data(self.window)
+            t1 = time.perf_counter()
+            if data is not None and data.shape[1] > 0 and (cursor is not None or data.shape[1] == self.window):
+                self.read_us.append((t1 - t0) * 1e6)
+                self.sample_age_ms.append((time.time() - data[timestamp_channel, -1]) * 1000)
+                if self.update_fn is not None:
+                    eeg = data[self.eeg_rows, :]
+                    try:
+                        self.update_fn(eeg, self.sfreq)
+                    except Exception:
+                        self.errors += 1
+                    self.process_ms.append((time.perf_counter() - t1) * 1000)
+                    self.last_window = eeg
+            next_update = max(next_update + self.interval, time.perf_counter())
+            self.stop_event.wait(next_update - time.perf_counter())
+        self.cpu_s = time.thread_time() - cpu_start
+
+
+def make_playback_file(path, master_board, channels, rate, seconds, seed=0):
+    """
+    Writes a BrainFlow playback file with the master board's row layout and timestamps spaced at the given rate.
+
+    The signal is white noise plus a 10 Hz alpha rhythm and a 15 Hz SSVEP, in microvolts.
+    """
+    descr = get_board_descr(master_board)
+    n_samples = int(seconds * rate)
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_samples) / rate
+    data = np.zeros((descr["num_rows"], n_samples))
+    eeg_rows = descr["eeg_channels"][:channels]
+    data[eeg_rows] = 10 * rng.standard_normal((len(eeg_rows), n_samples)) + 5 * np.sin(2 * np.pi * 10 * t) \
+        + 3 * np.sin(2 * np.pi * 15 * t)
+    data[descr["package_num_channel"]] = np.arange(n_samples) % 256
+    data[descr["timestamp_channel"]] = time.time() + t
+    DataFilter.write_file(data, path, "w")
+
+
+def percentiles(values):
+    """
+    Returns the benchmark percentiles of a list of values, or None for an empty list.
+    """
+    if not values:
+        return None
+    return {f"p{p}": float(np.percentile(values, p)) for p in PERCENTILES}
+
+
+def measure_peak_memory(update_fn, window, sfreq, repeats):
+    """
+    Measures the peak memory traced during one update, averaged over repeats (tracemalloc slows code down a lot,
+    so this is done after the timed run).
+    """
+    update_fn(window, sfreq)  # imports and caches outside the measurement
+    tracemalloc.start()
+    peaks = []
+    for _ in range(repeats):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        update_fn(window, sfreq)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+    return float(np.mean(peaks))
+
+
+def run_config(board, channels, rate, args, tmp_dir):
+    """
+    Runs every consumer against one board configuration and collects the results.
+    """
+    BoardShim.disable_board_logger()
+    if board == "synthetic":
+        board_setup = BrainFlowBoardSetup(board_id=BoardIds.SYNTHETIC_BOARD.value, serial_port="", name="synthetic")
+        channels = len(board_setup.eeg_channels)
+        rate = board_setup.sampling_rate
+    else:
+        master_board = next(board_id for n, board_id in PLAYBACK_MASTER_BOARDS if n >= channels)
+        path = os.path.join(tmp_dir, f"playback_{channels}x{rate}.csv")
+        make_playback_file(path, master_board, channels, rate, args.warmup + args.duration + 5)
+        board_setup = BrainFlowBoardSetup(board_id=BoardIds.PLAYBACK_FILE_BOARD.value, master_board=master_board,
+                                          name="playback", file=path)
+        # The file is replayed at the rate of its timestamps, not at the master board's nominal rate
+        board_setup.sampling_rate = rate
+        board_setup.health.sampling_rate = rate
+    board_setup.setup()
+    if board_setup.board is None:
+        raise RuntimeError(f"Could not start the {board} board.")
+
+    eeg_rows = list(board_setup.eeg_channels[:channels])
+    stop_event = threading.Event()
+    threads = [ConsumerThread(name, board_setup, eeg_rows, rate, stop_event) for name in args.consumers]
+    try:
+        # One untimed update per consumer, so imports and first-call caches are not counted
+        for thread in threads:
+            if thread.update_fn is not None:
+                thread.update_fn(np.random.default_rng(0).standard_normal((len(eeg_rows), thread.window)), rate)
+        time.sleep(args.warmup)
+        board_setup.health.reset()
+        process_cpu_start = time.process_time()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(args.duration)
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        process_cpu = time.process_time() - process_cpu_start
+        stream = board_setup.get_stream_stats()
+    finally:
+        board_setup.stop()
+
+    consumers = {}
+    for thread in threads:
+        calls = len(thread.read_us)
+        result = {
+            "updates": calls,
+            "updates_per_s": calls / elapsed,
+            "errors": thread.errors,
+            "read_us": percentiles(thread.read_us),
+            "sample_age_ms": percentiles(thread.sample_age_ms),
+            "process_ms": percentiles(thread.process_ms),
+            "cpu_fraction": thread.cpu_s / elapsed,
+            "cpu_ms_per_update": thread.cpu_s * 1000 / calls if calls else None,
+        }
+        if thread.update_fn is not None and thread.last_window is not None and args.memory_repeats > 0:
+            peak = measure_peak_memory(thread.update_fn, thread.last_window, rate, args.memory_repeats)
+            result["peak_kb_per_update"] = peak / 1024
+        consumers[thread.consumer] = result
+
+    return {
+        "board": board,
+        "channels": channels,
+        "sampling_rate": rate,
+        "duration_s": elapsed,
+        "process_cpu_fraction": process_cpu / elapsed,
+        "stream": stream,
+        "consumers": consumers,
+    }
+
+
+def print_result(result):
+    print(f"\n{result['board']}: {result['channels']} ch x {result['sampling_rate']} Hz | process CPU "
+          f"{result['process_cpu_fraction'] * 100:.1f}% | {result['stream']['dropped_samples']} dropped | "
+          f"{result['stream']['effective_rate'] or 0:.1f} Hz effective")
+    for name, consumer in result["consumers"].items():
+        read = consumer["read_us"] or {}
+        age = consumer["sample_age_ms"] or {}
+        process = consumer["process_ms"] or {}
+        line = (f"    {name:<11} {consumer['updates_per_s']:6.1f} upd/s | read p50/p99 {read.get('p50', 0):7.1f}/"
+                f"{read.get('p99', 0):7.1f} us | age p50 {age.get('p50', 0):6.1f} ms | CPU "
+                f"{consumer['cpu_fraction'] * 100:5.1f}%")
+        if process:
+            line += f" | process p50/p99 {process['p50']:7.2f}/{process['p99']:7.2f} ms"
+        if "peak_kb_per_update" in consumer:
+            line += f" | peak {consumer['peak_kb_per_update']:8.1f} kB/upd"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how BrainFlowBoardSetup and its consumers scale with load")
+    parser.add_argument("--boards", nargs="+", choices=("synthetic", "playback"), default=["synthetic", "playback"])
+    parser.add_argument("--channels", nargs="+", type=int, default=[8, 16, 32], help="Playback channel counts (<= 32)")
+    parser.add_argument("--rates", nargs="+", type=int, default=[250, 500, 1000], help="Playback sampling rates")
+    parser.add_argument("--consumers", nargs="+", choices=tuple(CONSUMERS), default=list(CONSUMERS))
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds measured per configuration")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds streamed before measuring")
+    parser.add_argument("--memory-repeats", type=int, default=5, help="Updates measured under tracemalloc (0 to skip)")
+    parser.add_argument("--json", type=str, default=None, help="Write the results to this JSON file")
+    args = parser.parse_args()
+    # sklearn's CCA often stops at its iteration limit on noisy windows, as it does in the game
+    warnings.filterwarnings("ignore", message="Maximum number of iterations reached")
+    if max(args.channels) > PLAYBACK_MASTER_BOARDS[-1][0]:
+        parser.error(f"At most {PLAYBACK_MASTER_BOARDS[-1][0]} channels are supported.")
+
+    configs = []
+    if "synthetic" in args.boards:
+        configs.append(("synthetic", None, None))
+    if "playback" in args.boards:
+        configs += [("playback", channels, rate) for channels in args.channels for rate in args.rates]
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for board, channels, rate in configs:
+            result = run_config(board, channels, rate, args, tmp_dir)
+            print_result(result)
+            results.append(result)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "environment": {
+                    "python": platform.python_version(),
+                    "numpy": np.__version__,
+                    "brainflow": importlib.metadata.version("brainflow"),
+                    "platform": platform.platform(),
+                    "cpu_count": os.cpu_count(),
+                },
+                "settings": vars(args),
+                "results": results,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
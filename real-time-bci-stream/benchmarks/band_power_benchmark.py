@@ -0,0 +1,132 @@
+"""
+Benchmark of BandPowerEngine (band_power.py) against the per-channel Welch loop used by the submissions.
+
+For each channel count, a random window is processed by:
+    loop      realtime_bandpower_plot.compute_band_powers: one scipy welch call and five masked trapezoids per channel
+    engine    BandPowerEngine.compute: one batched Welch PSD and one product with the cached band weights, returning
+              absolute, relative and log powers and the alpha/beta and theta/beta ratios
+and the median time per call, the speed-up and the largest relative difference between the two are reported.
+
+A second table compares, at a live refresh rate (--refresh-hz), recomputing the Welch PSD of the whole window on
+every update (engine) with StreamingWelch, which only transforms the segments completed since the previous update.
+Both use a segment step of sfreq / refresh-hz samples so that the PSD changes on every refresh.
+
+Usage (from the repository root):
+    python real-time-bci-stream/benchmarks/band_power_benchmark.py --channels 8 32 --json band_power.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.signal import welch
+
+EXAMPLE_SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "example-scripts"))
+sys.path.insert(0, EXAMPLE_SCRIPTS_DIR)
+
+from band_power import DEFAULT_BANDS, BandPowerEngine, StreamingWelch
+
+
+def per_channel_band_powers(eeg_data, sfreq, bands=DEFAULT_BANDS, nperseg=256):
+    """
+    The per-channel loop from realtime_bandpower_plot.py.
+    """
+    band_powers = {band: np.zeros(eeg_data.shape[0]) for band in bands}
+    for ch in range(eeg_data.shape[0]):
+        seg = max(min(nperseg, eeg_data.shape[1]), 64)
+        freqs, psd = welch(eeg_data[ch], sfreq, nperseg=seg)
+        for band, (low, high) in bands.items():
+            idx = (freqs >= low) & (freqs <= high)
+            band_powers[band][ch] = np.trapezoid(psd[idx], freqs[idx]) if np.any(idx) else 0.0
+    return band_powers
+
+
+def time_call(fn, repeats):
+    """
+    Returns the median duration of fn() in milliseconds, after one untimed call.
+    """
+    fn()
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        durations.append((time.perf_counter() - start) * 1000)
+    return float(np.median(durations))
+
+
+def time_streaming(n_channels, sfreq, window_samples, nperseg, chunk, n_updates, rng):
+    """
+    Feeds a stream chunk by chunk and returns the mean time per update in milliseconds of a full-window recompute
+    and of StreamingWelch, and the largest relative difference between their final PSDs.
+    """
+    engine = BandPowerEngine(sfreq, nperseg=nperseg, noverlap=nperseg - chunk)
+    streaming = StreamingWelch(engine, n_channels, window_samples)
+    n_window = (streaming.n_segments - 1) * streaming.step + nperseg
+    stream = 10 * rng.standard_normal((n_channels, n_window + chunk * n_updates))
+    streaming.update(stream[:, :n_window])
+
+    full_s = streaming_s = 0.0
+    for i in range(n_updates):
+        end = n_window + (i + 1) * chunk
+        start = time.perf_counter()
+        engine.compute(stream[:, end - n_window:end])
+        full_s += time.perf_counter() - start
+        start = time.perf_counter()
+        streaming.update(stream[:, end - chunk:end])
+        streaming.compute()
+        streaming_s += time.perf_counter() - start
+
+    _, reference = engine.psd(stream[:, -n_window:])
+    max_rel_diff = float(np.max(np.abs(streaming.psd()[1] - reference)) / np.max(reference))
+    return full_s * 1000 / n_updates, streaming_s * 1000 / n_updates, max_rel_diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare BandPowerEngine with the per-channel Welch loop")
+    parser.add_argument("--channels", nargs="+", type=int, default=[8, 32])
+    parser.add_argument("--sfreq", type=float, default=250.0, help="Sampling rate in Hz")
+    parser.add_argument("--window", type=float, default=2.0, help="Window length in seconds")
+    parser.add_argument("--nperseg", type=int, default=256)
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--refresh-hz", type=float, default=30.0, help="Live refresh rate of the streaming comparison")
+    parser.add_argument("--json", type=str, default=None, help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    engine = BandPowerEngine(args.sfreq, nperseg=args.nperseg)
+    results = []
+    for n_channels in args.channels:
+        eeg = 10 * rng.standard_normal((n_channels, int(args.window * args.sfreq)))
+        loop_ms = time_call(lambda: per_channel_band_powers(eeg, args.sfreq, nperseg=args.nperseg), args.repeats)
+        engine_ms = time_call(lambda: engine.compute(eeg), args.repeats)
+
+        reference = per_channel_band_powers(eeg, args.sfreq, nperseg=args.nperseg)
+        absolute = engine.compute(eeg)["absolute"]
+        max_rel_diff = max(float(np.max(np.abs(absolute[:, j] - reference[band]) / np.abs(reference[band])))
+                           for j, band in enumerate(engine.labels))
+
+        results.append({"channels": n_channels, "loop_ms": loop_ms, "engine_ms": engine_ms,
+                        "speedup": loop_ms / engine_ms, "max_rel_diff": max_rel_diff})
+        print(f"{n_channels:3d} channels | loop {loop_ms:7.3f} ms | engine {engine_ms:7.3f} ms | "
+              f"x{loop_ms / engine_ms:5.1f} | max rel. diff {max_rel_diff:.1e}")
+
+    chunk = max(int(round(args.sfreq / args.refresh_hz)), 1)
+    print(f"\nStreaming at {args.refresh_hz:g} Hz ({chunk} new samples per update)")
+    streaming_results = []
+    for n_channels in args.channels:
+        full_ms, streaming_ms, max_rel_diff = time_streaming(n_channels, args.sfreq, int(args.window * args.sfreq),
+                                                             args.nperseg, chunk, args.repeats, rng)
+        streaming_results.append({"channels": n_channels, "full_ms": full_ms, "streaming_ms": streaming_ms,
+                                  "speedup": full_ms / streaming_ms, "max_rel_diff": max_rel_diff})
+        print(f"{n_channels:3d} channels | full {full_ms:7.3f} ms | streaming {streaming_ms:7.3f} ms | "
+              f"x{full_ms / streaming_ms:5.1f} | max rel. diff {max_rel_diff:.1e}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"settings": vars(args), "results": results, "streaming": streaming_results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
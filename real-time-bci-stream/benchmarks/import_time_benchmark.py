@@ -0,0 +1,110 @@
+"""
+Startup benchmark for brainflow_stream.py, based on `python -X importtime`.
+
+Runs a fresh interpreter several times, each one importing brainflow_stream and creating a BrainFlowBoardSetup
+(no board needs to be connected), and reports:
+    - the total import time of brainflow_stream and its slowest dependencies (from -X importtime)
+    - the time to construct the first and a second BrainFlowBoardSetup instance
+
+Usage (from the repository root):
+    python real-time-bci-stream/benchmarks/import_time_benchmark.py --runs 5 --budget-ms 500
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+EXAMPLE_SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "example-scripts"))
+
+# Executed in each child interpreter; prints the construction times as JSON on stdout
+CHILD_SCRIPT = """
+import json, time
+import brainflow_stream
+from brainflow.board_shim import BoardIds
+t0 = time.perf_counter()
+brainflow_stream.BrainFlowBoardSetup(board_id=BoardIds.CYTON_BOARD.value)
+t1 = time.perf_counter()
+brainflow_stream.BrainFlowBoardSetup(board_id=BoardIds.CYTON_BOARD.value)
+t2 = time.perf_counter()
+print(json.dumps({"first_instance_ms": (t1 - t0) * 1000, "second_instance_ms": (t2 - t1) * 1000}))
+"""
+
+
+def parse_importtime(stderr):
+    """
+    Parses the output of `python -X importtime`.
+
+    Args:
+        stderr (str): The stderr output of the interpreter.
+
+    Returns:
+        dict: Module name to (self time, cumulative time) in milliseconds. For modules imported several times
+            (not possible in one interpreter) the last entry wins.
+    """
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us) / 1000, int(cumulative_us) / 1000)
+    return timings
+
+
+def run_once():
+    """
+    Runs one fresh interpreter and collects its timings.
+
+    Returns:
+        tuple: (importtime timings dict, construction timings dict).
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD_SCRIPT], cwd=EXAMPLE_SCRIPTS_DIR,
+                            capture_output=True, text=True, check=True)
+    construction = json.loads(result.stdout.strip().splitlines()[-1])
+    return parse_importtime(result.stderr), construction
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the startup cost of brainflow_stream.py")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters to measure")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest dependencies to list")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="Exit with an error if import + first instance takes longer than this (median)")
+    parser.add_argument("--json", type=str, default=None, help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    run_once()  # warm-up: writes .pyc files and fills the OS file cache
+    runs = [run_once() for _ in range(args.runs)]
+
+    import_ms = statistics.median(timings["brainflow_stream"][1] for timings, _ in runs)
+    first_ms = statistics.median(construction["first_instance_ms"] for _, construction in runs)
+    second_ms = statistics.median(construction["second_instance_ms"] for _, construction in runs)
+    modules = {name: statistics.median(timings[name][1] for timings, _ in runs if name in timings)
+               for name in runs[-1][0]}
+    slowest = sorted(((ms, name) for name, ms in modules.items() if name != "brainflow_stream"), reverse=True)[:args.top]
+
+    print(f"import brainflow_stream:            {import_ms:8.1f} ms (median of {args.runs})")
+    print(f"first BrainFlowBoardSetup(...):     {first_ms:8.1f} ms")
+    print(f"second BrainFlowBoardSetup(...):    {second_ms:8.1f} ms")
+    print(f"slowest imports (cumulative):")
+    for ms, name in slowest:
+        print(f"    {ms:8.1f} ms  {name}")
+
+    results = {
+        "import_ms": import_ms,
+        "first_instance_ms": first_ms,
+        "second_instance_ms": second_ms,
+        "slowest_imports_ms": {name: ms for ms, name in slowest},
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.budget_ms is not None and import_ms + first_ms > args.budget_ms:
+        print(f"Startup took {import_ms + first_ms:.1f} ms, over the budget of {args.budget_ms:.1f} ms.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
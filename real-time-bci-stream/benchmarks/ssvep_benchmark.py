@@ -0,0 +1,212 @@
+"""
+Accuracy and latency benchmark of the SSVEP decoders on synthetic steady-state responses.
+
+Trials are generated for every target frequency: sinusoids at the frequency and its second harmonic, with a random
+phase and a different gain on each channel, buried in 1/f-like (AR(1)) and white noise on top of a DC offset. All
+trials are bandpass filtered once (3 to --highcut Hz, zero phase) as in the games, then decoded by:
+    sklearn_cca   basic_cca from the Maze-With-Mind games: sklearn CCA per frequency against sin/cos at f and 2f
+    cca           ssvep_decoders.basic_cca: the same scores from the closed-form (QR/SVD) canonical correlations;
+                  the sliding update is ssvep_decoders.StreamingCCA, the same scores from running covariances
+    probes        SpectralProbes.scores: Hann-windowed power at f and 2f as SNR against neighboring bins, one matrix
+                  product for all frequencies
+    fbcca_K       ssvep_decoders.fbcca with K sub-bands (one row per --fbcca-bands value); use --highcut 90 so the
+                  upper sub-bands are not emptied by the prefilter
+For every sampling rate, channel count and window length the accuracy and the median time per decision are
+reported, and decisions slower than --budget-ms are flagged. For the probes and CCA, the time of a sliding update
+(--step-ms of new samples, including the decision) is reported as well.
+
+Frequency sets:
+    maze      5, 10, 15, 20 Hz (Maze-With-Mind)
+    flicker   10.00, 10.43, 10.91, 11.43, 12.00, 12.63 Hz (Flicker task of the offline dataset)
+
+Usage (from the repository root):
+    python real-time-bci-stream/benchmarks/ssvep_benchmark.py --freq-set flicker --windows 1 2 4 --json ssvep.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+from scipy.signal import sosfiltfilt
+
+EXAMPLE_SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "example-scripts"))
+sys.path.insert(0, EXAMPLE_SCRIPTS_DIR)
+
+import ssvep_decoders
+from spectral_probes import SpectralProbes
+from streaming_filters import design_bandpass
+
+FREQ_SETS = {
+    "maze": (5.0, 10.0, 15.0, 20.0),
+    "flicker": (10.0, 10.43, 10.91, 11.43, 12.0, 12.63),
+}
+
+
+def basic_cca(eeg_data, sfreq, freqs):
+    """
+    Copy of basic_cca from the Maze-With-Mind games (final.py, finalsim.py, main2.py).
+    """
+    from sklearn.cross_decomposition import CCA
+    from sklearn.preprocessing import StandardScaler
+
+    t = np.arange(eeg_data.shape[1]) / sfreq
+    xs = StandardScaler().fit_transform(eeg_data.T)
+    scores = {}
+    for f in freqs:
+        ref = np.column_stack([np.sin(2 * np.pi * f * t), np.cos(2 * np.pi * f * t),
+                               np.sin(2 * np.pi * 2 * f * t), np.cos(2 * np.pi * 2 * f * t)])
+        rs = StandardScaler().fit_transform(ref)
+        u, v = CCA(n_components=1).fit_transform(xs, rs)
+        scores[f] = float(np.abs(np.corrcoef(u[:, 0], v[:, 0])[0, 1]))
+    return scores
+
+
+def make_sklearn_cca(sfreq, n_samples, freqs):
+    return lambda window: basic_cca(window, sfreq, freqs)
+
+
+def make_cca(sfreq, n_samples, freqs):
+    return lambda window: ssvep_decoders.basic_cca(window, sfreq, freqs)
+
+
+def make_probes(sfreq, n_samples, freqs):
+    return SpectralProbes(sfreq, n_samples, freqs, n_harmonics=2).scores
+
+
+def make_fbcca(n_bands):
+    def factory(sfreq, n_samples, freqs):
+        return ssvep_decoders.FBCCA(sfreq, n_samples, freqs, n_bands=n_bands).scores
+    return factory
+
+
+# name: factory(sfreq, n_samples, freqs) returning a decode(window) -> {freq: score} function
+METHODS = {
+    "sklearn_cca": make_sklearn_cca,
+    "cca": make_cca,
+    "probes": make_probes,
+    "fbcca": None,  # expanded into fbcca_K for every --fbcca-bands value
+}
+
+
+def make_trials(freqs, sfreq, n_channels, n_samples, n_trials, amplitude, rng, highcut=45.0):
+    """
+    Generates bandpass filtered synthetic SSVEP trials.
+
+    Returns:
+        tuple: (trials of shape (n_trials, n_channels, n_samples), target index of each trial).
+    """
+    labels = np.arange(n_trials) % len(freqs)
+    t = np.arange(n_samples) / sfreq
+    trials = np.empty((n_trials, n_channels, n_samples))
+    for i, label in enumerate(labels):
+        f = freqs[label]
+        gains = rng.uniform(0.2, 1.0, (n_channels, 1))
+        phase = rng.uniform(0, 2 * np.pi)
+        response = np.sin(2 * np.pi * f * t + phase) + 0.5 * np.sin(2 * np.pi * 2 * f * t + 2 * phase)
+        white = rng.standard_normal((n_channels, n_samples))
+        drift = np.empty_like(white)
+        drift[:, 0] = white[:, 0]
+        for k in range(1, n_samples):
+            drift[:, k] = 0.95 * drift[:, k - 1] + white[:, k]
+        noise = 0.3 * drift + rng.standard_normal((n_channels, n_samples))
+        trials[i] = 500 + amplitude * gains * response + noise
+    trials = sosfiltfilt(design_bandpass(sfreq, 3.0, min(highcut, 0.45 * sfreq)), trials, axis=-1)
+    return trials, labels
+
+
+def median_ms(durations):
+    return float(np.median(durations) * 1000)
+
+
+def run_configuration(methods, freqs, sfreq, n_channels, window_s, args, rng):
+    """
+    Decodes every trial with every method and times the sliding probe and CCA updates.
+
+    Returns:
+        list: One result dict per method.
+    """
+    n_samples = int(round(window_s * sfreq))
+    n_trials = args.trials
+    trials, labels = make_trials(freqs, sfreq, n_channels, n_samples, n_trials, args.amplitude, rng, args.highcut)
+    factories = {}
+    for name in methods:
+        if name == "fbcca":
+            factories.update({f"fbcca_{k}": make_fbcca(k) for k in args.fbcca_bands})
+        else:
+            factories[name] = METHODS[name]
+    results = []
+    for name, factory in factories.items():
+        decode = factory(sfreq, n_samples, freqs)
+        decode(trials[0])  # warm-up (imports, caches)
+        durations, correct = [], 0
+        for trial, label in zip(trials, labels):
+            start = time.perf_counter()
+            scores = decode(trial)
+            durations.append(time.perf_counter() - start)
+            correct += max(scores, key=scores.get) == freqs[label]
+        results.append({"method": name, "sfreq": sfreq, "channels": n_channels, "window_s": window_s,
+                        "accuracy": correct / n_trials, "decision_ms": median_ms(durations),
+                        "within_budget": median_ms(durations) <= args.budget_ms})
+
+    sliding = {
+        "probes": lambda: SpectralProbes(sfreq, n_samples, freqs, n_harmonics=2),
+        "cca": lambda: ssvep_decoders.StreamingCCA(sfreq, freqs, n_channels, window_samples=n_samples),
+    }
+    step = max(int(round(args.step_ms / 1000 * sfreq)), 1)
+    stream = np.concatenate(list(trials), axis=1)
+    for name in methods:
+        if name not in sliding:
+            continue
+        decoder = sliding[name]()
+        decoder.update(stream[:, :n_samples])
+        durations = []
+        for start in range(n_samples, stream.shape[1] - step + 1, step):
+            t0 = time.perf_counter()
+            decoder.update(stream[:, start:start + step])
+            durations.append(time.perf_counter() - t0)
+        results[list(factories).index(name)]["sliding_update_ms"] = median_ms(durations)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SSVEP decoder accuracy and latency on synthetic data")
+    parser.add_argument("--freq-set", choices=sorted(FREQ_SETS), default="maze")
+    parser.add_argument("--methods", nargs="+", choices=list(METHODS), default=list(METHODS))
+    parser.add_argument("--rates", nargs="+", type=float, default=[250.0])
+    parser.add_argument("--channels", nargs="+", type=int, default=[3, 8])
+    parser.add_argument("--windows", nargs="+", type=float, default=[1.0, 2.0, 4.0], help="Window lengths in s")
+    parser.add_argument("--trials", type=int, default=60)
+    parser.add_argument("--amplitude", type=float, default=0.5, help="SSVEP amplitude relative to white noise")
+    parser.add_argument("--step-ms", type=float, default=100.0, help="New data per sliding update")
+    parser.add_argument("--highcut", type=float, default=45.0, help="Upper edge of the prefilter in Hz")
+    parser.add_argument("--fbcca-bands", nargs="+", type=int, default=[3, 5], help="Sub-band counts for fbcca")
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="Latency budget per decision")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=str, default=None, help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", message=".*did not converge.*")
+    rng = np.random.default_rng(args.seed)
+    freqs = FREQ_SETS[args.freq_set]
+    results = []
+    for sfreq in args.rates:
+        for n_channels in args.channels:
+            for window_s in args.windows:
+                for result in run_configuration(args.methods, freqs, sfreq, n_channels, window_s, args, rng):
+                    results.append(result)
+                    sliding = (f" | sliding update {result['sliding_update_ms']:7.3f} ms"
+                               if "sliding_update_ms" in result else "")
+                    over = "" if result["within_budget"] else " (over budget)"
+                    print(f"{sfreq:6.0f} Hz | {n_channels:2d} ch | {window_s:4.1f} s | {result['method']:12s} | "
+                          f"acc {result['accuracy']:5.2f} | {result['decision_ms']:8.3f} ms{over}{sliding}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"settings": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
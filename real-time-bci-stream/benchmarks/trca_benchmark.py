@@ -0,0 +1,214 @@
+"""
+Leave-one-block-out accuracy and latency of the calibrated TRCA decoder against the calibration-free CCA decoders.
+
+Every block holds one stimulus-locked epoch per stimulation frequency. For every fold, the decoders are fitted on
+the other blocks and score windows of increasing length taken from the start of the held-out epochs:
+    cca      ssvep_decoders.basic_cca (no calibration)
+    fbcca    ssvep_decoders.fbcca with 5 sub-bands (no calibration)
+    trca     ssvep_decoders.TRCA with one spatial filter per frequency
+    etrca    ssvep_decoders.TRCA(ensemble=True): the filters of all frequencies applied to every window
+The accuracy, the median time per decision and the median fitting time are reported for every window length.
+
+Data:
+    synthetic (default) Responses with a subject-specific amplitude and latency per channel and harmonic (3
+                        harmonics), identical across blocks, in 1/f-like and white noise.
+    --fif PATH ...      Flicker recordings of the offline dataset (needs mne). Every 30 s block attends a single
+                        frequency, so the blocks cannot be held out one by one; instead every block is cut into
+                        --segments segments separated by --gap seconds, and segment j of all blocks forms fold j.
+                        These are segment folds, not leave-one-block-out: the decoders still train on other segments
+                        of the held-out segment's block, so the accuracy is optimistic. Segments start a whole number
+                        of cycles of the attended frequency after the block onset, standing in for the
+                        stimulus-locked onsets of a synchronous BCI. Blocks cut short by the end of the recording are
+                        left out.
+
+Usage (from the repository root):
+    python real-time-bci-stream/benchmarks/trca_benchmark.py --windows 0.5 1 2 --json trca.json
+    python real-time-bci-stream/benchmarks/trca_benchmark.py --fif eeg_data/Flicker/sub-010_task-Flicker_eeg.fif
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+from scipy.signal import sosfiltfilt
+
+EXAMPLE_SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "example-scripts"))
+sys.path.insert(0, EXAMPLE_SCRIPTS_DIR)
+
+import ssvep_decoders
+from streaming_filters import design_bandpass
+
+FLICKER_FREQS = (10.0, 10.43, 10.91, 11.43, 12.0, 12.63)
+FLICKER_BLOCK_S = 30.0
+METHODS = ("cca", "fbcca", "trca", "etrca")
+
+
+def make_blocks(freqs, sfreq, n_channels, n_samples, n_blocks, amplitude, rng):
+    """
+    Generates synthetic stimulus-locked epochs of one subject.
+
+    Returns:
+        tuple: (blocks of shape (n_blocks, n_freqs, n_channels, n_samples), frequencies of shape (n_freqs,)).
+    """
+    t = np.arange(n_samples) / sfreq
+    harmonics = np.arange(1, 4)
+    # The subject's response: fixed gains and latencies per channel and harmonic
+    gains = rng.uniform(0.2, 1.0, (n_channels, 1, 1)) / harmonics[:, None]
+    latencies = rng.uniform(0.05, 0.15, (n_channels, 1, 1))
+    blocks = np.empty((n_blocks, len(freqs), n_channels, n_samples))
+    for b in range(n_blocks):
+        for i, f in enumerate(freqs):
+            phases = 2 * np.pi * harmonics[:, None] * f * (t - latencies)
+            response = (gains * np.sin(phases)).sum(axis=1)
+            white = rng.standard_normal((n_channels, n_samples))
+            drift = np.empty_like(white)
+            drift[:, 0] = white[:, 0]
+            for k in range(1, n_samples):
+                drift[:, k] = 0.95 * drift[:, k - 1] + white[:, k]
+            noise = 0.3 * drift + rng.standard_normal((n_channels, n_samples))
+            blocks[b, i] = amplitude * response + noise
+    sos = design_bandpass(sfreq, 6.0, min(90.0, 0.45 * sfreq))
+    return sosfiltfilt(sos, blocks, axis=-1), np.asarray(freqs)
+
+
+def load_fif_blocks(path, n_segments, segment_s, gap_s, freqs):
+    """
+    Cuts the Flicker blocks of a recording into stimulus-locked segments, gap_s seconds apart.
+
+    Returns:
+        tuple: (segments of shape (n_segments, n_blocks, n_channels, n_samples), attended frequency of every
+            block), and the sampling frequency.
+
+    Raises:
+        ValueError: If the segments do not fit in a block, or no block of the recording holds all of them.
+    """
+    import mne
+
+    if n_segments * (segment_s + gap_s) - gap_s > FLICKER_BLOCK_S:
+        raise ValueError(f"{n_segments} segments of {segment_s} s with {gap_s} s gaps do not fit in a "
+                         f"{FLICKER_BLOCK_S:.0f} s block")
+
+    raw = mne.io.read_raw_fif(path, preload=True, verbose=False).pick("eeg")
+    sfreq = raw.info["sfreq"]
+    data = sosfiltfilt(design_bandpass(sfreq, 6.0, min(90.0, 0.45 * sfreq)), raw.get_data(), axis=-1)
+    events, event_id = mne.events_from_annotations(raw, verbose=False)
+    names = {code: name for name, code in event_id.items()}
+    n_samples = int(round(segment_s * sfreq))
+    segments, labels = [], []
+    for onset, _, code in events:
+        match = re.search(r"freq_([0-9.]+)/block_start", names[code])
+        if match is None:
+            continue
+        f = freqs[int(np.abs(np.asarray(freqs) - float(match.group(1))).argmin())]
+        # Snapping down to whole cycles keeps every segment inside its nominal slot of the block
+        starts = [onset + int(round(np.floor(j * (segment_s + gap_s) * f) / f * sfreq)) for j in range(n_segments)]
+        end = min(onset + int(round(FLICKER_BLOCK_S * sfreq)), data.shape[1])
+        if starts[-1] + n_samples > end:
+            print(f"{os.path.basename(path)}: skipping the {match.group(1)} Hz block at sample {onset}, it ends "
+                  f"before its last segment")
+            continue
+        segments.append([data[:, s:s + n_samples] for s in starts])
+        labels.append(f)
+    if not segments:
+        raise ValueError(f"No complete Flicker block in {path}")
+    return np.asarray(segments).transpose(1, 0, 2, 3), np.asarray(labels), sfreq
+
+
+def median_ms(durations):
+    return float(np.median(durations) * 1000)
+
+
+def leave_one_block_out(blocks, labels, sfreq, freqs, windows, methods):
+    """
+    Fits on all blocks but one, scores the windows of the held-out block, for every block. With the segment folds of
+    load_fif_blocks(), a "block" is fold j: segment j of every recorded block.
+
+    Args:
+        blocks (numpy.ndarray): Epochs of shape (n_blocks, n_epochs_per_block, n_channels, n_samples).
+        labels (numpy.ndarray): Frequency of every epoch of a block, shape (n_epochs_per_block,).
+
+    Returns:
+        list: One result dict per method and window length.
+    """
+    n_blocks = len(blocks)
+    correct = {(m, w): 0 for m in methods for w in windows}
+    durations = {(m, w): [] for m in methods for w in windows}
+    fit_durations = {m: [] for m in methods}
+    for held_out in range(n_blocks):
+        train = np.concatenate([blocks[b] for b in range(n_blocks) if b != held_out])
+        train_labels = np.tile(labels, n_blocks - 1)
+        decoders = {}
+        for name in methods:
+            start = time.perf_counter()
+            if name in ("trca", "etrca"):
+                decoders[name] = ssvep_decoders.TRCA(sfreq, freqs, ensemble=name == "etrca").fit(train, train_labels)
+            elif name == "cca":
+                decoders[name] = lambda window: ssvep_decoders.basic_cca(window, sfreq, freqs, n_harmonics=3)
+            else:
+                decoders[name] = lambda window: ssvep_decoders.fbcca(window, sfreq, freqs, n_harmonics=3)
+            fit_durations[name].append(time.perf_counter() - start)
+
+        for window_s in windows:
+            n_samples = int(round(window_s * sfreq))
+            for name, decoder in decoders.items():
+                decode = decoder.scores if hasattr(decoder, "scores") else decoder
+                decode(blocks[held_out][0][:, :n_samples])  # warm-up (caches)
+                for epoch, label in zip(blocks[held_out], labels):
+                    start = time.perf_counter()
+                    scores = decode(epoch[:, :n_samples])
+                    durations[(name, window_s)].append(time.perf_counter() - start)
+                    correct[(name, window_s)] += max(scores, key=scores.get) == label
+
+    n_trials = n_blocks * len(labels)
+    return [{"method": name, "window_s": window_s, "accuracy": correct[(name, window_s)] / n_trials,
+             "decision_ms": median_ms(durations[(name, window_s)]), "fit_ms": median_ms(fit_durations[name])}
+            for window_s in windows for name in methods]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Leave-one-block-out TRCA benchmark (segment folds for .fif recordings)")
+    parser.add_argument("--methods", nargs="+", choices=METHODS, default=list(METHODS))
+    parser.add_argument("--windows", nargs="+", type=float, default=[0.5, 1.0, 2.0], help="Window lengths in s")
+    parser.add_argument("--fif", nargs="+", default=None, help="Flicker .fif recordings instead of synthetic data")
+    parser.add_argument("--segments", type=int, default=6, help="Folds per block of a .fif recording")
+    parser.add_argument("--gap", type=float, default=1.0, help="Seconds between the segments of a .fif block")
+    parser.add_argument("--rate", type=float, default=250.0, help="Sampling rate of the synthetic data")
+    parser.add_argument("--channels", type=int, default=8, help="Channels of the synthetic data")
+    parser.add_argument("--blocks", type=int, default=6, help="Blocks of the synthetic data")
+    parser.add_argument("--amplitude", type=float, default=0.3, help="SSVEP amplitude relative to white noise")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=str, default=None, help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    epoch_s = max(args.windows)
+    if args.fif:
+        datasets = []
+        for path in args.fif:
+            blocks, labels, sfreq = load_fif_blocks(path, args.segments, epoch_s, args.gap, FLICKER_FREQS)
+            datasets.append((os.path.basename(path), "segment folds", blocks, labels, sfreq))
+    else:
+        rng = np.random.default_rng(args.seed)
+        blocks, labels = make_blocks(FLICKER_FREQS, args.rate, args.channels, int(round(epoch_s * args.rate)),
+                                     args.blocks, args.amplitude, rng)
+        datasets = [("synthetic", "leave-one-block-out", blocks, labels, args.rate)]
+
+    results = []
+    for name, folds, blocks, labels, sfreq in datasets:
+        print(f"{name}: {folds}, {len(blocks)} folds of {len(labels)} epochs")
+        for result in leave_one_block_out(blocks, labels, sfreq, FLICKER_FREQS, args.windows, args.methods):
+            result["data"] = name
+            result["folds"] = folds
+            results.append(result)
+            print(f"{name:>12s} | {result['window_s']:4.1f} s | {result['method']:6s} | acc {result['accuracy']:5.2f} "
+                  f"| {result['decision_ms']:7.3f} ms per decision | fit {result['fit_ms']:8.2f} ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"settings": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
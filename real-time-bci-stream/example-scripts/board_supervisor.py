@@ -0,0 +1,379 @@
+import threading
+import time
+
+import numpy as np
+from brainflow.board_shim import BoardShim, BrainFlowError, BrainFlowExitCodes
+
+from brainflow_stream import RingBuffer, get_board_descr
+
+
+class BoardSupervisor:
+    """
+    Keeps a BrainFlowBoardSetup streaming: detects stalls, reconnects with backoff and splices outages with NaNs.
+
+    A background thread reads new samples through a BoardCursor into a RingBuffer laid out like BrainFlow's output.
+    When no new sample arrives for stall_timeout_ms (or a read fails), the session is released and prepared again,
+    waiting initial_backoff seconds after the first failed attempt and doubling the wait up to max_backoff.
+    Once samples flow again, the missing stretch is written as explicit NaN samples (with interpolated timestamps),
+    so the buffer keeps one sample per 1 / sampling_rate seconds and windows taken across an outage stay aligned.
+
+    Consumers read through the supervisor (get_current_board_data / get_board_data), which never fails while the
+    board is reconnecting; they simply see no new samples until the stream is back.
+
+    Attributes:
+        board_setup (BrainFlowBoardSetup): The supervised board.
+        stall_timeout_ms (float): Milliseconds without new samples after which the stream is considered stalled.
+        ring_buffer (RingBuffer): Buffer holding the supervised stream, all board rows.
+        state (str): 'stopped', 'streaming' or 'reconnecting'.
+    """
+
+    def __init__(self, board_setup, stall_timeout_ms=1000, buffer_seconds=30, poll_interval=0.02,
+                 initial_backoff=0.5, max_backoff=10.0):
+        """
+        Initializes the supervisor. Use BrainFlowBoardSetup.start_supervisor() rather than calling this directly.
+
+        Args:
+            board_setup (BrainFlowBoardSetup): The board to supervise. It must be set up before start() is called.
+            stall_timeout_ms (float): Milliseconds without new samples after which the stream is considered stalled.
+                Default is 1000.
+            buffer_seconds (float): Length of the buffer in seconds. Default is 30.
+            poll_interval (float): Seconds between reads. Default is 0.02.
+            initial_backoff (float): Seconds to wait after the first failed reconnect attempt. Default is 0.5.
+            max_backoff (float): Maximum seconds to wait between reconnect attempts. Default is 10.
+        """
+        if board_setup.timestamp_channel is None:
+            raise ValueError(f"[{board_setup.name}] Board has no timestamp channel, cannot supervise it.")
+
+        self.board_setup = board_setup
+        self.stall_timeout_ms = stall_timeout_ms
+        self.buffer_seconds = buffer_seconds
+        self.poll_interval = poll_interval
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.n_rows = int(get_board_descr(board_setup.get_layout_board_id())["num_rows"])
+        self.ring_buffer = RingBuffer(self.n_rows, int(buffer_seconds * board_setup.sampling_rate))
+        self.state = 'stopped'
+
+        self._cursor = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._read_position = 0
+        self._last_timestamp = None
+        self._last_sample_time = None
+        self._splice_pending = False
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            'stall_events': 0,
+            'reconnects': 0,
+            'reconnect_attempts': 0,
+            'gap_events': 0,
+            'gap_samples': 0,
+            'last_recovery_s': None,
+            'max_recovery_s': None,
+            'total_downtime_s': 0.0,
+        }
+
+    def start(self):
+        """
+        Starts the supervising thread.
+        """
+        if self.board_setup.board is None:
+            print("Board is not set up, cannot start the supervisor.")
+            return
+        if self._thread is not None:
+            print(f"[{self.board_setup.name}] Supervisor is already running.")
+            return
+
+        self._cursor = self.board_setup.create_cursor()
+        self._last_sample_time = time.perf_counter()
+        self._stop_event.clear()
+        self.state = 'streaming'
+        self._thread = threading.Thread(target=self._supervise_loop, name=f"{self.board_setup.name} supervisor",
+                                        daemon=True)
+        self._thread.start()
+
+    def _supervise_loop(self):
+        """
+        Body of the supervising thread: reads new samples and reconnects when the stream stalls.
+        """
+        stall_timeout = self.stall_timeout_ms / 1000.0
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                chunk = self._cursor.read() if self.board_setup.board is not None else None
+            except BrainFlowError as e:
+                print(f"[{self.board_setup.name}] Error reading board: {e}")
+                chunk = None
+
+            now = time.perf_counter()
+            if chunk is not None and chunk.shape[1] > 0:
+                self._append(chunk)
+                self._last_sample_time = now
+            elif chunk is None or now - self._last_sample_time > stall_timeout:
+                print(f"[{self.board_setup.name}] No new samples for {(now - self._last_sample_time) * 1000:.0f} ms, "
+                      f"reconnecting...")
+                self._reconnect()
+
+    def _release_board(self):
+        """
+        Stops the stream and releases the session of the stalled board, ignoring errors from the dead connection.
+        """
+        board_setup = self.board_setup
+        if board_setup.board is not None:
+            if board_setup.streaming:
+                try:
+                    board_setup.board.stop_stream()
+                except BrainFlowError:
+                    pass
+            if board_setup.session_prepared:
+                try:
+                    board_setup.board.release_session()
+                except BrainFlowError:
+                    pass
+        board_setup.streaming = False
+        board_setup.session_prepared = False
+        board_setup.board = None
+
+    def _reconnect(self):
+        """
+        Releases and prepares the session again until the board streams, with exponential backoff between attempts.
+        """
+        board_setup = self.board_setup
+        self.state = 'reconnecting'
+        stall_detected = time.perf_counter()
+        last_sample_time = self._last_sample_time
+        with self._metrics_lock:
+            self._metrics['stall_events'] += 1
+
+        backoff = self.initial_backoff
+        while not self._stop_event.is_set():
+            self._release_board()
+            board_setup.setup()
+            with self._metrics_lock:
+                self._metrics['reconnect_attempts'] += 1
+            if board_setup.board is not None and board_setup.streaming:
+                break
+            print(f"[{board_setup.name}] Reconnect failed, retrying in {backoff:.1f} s.")
+            self._stop_event.wait(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+        if self._stop_event.is_set():
+            return
+
+        # The new session starts counting packages from scratch
+        if board_setup.health is not None:
+            board_setup.health.reset()
+        self._cursor = board_setup.create_cursor()
+        self._splice_pending = True
+
+        now = time.perf_counter()
+        recovery = now - stall_detected
+        with self._metrics_lock:
+            self._metrics['reconnects'] += 1
+            self._metrics['last_recovery_s'] = recovery
+            self._metrics['max_recovery_s'] = max(recovery, self._metrics['max_recovery_s'] or 0.0)
+            self._metrics['total_downtime_s'] += now - last_sample_time
+        self._last_sample_time = now  # give the new session a full stall timeout to deliver its first samples
+        self.state = 'streaming'
+        print(f"[{board_setup.name}] Reconnected after {recovery:.2f} s.")
+
+    def _append(self, chunk):
+        """
+        Writes new samples to the buffer, first filling the gap left by a reconnect with NaN samples.
+
+        Args:
+            chunk (numpy.ndarray): New samples, all board rows.
+        """
+        timestamp_channel = self.board_setup.timestamp_channel
+        if self._splice_pending and self._last_timestamp is not None:
+            srate = self.board_setup.sampling_rate
+            n_missing = int(round((chunk[timestamp_channel, 0] - self._last_timestamp) * srate)) - 1
+            if n_missing > 0:
+                # Only the newest capacity samples could be kept anyway
+                n_fill = min(n_missing, self.ring_buffer.capacity)
+                gap = np.full((self.n_rows, n_fill), np.nan)
+                gap[timestamp_channel] = self._last_timestamp + np.arange(n_missing - n_fill + 1, n_missing + 1) / srate
+                self.ring_buffer.write(gap)
+                with self._metrics_lock:
+                    self._metrics['gap_events'] += 1
+                    self._metrics['gap_samples'] += n_missing
+        self._splice_pending = False
+        self.ring_buffer.write(chunk)
+        self._last_timestamp = chunk[timestamp_channel, -1]
+
+    def get_metrics(self):
+        """
+        Returns the supervisor's recovery metrics.
+
+        Returns:
+            dict: 'state', 'stall_events', 'reconnects', 'reconnect_attempts', 'gap_events', 'gap_samples'
+                (NaN samples spliced in), 'last_recovery_s' and 'max_recovery_s' (from stall detection to streaming
+                again), 'total_downtime_s' (from the last sample before each stall to the reconnect) and
+                'samples_written'.
+        """
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        metrics['state'] = self.state
+        metrics['samples_written'] = self.ring_buffer.total_written
+        return metrics
+
+    def get_sampling_rate(self):
+        """
+        Retrieves the sampling rate of the supervised board.
+
+        Returns:
+            int: The sampling rate.
+        """
+        return self.board_setup.sampling_rate
+
+    def get_current_board_data(self, num_samples):
+        """
+        Retrieves the most recent num_samples of the supervised stream.
+
+        Args:
+            num_samples (int): Number of recent samples to fetch.
+
+        Returns:
+            numpy.ndarray: Array of shape (n_rows, n), n <= num_samples if less data is available.
+                Samples lost during an outage are NaN.
+        """
+        with self.ring_buffer._lock:
+            return self.ring_buffer.latest(num_samples).copy()
+
+    def get_board_data(self):
+        """
+        Retrieves all samples of the supervised stream since the previous get_board_data() call.
+
+        Returns:
+            numpy.ndarray: Array of shape (n_rows, n_new_samples). Samples lost during an outage are NaN.
+        """
+        with self.ring_buffer._lock:
+            total_written = self.ring_buffer.total_written
+            data = self.ring_buffer.latest(total_written - self._read_position).copy()
+        self._read_position = total_written
+        return data
+
+    def stop(self):
+        """
+        Stops the supervising thread. The board is left as it is.
+        """
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        self.state = 'stopped'
+
+
+class FaultInjector:
+    """
+    Injects faults into the BoardShim of a BrainFlowBoardSetup, to test reconnect handling without hardware.
+
+    Install it with `board_setup.board_shim_class = injector.board_shim_class()` before calling setup(). Every
+    BoardShim created afterwards (including the ones created when reconnecting) is controlled by this injector:
+
+        - stall(): no new samples are delivered until the next successful prepare_session (like a dongle hiccup).
+        - disconnect(): every read raises BrainFlowError until the next successful prepare_session.
+        - fail_prepare(n): the next n prepare_session calls raise BrainFlowError.
+
+    Attributes:
+        stalled (bool): Whether the stream is currently stalled.
+        disconnected (bool): Whether reads currently fail.
+        prepare_failures (int): Number of upcoming prepare_session calls that will fail.
+        prepare_calls (int): Total number of prepare_session calls.
+    """
+
+    def __init__(self):
+        self.stalled = False
+        self.disconnected = False
+        self.prepare_failures = 0
+        self.prepare_calls = 0
+
+    def stall(self):
+        """
+        Stops delivering new samples until the session is prepared again.
+        """
+        self.stalled = True
+
+    def disconnect(self):
+        """
+        Makes every read fail until the session is prepared again.
+        """
+        self.disconnected = True
+
+    def fail_prepare(self, n=1):
+        """
+        Makes the next n prepare_session calls fail.
+
+        Args:
+            n (int): Number of calls to fail. Default is 1.
+        """
+        self.prepare_failures = n
+
+    def board_shim_class(self):
+        """
+        Creates a BoardShim subclass controlled by this injector.
+
+        Returns:
+            type: The class, to assign to BrainFlowBoardSetup.board_shim_class.
+        """
+        injector = self
+
+        class FaultInjectingBoardShim(BoardShim):
+            def prepare_session(self):
+                injector.prepare_calls += 1
+                if injector.prepare_failures > 0:
+                    injector.prepare_failures -= 1
+                    raise BrainFlowError("Injected prepare_session failure",
+                                         BrainFlowExitCodes.UNABLE_TO_OPEN_PORT_ERROR.value)
+                super().prepare_session()
+                injector.stalled = False
+                injector.disconnected = False
+                self._frozen = None
+
+            def _check_connected(self):
+                if injector.disconnected:
+                    raise BrainFlowError("Injected read failure", BrainFlowExitCodes.BOARD_NOT_READY_ERROR.value)
+
+            def get_current_board_data(self, num_samples, *args, **kwargs):
+                self._check_connected()
+                if not injector.stalled:
+                    return super().get_current_board_data(num_samples, *args, **kwargs)
+                # Keep returning the samples from the moment of the stall, as BrainFlow does when nothing arrives
+                if getattr(self, '_frozen', None) is None:
+                    self._frozen = super().get_current_board_data(num_samples, *args, **kwargs)
+                return self._frozen[:, -num_samples:]
+
+            def get_board_data(self, *args, **kwargs):
+                self._check_connected()
+                data = super().get_board_data(*args, **kwargs)
+                return data[:, :0] if injector.stalled else data
+
+            def get_board_data_count(self, *args, **kwargs):
+                self._check_connected()
+                return 0 if injector.stalled else super().get_board_data_count(*args, **kwargs)
+
+        return FaultInjectingBoardShim
+
+
+#######
+# Example: a synthetic board that stalls once and fails its first reconnect attempt
+######
+if __name__ == "__main__":
+    from brainflow.board_shim import BoardIds
+    from brainflow_stream import BrainFlowBoardSetup
+
+    injector = FaultInjector()
+    brainflow_board = BrainFlowBoardSetup(board_id=BoardIds.SYNTHETIC_BOARD.value, master_board=BoardIds.CYTON_BOARD.value,
+                                          name="Synthetic")
+    brainflow_board.board_shim_class = injector.board_shim_class()
+    brainflow_board.setup()
+    supervisor = brainflow_board.start_supervisor(stall_timeout_ms=500, initial_backoff=0.2)
+
+    time.sleep(2)
+    injector.stall()
+    injector.fail_prepare(1)
+    time.sleep(4)
+
+    data = supervisor.get_board_data()
+    n_nan = int(np.isnan(data[brainflow_board.eeg_channels[0]]).sum())
+    print(f"Received {data.shape[1]} samples, {n_nan} of them NaN-filled")
+    print(supervisor.get_metrics())
+    brainflow_board.stop()
@@ -0,0 +1,308 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+from brainflow.data_filter import DataFilter
+
+from brainflow_stream import get_board_descr
+
+# File layout: MAGIC | uint32 header length | JSON header (padded) | float64 samples, one row of n_rows values per sample
+MAGIC = b"BFREC001"
+HEADER_ALIGNMENT = 64
+
+
+class SessionRecorder:
+    """
+    Records a BrainFlow session to disk while it is streaming, in bounded memory.
+
+    A background thread reads new samples through a BoardCursor (so other consumers of the board are unaffected) and
+    appends them to a binary file. The file starts with a small JSON header (board id, sampling rate, channel map,
+    marker channel) followed by raw float64 samples, so it can be opened at any time, even while still recording,
+    with load_recording() as a np.memmap without reading it into memory.
+
+    Attributes:
+        board_setup (BrainFlowBoardSetup): The board being recorded.
+        path (str): Path of the recording file.
+        chunk_ms (float): Interval between writes in milliseconds.
+        header (dict): The header written at the start of the file.
+        samples_written (int): Number of samples written so far.
+    """
+
+    def __init__(self, board_setup, path, chunk_ms=200):
+        """
+        Initializes the recorder. Nothing is written until start() is called.
+
+        Args:
+            board_setup (BrainFlowBoardSetup): The board to record. It must be set up before start() is called.
+            path (str): Path of the recording file. An existing file is overwritten.
+            chunk_ms (float): Interval between writes in milliseconds. Default is 200.
+        """
+        self.board_setup = board_setup
+        self.path = path
+        self.chunk_ms = chunk_ms
+        self.header = None
+        self.samples_written = 0
+        self._file = None
+        self._cursor = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def _build_header(self):
+        """
+        Builds the recording header from the board description.
+
+        Returns:
+            dict: Header describing the layout of every sample row.
+        """
+        board_setup = self.board_setup
+        board_descr = get_board_descr(board_setup.get_layout_board_id())
+        return {
+            "board_id": board_setup.board_id,
+            "master_board": board_setup.master_board,
+            "sampling_rate": board_setup.sampling_rate,
+            "n_rows": int(board_descr["num_rows"]),
+            "eeg_channels": list(board_setup.eeg_channels),
+            "eeg_names": board_descr.get("eeg_names", ""),
+            "layout_board_id": board_setup.get_layout_board_id(),
+            "timestamp_channel": board_setup.timestamp_channel,
+            "package_num_channel": board_setup.package_num_channel,
+            "marker_channel": board_descr.get("marker_channel"),
+            "dtype": "float64",
+            "start_time": datetime.now().isoformat(),
+        }
+
+    def start(self):
+        """
+        Writes the header and starts the background recording thread.
+        """
+        if self.board_setup.board is None:
+            print("Board is not set up, cannot start recording.")
+            return
+        if self._thread is not None:
+            print(f"[{self.board_setup.name}] Recording is already running.")
+            return
+
+        self.header = self._build_header()
+        header_bytes = json.dumps(self.header).encode("utf-8")
+        padding = (-(len(MAGIC) + 4 + len(header_bytes))) % HEADER_ALIGNMENT
+        header_bytes += b" " * padding
+
+        self._file = open(self.path, "wb")
+        self._file.write(MAGIC)
+        self._file.write(np.uint32(len(header_bytes)).tobytes())
+        self._file.write(header_bytes)
+        self._file.flush()
+        self.samples_written = 0
+
+        self._cursor = self.board_setup.create_cursor()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._record_loop, name=f"{self.board_setup.name} recorder", daemon=True)
+        self._thread.start()
+        print(f"[{self.board_setup.name}] Recording to {self.path}")
+
+    def _record_loop(self):
+        """
+        Body of the recording thread: appends new samples every chunk_ms milliseconds.
+        """
+        while not self._stop_event.wait(self.chunk_ms / 1000.0):
+            self._write_new_samples()
+        self._write_new_samples()  # flush whatever arrived since the last chunk
+
+    def _write_new_samples(self):
+        """
+        Reads the samples that arrived since the last write and appends them to the file.
+        """
+        chunk = self._cursor.read()
+        if chunk is not None and chunk.shape[1] > 0:
+            self.write_chunk(chunk)
+
+    def write_chunk(self, chunk):
+        """
+        Appends a block of samples to the file.
+
+        Args:
+            chunk (numpy.ndarray): Array of shape (n_rows, n_samples), as returned by BrainFlow.
+        """
+        # Stored sample-major so appending only ever adds bytes at the end of the file
+        self._file.write(np.ascontiguousarray(chunk.T, dtype=np.float64).tobytes())
+        self._file.flush()
+        self.samples_written += chunk.shape[1]
+
+    def stop(self):
+        """
+        Stops the recording thread, writes any remaining samples and closes the file.
+        """
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            print(f"[{self.board_setup.name}] Recording stopped, {self.samples_written} samples written to {self.path}")
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def read_header(path):
+    """
+    Reads the header of a recording file.
+
+    Args:
+        path (str): Path of the recording file.
+
+    Returns:
+        tuple: (header, data_offset), the header dict and the byte offset where the samples start.
+
+    Raises:
+        ValueError: If the file is not a recording written by SessionRecorder.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a SessionRecorder file.")
+        header_length = int(np.frombuffer(f.read(4), dtype=np.uint32)[0])
+        header = json.loads(f.read(header_length).decode("utf-8"))
+    return header, len(MAGIC) + 4 + header_length
+
+
+def load_recording(path):
+    """
+    Opens a recording as a read-only memory map, without loading it into memory.
+
+    Can be used while the recording is still in progress; only complete samples are mapped.
+
+    Args:
+        path (str): Path of the recording file.
+
+    Returns:
+        tuple: (header, data), with data a read-only np.memmap view of shape (n_rows, n_samples),
+            laid out like BrainFlow's get_board_data() output.
+    """
+    header, offset = read_header(path)
+    n_rows = header["n_rows"]
+    row_bytes = n_rows * np.dtype(header["dtype"]).itemsize
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        n_samples = (f.tell() - offset) // row_bytes
+    if n_samples == 0:
+        return header, np.empty((n_rows, 0), dtype=header["dtype"])
+    data = np.memmap(path, dtype=header["dtype"], mode="r", offset=offset, shape=(n_samples, n_rows))
+    return header, data.T
+
+
+def write_events(path, marker_log, events_path=None):
+    """
+    Writes the markers of a MarkerLog that fall within a recording as an MNE events file.
+
+    The sample indices are aligned to the recording's timestamp channel, so they are exact even if the recording
+    started after the stream. The file is plain text (sample, 0, marker code per line), readable with
+    mne.read_events().
+
+    Args:
+        path (str): Path of the recording file.
+        marker_log (MarkerLog): The markers, usually board_setup.marker_log.
+        events_path (str, optional): Path of the events file. Defaults to the recording path with '-eve.txt'.
+
+    Returns:
+        numpy.ndarray: The events array of shape (n_events, 3).
+    """
+    header, data = load_recording(path)
+    events = marker_log.to_mne_events(np.asarray(data[header["timestamp_channel"]]))
+    if events_path is None:
+        events_path = os.path.splitext(path)[0] + "-eve.txt"
+    np.savetxt(events_path, events, fmt="%d")
+    return events
+
+
+def to_playback_file(path, playback_path, chunk_samples=100000):
+    """
+    Converts a recording to a BrainFlow file that can be streamed again with PLAYBACK_FILE_BOARD.
+
+    The conversion is done in chunks, so memory use stays bounded for long sessions.
+
+    Args:
+        path (str): Path of the recording file.
+        playback_path (str): Path of the BrainFlow file to write (usually .csv).
+        chunk_samples (int): Number of samples converted at a time. Default is 100000.
+
+    Returns:
+        dict: The recording header. Pass header['layout_board_id'] as master_board when playing the file back.
+    """
+    header, data = load_recording(path)
+    for start in range(0, data.shape[1], chunk_samples):
+        chunk = np.ascontiguousarray(data[:, start:start + chunk_samples])
+        DataFilter.write_file(chunk, playback_path, "w" if start == 0 else "a")
+    return header
+
+
+def to_fif(path, fif_path, overwrite=False):
+    """
+    Converts a recording to an MNE .fif file with the EEG channels (in volts) and a STI 014 marker channel.
+
+    Requires MNE-Python. The EEG channels are loaded into memory for the conversion.
+
+    Args:
+        path (str): Path of the recording file.
+        fif_path (str): Path of the .fif file to write (should end in _raw.fif).
+        overwrite (bool): Whether to overwrite an existing .fif file. Default is False.
+
+    Returns:
+        mne.io.RawArray: The converted recording.
+    """
+    import mne
+
+    header, data = load_recording(path)
+    eeg_channels = header["eeg_channels"]
+    ch_names = header["eeg_names"].split(",") if header["eeg_names"] else [f"EEG {ch}" for ch in eeg_channels]
+    ch_names = ch_names[:len(eeg_channels)]
+    eeg = np.asarray(data[eeg_channels]) * 1e-6  # BrainFlow EEG data is in microvolts
+
+    ch_types = ["eeg"] * len(eeg_channels)
+    if header["marker_channel"] is not None:
+        eeg = np.vstack([eeg, np.asarray(data[header["marker_channel"]])[None, :]])
+        ch_names = ch_names + ["STI 014"]
+        ch_types = ch_types + ["stim"]
+
+    info = mne.create_info(ch_names=ch_names, sfreq=header["sampling_rate"], ch_types=ch_types)
+    raw = mne.io.RawArray(eeg, info, verbose=False)
+    raw.save(fif_path, overwrite=overwrite, verbose=False)
+    return raw
+
+
+#######
+# Example recording a session and loading it back
+######
+if __name__ == "__main__":
+    from brainflow.board_shim import BoardIds
+    from brainflow_stream import BrainFlowBoardSetup
+
+    brainflow_board = BrainFlowBoardSetup(board_id=BoardIds.SYNTHETIC_BOARD.value, master_board=BoardIds.CYTON_BOARD.value)
+    brainflow_board.setup()
+
+    # Record for 5 seconds
+    with SessionRecorder(brainflow_board, "session.bfrec"):
+        time.sleep(5)
+    brainflow_board.stop()
+
+    # Open the recording without loading it into memory
+    header, data = load_recording("session.bfrec")
+    print(f"Recorded {data.shape[1]} samples of board {header['board_id']} at {header['sampling_rate']} Hz")
+
+## Recording with markers, saved alongside as an MNE events file (session-eve.txt)
+# if __name__ == "__main__":
+#     brainflow_board = BrainFlowBoardSetup(board_id=BoardIds.CYTON_BOARD.value)
+#     brainflow_board.setup()
+#     with SessionRecorder(brainflow_board, "session.bfrec"):
+#         for trial in range(10):
+#             brainflow_board.insert_marker(trial % 4 + 1, verbose=False)
+#             time.sleep(1)
+#     brainflow_board.stop()
+#     events = write_events("session.bfrec", brainflow_board.marker_log)
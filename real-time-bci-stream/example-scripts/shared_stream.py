@@ -0,0 +1,323 @@
+import json
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from brainflow_stream import RingBuffer, get_board_descr
+
+# Shared memory layout: control block (int64 fields) | JSON metadata | float64 mirrored ring buffer (n_rows, 2 * capacity)
+CONTROL_FIELDS = ("magic", "n_rows", "capacity", "sequence", "total_written", "metadata_length")
+CONTROL_BYTES = 64
+METADATA_BYTES = 4096
+MAGIC = 0x42464D454D  # "BFMEM"
+
+
+def _attach_shared_memory(shm_name):
+    """
+    Attaches to an existing shared memory block without letting this process delete it on exit.
+
+    Before Python 3.13, every process that attaches to a block registers it with the resource tracker, which then
+    unlinks it when that process exits (taking it away from the publisher and the other subscribers).
+
+    Args:
+        shm_name (str): Name of the shared memory block.
+
+    Returns:
+        multiprocessing.shared_memory.SharedMemory: The attached block.
+    """
+    try:
+        return shared_memory.SharedMemory(name=shm_name, track=False)
+    except TypeError:
+        # Python < 3.13 has no track argument: skip the registration instead. (Unregistering afterwards would also
+        # drop the publisher's own registration when both processes share a resource tracker, e.g. after a fork.)
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=shm_name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedMemoryPublisher:
+    """
+    Copies the data of a BrainFlowBoardSetup into a shared memory ring buffer, for SharedBoardSubscriber readers.
+
+    A background thread reads new samples through a BoardCursor and appends all board rows to a RingBuffer whose
+    storage lives in shared memory. A sequence counter is incremented before and after each write (odd while
+    writing), so readers in other processes can detect and retry reads that overlapped a write. No data is ever
+    sent over pipes or pickled.
+
+    Attributes:
+        board_setup (BrainFlowBoardSetup): The board being published.
+        shm_name (str): Name of the shared memory block.
+        ring_buffer (RingBuffer): The ring buffer backed by shared memory.
+    """
+
+    def __init__(self, board_setup, shm_name, buffer_seconds=30, poll_interval=0.01):
+        """
+        Initializes the publisher. The shared memory block is created by start().
+
+        Args:
+            board_setup (BrainFlowBoardSetup): The board to publish. It must be set up before start() is called.
+            shm_name (str): Name of the shared memory block.
+            buffer_seconds (float): Length of the shared ring buffer in seconds. Default is 30.
+            poll_interval (float): Seconds between writes. Default is 0.01.
+        """
+        self.board_setup = board_setup
+        self.shm_name = shm_name
+        self.buffer_seconds = buffer_seconds
+        self.poll_interval = poll_interval
+        self.ring_buffer = None
+        self._shm = None
+        self._control = None
+        self._cursor = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def _metadata(self):
+        """
+        Collects the board information subscribers need to interpret the data.
+
+        Returns:
+            dict: Board id, sampling rate and the row indices of the special channels.
+        """
+        board_setup = self.board_setup
+        return {
+            "name": board_setup.name,
+            "board_id": board_setup.board_id,
+            "master_board": board_setup.master_board,
+            "layout_board_id": board_setup.get_layout_board_id(),
+            "sampling_rate": board_setup.sampling_rate,
+            "eeg_channels": list(board_setup.eeg_channels),
+            "timestamp_channel": board_setup.timestamp_channel,
+            "package_num_channel": board_setup.package_num_channel,
+        }
+
+    def start(self):
+        """
+        Creates the shared memory block and starts publishing.
+        """
+        if self.board_setup.board is None:
+            print("Board is not set up, cannot start publishing.")
+            return
+
+        n_rows = get_board_descr(self.board_setup.get_layout_board_id())["num_rows"]
+        capacity = int(self.buffer_seconds * self.board_setup.sampling_rate)
+        metadata = json.dumps(self._metadata()).encode("utf-8")
+        if len(metadata) > METADATA_BYTES:
+            raise ValueError(f"Board metadata is too large for shared memory ({len(metadata)} bytes).")
+
+        size = CONTROL_BYTES + METADATA_BYTES + n_rows * 2 * capacity * 8
+        self._shm = shared_memory.SharedMemory(name=self.shm_name, create=True, size=size)
+        self._control = np.ndarray((len(CONTROL_FIELDS),), dtype=np.int64, buffer=self._shm.buf)
+        self._shm.buf[CONTROL_BYTES:CONTROL_BYTES + len(metadata)] = metadata
+        storage = np.ndarray((n_rows, 2 * capacity), dtype=np.float64, buffer=self._shm.buf,
+                             offset=CONTROL_BYTES + METADATA_BYTES)
+        self.ring_buffer = RingBuffer(n_rows, capacity, buffer=storage)
+        self._control[:] = (MAGIC, n_rows, capacity, 0, 0, len(metadata))
+
+        self._cursor = self.board_setup.create_cursor()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._publish_loop, name=f"{self.board_setup.name} publisher", daemon=True)
+        self._thread.start()
+        print(f"[{self.board_setup.name}] Publishing to shared memory '{self.shm_name}'.")
+
+    def _publish_loop(self):
+        """
+        Body of the publishing thread: appends new samples to shared memory every poll_interval seconds.
+        """
+        sequence = CONTROL_FIELDS.index("sequence")
+        total_written = CONTROL_FIELDS.index("total_written")
+        while not self._stop_event.wait(self.poll_interval):
+            chunk = self._cursor.read()
+            if chunk is None or chunk.shape[1] == 0:
+                continue
+            self._control[sequence] += 1  # odd: write in progress
+            self.ring_buffer.write(chunk)
+            self._control[total_written] = self.ring_buffer.total_written
+            self._control[sequence] += 1  # even: consistent
+
+    def stop(self):
+        """
+        Stops publishing and removes the shared memory block.
+        """
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        if self._shm is not None:
+            self.ring_buffer = None
+            self._control = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+            print(f"[{self.board_setup.name}] Stopped publishing to shared memory '{self.shm_name}'.")
+
+
+class SharedBoardSubscriber:
+    """
+    Reads a board published by SharedMemoryPublisher from another process.
+
+    Offers the same read API as BrainFlowBoardSetup: get_current_board_data(num_samples) returns the latest samples
+    and get_board_data() returns everything since this subscriber's previous get_board_data() call (each subscriber
+    keeps its own position, so one subscriber never takes data away from another).
+
+    Attributes:
+        shm_name (str): Name of the shared memory block.
+        metadata (dict): Board information written by the publisher.
+        name (str): Name of the published board.
+        eeg_channels (list): EEG channel rows.
+        sampling_rate (int): Sampling rate of the board.
+        timestamp_channel (int): Row index of the timestamp channel.
+        package_num_channel (int): Row index of the package number channel.
+    """
+
+    def __init__(self, shm_name, max_retries=100):
+        """
+        Attaches to a published board.
+
+        Args:
+            shm_name (str): Name of the shared memory block given to the publisher.
+            max_retries (int): Number of times a read is retried if it overlapped a write. Default is 100.
+
+        Raises:
+            FileNotFoundError: If no publisher with this name is running.
+            ValueError: If the shared memory block was not created by a SharedMemoryPublisher.
+        """
+        self.shm_name = shm_name
+        self.max_retries = max_retries
+        self._shm = _attach_shared_memory(shm_name)
+        self._control = np.ndarray((len(CONTROL_FIELDS),), dtype=np.int64, buffer=self._shm.buf)
+        magic, n_rows, capacity, _, _, metadata_length = (int(v) for v in self._control)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Shared memory '{shm_name}' was not created by a SharedMemoryPublisher.")
+
+        self.metadata = json.loads(bytes(self._shm.buf[CONTROL_BYTES:CONTROL_BYTES + metadata_length]).decode("utf-8"))
+        self.name = self.metadata["name"]
+        self.eeg_channels = self.metadata["eeg_channels"]
+        self.sampling_rate = self.metadata["sampling_rate"]
+        self.timestamp_channel = self.metadata["timestamp_channel"]
+        self.package_num_channel = self.metadata["package_num_channel"]
+        self.n_rows = n_rows
+        self.capacity = capacity
+        self._buffer = np.ndarray((n_rows, 2 * capacity), dtype=np.float64, buffer=self._shm.buf,
+                                  offset=CONTROL_BYTES + METADATA_BYTES)
+        self._sequence = CONTROL_FIELDS.index("sequence")
+        self._total_written = CONTROL_FIELDS.index("total_written")
+        self._read_position = int(self._control[self._total_written])
+
+    def _copy_latest(self, num_samples=None, since=None):
+        """
+        Copies the latest samples out of shared memory, retrying if the publisher wrote during the copy.
+
+        Args:
+            num_samples (int, optional): Number of recent samples to copy.
+            since (int, optional): Publisher sample count to copy from instead: every sample written after it (at most
+                the capacity) is copied. It is compared against the same count the copy is taken at, so samples
+                written while reading are either included or left for the next read, never skipped.
+
+        Returns:
+            tuple: (data, total_written), the copied block and the publisher's sample count it corresponds to.
+        """
+        for _ in range(self.max_retries):
+            sequence = int(self._control[self._sequence])
+            if sequence % 2:
+                time.sleep(0)  # write in progress, let the publisher finish
+                continue
+            total_written = int(self._control[self._total_written])
+            n = min(total_written - since if since is not None else num_samples, self.capacity, total_written)
+            end = total_written % self.capacity + self.capacity
+            data = self._buffer[:, end - n:end].copy()
+            if int(self._control[self._sequence]) == sequence:
+                return data, total_written
+        raise RuntimeError(f"Could not get a consistent read from shared memory '{self.shm_name}'.")
+
+    def get_sampling_rate(self):
+        """
+        Retrieves the sampling rate of the published board.
+
+        Returns:
+            int: The sampling rate.
+        """
+        return self.sampling_rate
+
+    def get_board_data_count(self):
+        """
+        Returns the number of samples available to get_board_data().
+
+        Returns:
+            int: Number of unread samples (at most the ring buffer capacity).
+        """
+        return min(int(self._control[self._total_written]) - self._read_position, self.capacity)
+
+    def get_current_board_data(self, num_samples):
+        """
+        Retrieves the most recent num_samples from the published board.
+
+        Args:
+            num_samples (int): Number of recent samples to fetch.
+
+        Returns:
+            numpy.ndarray: Array of shape (n_rows, n), n <= num_samples if less data is available.
+        """
+        data, _ = self._copy_latest(num_samples)
+        return data
+
+    def get_board_data(self):
+        """
+        Retrieves all samples published since this subscriber's previous get_board_data() call.
+
+        If more than the ring buffer capacity arrived in between, only the newest capacity samples are returned.
+
+        Returns:
+            numpy.ndarray: Array of shape (n_rows, n_new_samples).
+        """
+        data, total_written = self._copy_latest(since=self._read_position)
+        self._read_position = total_written
+        return data
+
+    def close(self):
+        """
+        Detaches from the shared memory block. The publisher keeps running.
+        """
+        if getattr(self, '_shm', None) is not None:
+            self._control = None
+            self._buffer = None
+            self._shm.close()
+            self._shm = None
+
+    def __del__(self):
+        self.close()
+
+
+#######
+# Example: one process owns the board, another reads it
+######
+def subscriber_process():
+    # At module level, so child processes started with 'spawn' (Windows, macOS) can import it
+    subscriber = SharedBoardSubscriber("cyton_stream")
+    time.sleep(2)
+    data = subscriber.get_current_board_data(num_samples=250)
+    print(f"Subscriber received {data.shape} from '{subscriber.name}'")
+    subscriber.close()
+
+
+if __name__ == "__main__":
+    import multiprocessing
+
+    from brainflow.board_shim import BoardIds
+    from brainflow_stream import BrainFlowBoardSetup
+
+    brainflow_board = BrainFlowBoardSetup(board_id=BoardIds.SYNTHETIC_BOARD.value, master_board=BoardIds.CYTON_BOARD.value,
+                                          name="Synthetic")
+    brainflow_board.setup()
+    brainflow_board.start_publishing("cyton_stream")
+
+    process = multiprocessing.get_context("spawn").Process(target=subscriber_process)
+    process.start()
+    process.join()
+
+    brainflow_board.stop()
@@ -0,0 +1,273 @@
+import numpy as np
+
+
+class SpectralProbes:
+    """
+    Power of a multichannel window at a fixed set of frequencies (and their harmonics), for SSVEP detection.
+
+    Instead of a full spectrum, a windowed complex exponential basis is precomputed for every probe frequency, so the
+    power of all channels at all probes is a single matrix product. Probes do not have to fall on FFT bins, which
+    suits closely spaced stimulation frequencies (e.g. 10.00 and 10.43 Hz).
+
+    Besides the target frequencies and their harmonics, probes are placed on neighboring bins of each of them
+    (skipping the adjacent bin, inside the Hann main lobe) to express each target power as a signal-to-noise ratio,
+    which removes the 1/f bias between low and high stimulation frequencies.
+
+    The window can also slide over a stream: update() keeps running DFT sums at every probe and only processes the
+    new and the dropped samples, giving the same powers as the block computation on the latest n_samples.
+
+    Attributes:
+        sfreq (float): Sampling frequency in Hz.
+        n_samples (int): Window length in samples.
+        freqs (numpy.ndarray): Target frequencies in Hz.
+        n_harmonics (int): Number of harmonics probed per target (1 = fundamental only).
+        probe_freqs (numpy.ndarray): Probed frequencies of shape (n_freqs, n_harmonics).
+        n_neighbors (int): Number of neighboring bins on each side used as the noise estimate (0 disables it).
+        window (str): 'hann' or None (rectangular).
+    """
+
+    def __init__(self, sfreq, n_samples, freqs, n_harmonics=2, n_neighbors=2, window="hann"):
+        """
+        Initializes the probes and precomputes their bases.
+
+        Args:
+            sfreq (float): Sampling frequency in Hz.
+            n_samples (int): Window length in samples.
+            freqs (list): Target frequencies in Hz.
+            n_harmonics (int): Number of harmonics probed per target, including the fundamental. Default is 2.
+            n_neighbors (int): Number of neighboring bins on each side used as the noise estimate of the SNR.
+                Default is 2.
+            window (str): 'hann' (periodic Hann) or None for a rectangular window. Default is 'hann'.
+
+        Raises:
+            ValueError: If the window type is unknown or a probe is at or above the Nyquist frequency.
+        """
+        if window not in ("hann", None):
+            raise ValueError(f"Unknown window '{window}', use 'hann' or None.")
+        self.sfreq = float(sfreq)
+        self.n_samples = int(n_samples)
+        self.freqs = np.asarray(freqs, dtype=np.float64)
+        self.n_harmonics = n_harmonics
+        self.n_neighbors = n_neighbors
+        self.window = window
+        self.probe_freqs = self.freqs[:, None] * np.arange(1, n_harmonics + 1)
+
+        # All probed frequencies in one vector: the targets first, then their neighbors
+        df = self.sfreq / self.n_samples
+        offsets = np.concatenate([-np.arange(2, n_neighbors + 2), np.arange(2, n_neighbors + 2)]) * df
+        neighbor_freqs = (self.probe_freqs.ravel()[:, None] + offsets).ravel()
+        all_freqs = np.concatenate([self.probe_freqs.ravel(), neighbor_freqs])
+        if np.any(all_freqs >= self.sfreq / 2) or np.any(all_freqs <= 0):
+            raise ValueError(f"All probes must lie between 0 and {self.sfreq / 2} Hz (Nyquist).")
+        self._n_probes = self.probe_freqs.size
+        self._omegas = 2 * np.pi * all_freqs / self.sfreq
+
+        k = np.arange(self.n_samples)
+        taper = 0.5 - 0.5 * np.cos(2 * np.pi * k / self.n_samples) if window == "hann" else np.ones(self.n_samples)
+        # One-sided power spectral density scaling, as for a periodogram
+        self._scale = 2.0 / (self.sfreq * np.sum(taper ** 2))
+        phases = np.outer(k, self._omegas)
+        # Real basis [w cos | -w sin] of shape (n_samples, 2 * n_all), so the product with real data stays real
+        self._basis = np.concatenate([taper[:, None] * np.cos(phases), -taper[:, None] * np.sin(phases)], axis=1)
+        # DFT of the window itself, to remove the window mean in the sliding computation
+        self._taper_dft = self._basis[:, :len(all_freqs)].sum(axis=0) + 1j * self._basis[:, len(all_freqs):].sum(axis=0)
+
+        # Sliding state: a periodic Hann window is a combination of three rectangular DFTs, at w and w +- 2 pi / N
+        if window == "hann":
+            step = 2 * np.pi / self.n_samples
+            self._sliding_omegas = np.concatenate([self._omegas, self._omegas - step, self._omegas + step])
+        else:
+            self._sliding_omegas = self._omegas
+        self._sliding_table = np.exp(-1j * np.outer(k, self._sliding_omegas))
+        self._wrap = np.exp(1j * self._sliding_omegas * self.n_samples)
+        self._buffer = None
+        self.reset()
+
+    def _spectrum_to_power(self, spectrum):
+        """
+        Converts probe DFTs of shape (n_channels, n_all) to (target powers, neighbor powers).
+        """
+        power = (spectrum.real ** 2 + spectrum.imag ** 2) * self._scale
+        n_channels = power.shape[0]
+        target = power[:, :self._n_probes].reshape(n_channels, len(self.freqs), self.n_harmonics)
+        neighbors = power[:, self._n_probes:].reshape(n_channels, len(self.freqs), self.n_harmonics, -1)
+        return target, neighbors
+
+    def _block_spectrum(self, data):
+        """
+        Returns the windowed DFT of the mean-removed data at every probe, shape (n_channels, n_all).
+        """
+        data = np.asarray(data, dtype=np.float64)
+        if data.shape[-1] != self.n_samples:
+            raise ValueError(f"Expected {self.n_samples} samples, got {data.shape[-1]}.")
+        product = (data - data.mean(axis=-1, keepdims=True)) @ self._basis
+        n_all = len(self._omegas)
+        return product[..., :n_all] + 1j * product[..., n_all:]
+
+    def power(self, data):
+        """
+        Computes the power of every channel at every probe frequency.
+
+        Args:
+            data (numpy.ndarray): Array of shape (n_channels, n_samples).
+
+        Returns:
+            numpy.ndarray: Power spectral density at the probes, shape (n_channels, n_freqs, n_harmonics).
+        """
+        return self._spectrum_to_power(self._block_spectrum(data))[0]
+
+    def snr(self, data):
+        """
+        Computes the power at every probe divided by the mean power of its neighboring bins.
+
+        Args:
+            data (numpy.ndarray): Array of shape (n_channels, n_samples).
+
+        Returns:
+            numpy.ndarray: SNR of shape (n_channels, n_freqs, n_harmonics).
+        """
+        return self._snr(*self._spectrum_to_power(self._block_spectrum(data)))
+
+    def _snr(self, target, neighbors):
+        if self.n_neighbors == 0:
+            raise ValueError("SNR needs n_neighbors > 0.")
+        return target / (neighbors.mean(axis=-1) + 1e-30)
+
+    def _scores(self, target, neighbors):
+        """
+        Sums the harmonics of each target and averages the channels, as SNR when neighbors are probed.
+        """
+        values = self._snr(target, neighbors) if self.n_neighbors else target
+        return {float(freq): float(score) for freq, score in zip(self.freqs, values.sum(axis=2).mean(axis=0))}
+
+    def scores(self, data):
+        """
+        Scores every target frequency, with the same output as basic_cca in the SSVEP games.
+
+        Args:
+            data (numpy.ndarray): Array of shape (n_channels, n_samples).
+
+        Returns:
+            dict: Target frequency to score (SNR summed over harmonics and averaged over channels, or power when
+                n_neighbors is 0). The detected frequency is max(scores, key=scores.get).
+        """
+        return self._scores(*self._spectrum_to_power(self._block_spectrum(data)))
+
+    def reset(self):
+        """
+        Clears the sliding state.
+        """
+        self._buffer = None
+        self._sums = None
+        self._n_seen = 0  # samples received since the last resynchronization
+        self._n_filled = 0
+
+    def _resync(self):
+        """
+        Recomputes the running sums exactly from the buffered window, which becomes the new phase origin.
+        """
+        self._sums = self._buffer @ self._sliding_table
+        self._sample_sum = self._buffer.sum(axis=1)
+        self._n_seen = self.n_samples
+
+    def update(self, chunk):
+        """
+        Slides the window over new samples of a stream.
+
+        Only the new samples and the samples leaving the window are processed; the running sums are recomputed
+        from the buffered window once per window length, so rounding errors cannot accumulate.
+
+        Args:
+            chunk (numpy.ndarray): New samples of shape (n_channels, n_new_samples).
+
+        Returns:
+            dict: Scores of the latest n_samples (see scores()).
+            None: Until n_samples samples have been received.
+        """
+        chunk = np.asarray(chunk, dtype=np.float64)
+        n_new = chunk.shape[1]
+        if self._buffer is None:
+            self._buffer = np.zeros((chunk.shape[0], self.n_samples))
+        if n_new == 0:
+            return self.current_scores()
+
+        if n_new >= self.n_samples or self._n_filled < self.n_samples or self._n_seen >= 2 * self.n_samples:
+            self._buffer = np.concatenate([self._buffer[:, n_new:], chunk[:, -self.n_samples:]], axis=1) \
+                if n_new < self.n_samples else chunk[:, -self.n_samples:].copy()
+            self._n_filled = min(self._n_filled + n_new, self.n_samples)
+            if self._n_filled == self.n_samples:
+                self._resync()
+            return self.current_scores()
+
+        # x_new enters at positions n_seen..n_seen+n_new-1 (relative to the phase origin) and the samples of
+        # the same offsets one window earlier leave, hence the e^{j w N} factor for them
+        dropped = self._buffer[:, :n_new]
+        rotation = np.exp(-1j * self._sliding_omegas * self._n_seen)
+        table = self._sliding_table[:n_new]
+        self._sums += ((chunk @ table) - (dropped @ table) * self._wrap) * rotation
+        self._sample_sum += chunk.sum(axis=1) - dropped.sum(axis=1)
+        self._buffer[:, :-n_new] = self._buffer[:, n_new:]
+        self._buffer[:, -n_new:] = chunk
+        self._n_seen += n_new
+        return self.current_scores()
+
+    def _sliding_spectrum(self):
+        """
+        Returns the windowed DFT of the mean-removed current window, shape (n_channels, n_all).
+        """
+        start = self._n_seen - self.n_samples
+        relative = self._sums * np.exp(1j * self._sliding_omegas * start)
+        n_all = len(self._omegas)
+        if self.window == "hann":
+            spectrum = 0.5 * relative[:, :n_all] - 0.25 * relative[:, n_all:2 * n_all] - 0.25 * relative[:, 2 * n_all:]
+        else:
+            spectrum = relative
+        mean = self._sample_sum / self.n_samples
+        return spectrum - mean[:, None] * self._taper_dft
+
+    def current_power(self):
+        """
+        Returns the power at the probes of the current sliding window.
+
+        Returns:
+            numpy.ndarray: Power of shape (n_channels, n_freqs, n_harmonics).
+            None: Until n_samples samples have been received.
+        """
+        if self._n_filled < self.n_samples:
+            return None
+        return self._spectrum_to_power(self._sliding_spectrum())[0]
+
+    def current_scores(self):
+        """
+        Returns the scores of the current sliding window (see scores()).
+
+        Returns:
+            dict: Target frequency to score.
+            None: Until n_samples samples have been received.
+        """
+        if self._n_filled < self.n_samples:
+            return None
+        return self._scores(*self._spectrum_to_power(self._sliding_spectrum()))
+
+
+#######
+# Example of a baseline SSVEP detector for the Maze game frequencies on a live board
+######
+# if __name__ == "__main__":
+#     import time
+#
+#     from brainflow.board_shim import BoardIds
+#     from brainflow_stream import BrainFlowBoardSetup
+#
+#     brainflow_board = BrainFlowBoardSetup(board_id=BoardIds.CYTON_BOARD.value)
+#     brainflow_board.setup()
+#     sfreq = brainflow_board.get_sampling_rate()
+#     probes = SpectralProbes(sfreq, n_samples=4 * sfreq, freqs=[5, 10, 15, 20], n_harmonics=2)
+#     cursor = brainflow_board.create_cursor()
+#     while True:
+#         chunk = cursor.read(channels=['O1', 'O2'])
+#         scores = probes.update(chunk) if chunk is not None else None
+#         if scores is not None:
+#             best_freq = max(scores, key=scores.get)
+#             print(f"{best_freq} Hz (SNR {scores[best_freq]:.1f})")
+#         time.sleep(0.1)
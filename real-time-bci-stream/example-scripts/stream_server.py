@@ -0,0 +1,593 @@
+import json
+import os
+import queue
+import socket
+import struct
+import threading
+import time
+
+import numpy as np
+
+from brainflow_stream import RingBuffer, get_board_descr
+
+# Every frame starts with: magic | frame type | n_float32_rows | n_float64_rows | length | sequence
+#   - metadata frames (FRAME_METADATA): length is the size of the JSON payload that follows, sequence is 0
+#   - data frames (FRAME_DATA): length is the number of samples, sequence is the stream index of the first sample.
+#     The payload is n_float32_rows * length float32 values (the signal rows) followed by
+#     n_float64_rows * length float64 values (timestamp and marker rows, which float32 cannot hold exactly).
+FRAME_HEADER = struct.Struct("<4sBxHHIQ")
+FRAME_MAGIC = b"BFST"
+FRAME_METADATA = 1
+FRAME_DATA = 2
+
+
+def _recv_exactly(sock, num_bytes):
+    """
+    Receives exactly num_bytes from a socket.
+
+    Args:
+        sock (socket.socket): Connected socket.
+        num_bytes (int): Number of bytes to receive.
+
+    Returns:
+        bytearray: The received bytes.
+        None: If the connection was closed before num_bytes arrived.
+    """
+    data = bytearray(num_bytes)
+    view = memoryview(data)
+    received = 0
+    while received < num_bytes:
+        n = sock.recv_into(view[received:], num_bytes - received)
+        if n == 0:
+            return None
+        received += n
+    return data
+
+
+class _ClientConnection:
+    """
+    One connected client of a BrainFlowStreamServer: a bounded frame queue drained by a sender thread.
+
+    The metadata frame is kept outside the queue and sent before anything else, so it can neither be overtaken by
+    data frames queued before the sender thread starts nor be dropped when the queue is full.
+
+    Attributes:
+        address: Address of the client.
+        dropped_frames (int): Number of frames dropped because the client did not keep up.
+        sent_frames (int): Number of frames sent to the client.
+    """
+
+    def __init__(self, sock, address, max_queue_frames, on_close, metadata_frame):
+        self.sock = sock
+        self.address = address
+        self.dropped_frames = 0
+        self.sent_frames = 0
+        self._metadata_frame = metadata_frame
+        self._queue = queue.Queue(maxsize=max_queue_frames)
+        self._on_close = on_close
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._send_loop, name=f"stream client {address}", daemon=True)
+
+    def start(self):
+        """
+        Starts the sender thread, which sends the metadata frame before any queued data frame.
+        """
+        self._thread.start()
+
+    def enqueue(self, frame):
+        """
+        Queues a data frame. If the queue is full the oldest queued frame is dropped, so a slow client loses
+        data instead of delaying the server or the other clients.
+
+        Args:
+            frame (bytes): Encoded data frame.
+        """
+        while True:
+            try:
+                self._queue.put_nowait(frame)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped_frames += 1
+                except queue.Empty:
+                    pass
+
+    def _send_loop(self):
+        """
+        Body of the sender thread.
+        """
+        try:
+            self.sock.sendall(self._metadata_frame)
+            while not self._closed.is_set():
+                try:
+                    frame = self._queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                self.sock.sendall(frame)
+                self.sent_frames += 1
+        except OSError:
+            pass  # client went away
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Closes the connection. Safe to call more than once.
+        """
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+        self._on_close(self)
+
+
+class BrainFlowStreamServer:
+    """
+    Serves the data of a BrainFlowBoardSetup to BrainFlowStreamClient instances over TCP or a Unix socket.
+
+    A background thread reads new samples through a BoardCursor every chunk_ms milliseconds, encodes them once as a
+    binary frame (signal rows as float32, timestamp and marker rows as float64) and hands the frame to every connected
+    client. Each client has its own bounded queue and sender thread: a client that falls behind has its oldest frames
+    dropped, without slowing down acquisition or the other clients.
+
+    Attributes:
+        board_setup (BrainFlowBoardSetup): The board being served.
+        address: The address the server listens on, (host, port) for TCP or a path for a Unix socket.
+        metadata (dict): Board information sent to every client on connect.
+        samples_sent (int): Number of samples read from the board and framed so far.
+    """
+
+    def __init__(self, board_setup, host="127.0.0.1", port=0, unix_path=None, chunk_ms=50, max_queue_frames=200):
+        """
+        Initializes the server. Nothing is opened until start() is called.
+
+        Args:
+            board_setup (BrainFlowBoardSetup): The board to serve. It must be set up before start() is called.
+            host (str): Interface to listen on. Default is localhost only.
+            port (int): TCP port to listen on. Default is 0, which picks a free port (see address after start()).
+            unix_path (str, optional): Listen on this Unix socket path instead of TCP.
+            chunk_ms (float): Interval between frames in milliseconds. Default is 50.
+            max_queue_frames (int): Maximum number of frames queued per client. Default is 200 (10 s at 50 ms).
+        """
+        self.board_setup = board_setup
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.chunk_ms = chunk_ms
+        self.max_queue_frames = max_queue_frames
+        self.address = None
+        self.metadata = None
+        self.samples_sent = 0
+        self._server_socket = None
+        self._clients = []
+        self._clients_lock = threading.Lock()
+        self._metadata_frame = None
+        self._cursor = None
+        self._float32_rows = None
+        self._float64_rows = None
+        self._accept_thread = None
+        self._stream_thread = None
+        self._stop_event = threading.Event()
+
+    def _build_metadata(self):
+        """
+        Collects the board information clients need to rebuild BrainFlow-shaped arrays.
+
+        Returns:
+            dict: Board id, sampling rate, number of rows and the row indices of the special channels.
+        """
+        board_setup = self.board_setup
+        board_descr = get_board_descr(board_setup.get_layout_board_id())
+        return {
+            "name": board_setup.name,
+            "board_id": board_setup.board_id,
+            "master_board": board_setup.master_board,
+            "layout_board_id": board_setup.get_layout_board_id(),
+            "sampling_rate": board_setup.sampling_rate,
+            "n_rows": int(board_descr["num_rows"]),
+            "eeg_channels": list(board_setup.eeg_channels),
+            "timestamp_channel": board_setup.timestamp_channel,
+            "package_num_channel": board_setup.package_num_channel,
+            "marker_channel": board_descr.get("marker_channel"),
+        }
+
+    def start(self):
+        """
+        Opens the listening socket and starts the streaming and accept threads.
+        """
+        if self.board_setup.board is None:
+            print("Board is not set up, cannot start the stream server.")
+            return
+        if self._stream_thread is not None:
+            print(f"[{self.board_setup.name}] Stream server is already running.")
+            return
+
+        self.metadata = self._build_metadata()
+        self._float64_rows = [row for row in (self.metadata["timestamp_channel"], self.metadata["marker_channel"])
+                              if row is not None]
+        self._float32_rows = [row for row in range(self.metadata["n_rows"]) if row not in self._float64_rows]
+        self.metadata["float32_rows"] = self._float32_rows
+        self.metadata["float64_rows"] = self._float64_rows
+        payload = json.dumps(self.metadata).encode("utf-8")
+        self._metadata_frame = FRAME_HEADER.pack(FRAME_MAGIC, FRAME_METADATA, 0, 0, len(payload), 0) + payload
+
+        if self.unix_path is not None:
+            if os.path.exists(self.unix_path):
+                os.unlink(self.unix_path)
+            self._server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._server_socket.bind(self.unix_path)
+            self.address = self.unix_path
+        else:
+            self._server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._server_socket.bind((self.host, self.port))
+            self.address = self._server_socket.getsockname()
+        self._server_socket.listen()
+        self._server_socket.settimeout(0.5)
+
+        self._cursor = self.board_setup.create_cursor()
+        self._stop_event.clear()
+        self._accept_thread = threading.Thread(target=self._accept_loop, name=f"{self.board_setup.name} server accept",
+                                               daemon=True)
+        self._stream_thread = threading.Thread(target=self._stream_loop, name=f"{self.board_setup.name} server stream",
+                                               daemon=True)
+        self._accept_thread.start()
+        self._stream_thread.start()
+        print(f"[{self.board_setup.name}] Stream server listening on {self.address}")
+
+    def _accept_loop(self):
+        """
+        Body of the accept thread: registers new clients, which send the metadata frame first.
+        """
+        while not self._stop_event.is_set():
+            try:
+                sock, address = self._server_socket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break  # server socket closed
+            sock.settimeout(None)
+            if sock.family != socket.AF_UNIX:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            client = _ClientConnection(sock, address or self.address, self.max_queue_frames, self._remove_client,
+                                       self._metadata_frame)
+            with self._clients_lock:
+                self._clients.append(client)
+            client.start()
+            print(f"[{self.board_setup.name}] Stream client connected: {client.address}")
+
+    def _remove_client(self, client):
+        """
+        Forgets a client whose connection was closed.
+
+        Args:
+            client (_ClientConnection): The closed client.
+        """
+        with self._clients_lock:
+            if client in self._clients:
+                self._clients.remove(client)
+
+    def encode_frame(self, chunk, sequence):
+        """
+        Encodes a block of board data as a data frame.
+
+        Args:
+            chunk (numpy.ndarray): Array of shape (n_rows, n_samples), as returned by BrainFlow.
+            sequence (int): Stream index of the first sample in the block.
+
+        Returns:
+            bytes: The encoded frame.
+        """
+        n_samples = chunk.shape[1]
+        header = FRAME_HEADER.pack(FRAME_MAGIC, FRAME_DATA, len(self._float32_rows), len(self._float64_rows),
+                                   n_samples, sequence)
+        float32_part = np.ascontiguousarray(chunk[self._float32_rows], dtype="<f4")
+        float64_part = np.ascontiguousarray(chunk[self._float64_rows], dtype="<f8")
+        return b"".join((header, float32_part.tobytes(), float64_part.tobytes()))
+
+    def _stream_loop(self):
+        """
+        Body of the streaming thread: frames new samples every chunk_ms milliseconds and queues them for all clients.
+        """
+        while not self._stop_event.wait(self.chunk_ms / 1000.0):
+            chunk = self._cursor.read()
+            if chunk is None or chunk.shape[1] == 0:
+                continue
+            frame = self.encode_frame(chunk, self.samples_sent)
+            self.samples_sent += chunk.shape[1]
+            with self._clients_lock:
+                clients = list(self._clients)
+            for client in clients:
+                client.enqueue(frame)
+
+    def get_client_stats(self):
+        """
+        Returns per-client delivery statistics.
+
+        Returns:
+            list: One dict per connected client with 'address', 'sent_frames', 'dropped_frames' and 'queued_frames'.
+        """
+        with self._clients_lock:
+            return [{"address": client.address, "sent_frames": client.sent_frames,
+                     "dropped_frames": client.dropped_frames, "queued_frames": client._queue.qsize()}
+                    for client in self._clients]
+
+    def stop(self):
+        """
+        Stops the server and disconnects all clients. The board keeps streaming.
+        """
+        if self._stream_thread is None:
+            return
+        self._stop_event.set()
+        self._stream_thread.join()
+        self._server_socket.close()
+        self._accept_thread.join()
+        with self._clients_lock:
+            clients = list(self._clients)
+        for client in clients:
+            client.close()
+        if self.unix_path is not None and os.path.exists(self.unix_path):
+            os.unlink(self.unix_path)
+        self._stream_thread = None
+        self._accept_thread = None
+        self._server_socket = None
+        print(f"[{self.board_setup.name}] Stream server stopped.")
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+class BrainFlowStreamClient:
+    """
+    Receives a board served by BrainFlowStreamServer, with the same read API as BrainFlowBoardSetup.
+
+    A background thread receives frames into a local RingBuffer laid out like BrainFlow's output (all board rows, in
+    order), so get_current_board_data(num_samples) and get_board_data() behave as they would on the board's own
+    machine. Signal rows arrive as float32, so they carry float32 precision; timestamp and marker rows are exact.
+
+    Attributes:
+        address: Address of the server, (host, port) for TCP or a path for a Unix socket.
+        metadata (dict): Board information sent by the server.
+        name (str): Name of the served board.
+        eeg_channels (list): EEG channel rows.
+        sampling_rate (int): Sampling rate of the board.
+        timestamp_channel (int): Row index of the timestamp channel.
+        package_num_channel (int): Row index of the package number channel.
+        marker_channel (int): Row index of the marker channel.
+        dropped_samples (int): Samples the server dropped for this client because it did not keep up.
+        connected (bool): Whether the connection to the server is open.
+    """
+
+    def __init__(self, host="127.0.0.1", port=None, unix_path=None, buffer_seconds=30, timeout=5.0):
+        """
+        Connects to a server and waits for its metadata.
+
+        Args:
+            host (str): Host of the server. Default is localhost.
+            port (int): TCP port of the server.
+            unix_path (str, optional): Connect to this Unix socket path instead of TCP.
+            buffer_seconds (float): Length of the local buffer in seconds. Default is 30.
+            timeout (float): Seconds to wait for the connection and metadata. Default is 5.
+
+        Raises:
+            ConnectionError: If the server closes the connection before sending its metadata.
+            ValueError: If the server does not speak this protocol.
+        """
+        if unix_path is not None:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.address = unix_path
+        else:
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.address = (host, port)
+        self._sock.settimeout(timeout)
+        self._sock.connect(self.address)
+
+        kind, _, _, length, _ = self._recv_header()
+        if kind != FRAME_METADATA:
+            self._sock.close()
+            raise ValueError(f"Expected a metadata frame from {self.address}, got frame type {kind}.")
+        payload = _recv_exactly(self._sock, length)
+        if payload is None:
+            self._sock.close()
+            raise ConnectionError(f"Stream server {self.address} closed the connection.")
+        self._sock.settimeout(None)
+
+        self.metadata = json.loads(payload.decode("utf-8"))
+        self.name = self.metadata["name"]
+        self.eeg_channels = self.metadata["eeg_channels"]
+        self.sampling_rate = self.metadata["sampling_rate"]
+        self.timestamp_channel = self.metadata["timestamp_channel"]
+        self.package_num_channel = self.metadata["package_num_channel"]
+        self.marker_channel = self.metadata["marker_channel"]
+        self._float32_rows = self.metadata["float32_rows"]
+        self._float64_rows = self.metadata["float64_rows"]
+
+        self.ring_buffer = RingBuffer(self.metadata["n_rows"], int(buffer_seconds * self.sampling_rate))
+        self.dropped_samples = 0
+        self.connected = True
+        self._expected_sequence = None
+        self._read_position = 0
+        self._thread = threading.Thread(target=self._receive_loop, name=f"{self.name} client", daemon=True)
+        self._thread.start()
+
+    def _recv_header(self):
+        """
+        Receives and checks one frame header.
+
+        Returns:
+            tuple: (frame type, n_float32_rows, n_float64_rows, length, sequence).
+
+        Raises:
+            ConnectionError: If the connection is closed.
+            ValueError: If the frame does not start with the protocol magic.
+        """
+        header = _recv_exactly(self._sock, FRAME_HEADER.size)
+        if header is None:
+            raise ConnectionError(f"Stream server {self.address} closed the connection.")
+        magic, kind, n_float32_rows, n_float64_rows, length, sequence = FRAME_HEADER.unpack(header)
+        if magic != FRAME_MAGIC:
+            raise ValueError(f"Unexpected data from {self.address}, not a BrainFlowStreamServer.")
+        return kind, n_float32_rows, n_float64_rows, length, sequence
+
+    def _receive_loop(self):
+        """
+        Body of the receiver thread: decodes data frames into the local ring buffer.
+        """
+        try:
+            while True:
+                kind, n_float32_rows, n_float64_rows, n_samples, sequence = self._recv_header()
+                payload = _recv_exactly(self._sock, n_samples * (4 * n_float32_rows + 8 * n_float64_rows))
+                if payload is None:
+                    break
+                if kind != FRAME_DATA:
+                    continue
+                self.ring_buffer.write(self.decode_frame(payload, n_float32_rows, n_float64_rows, n_samples))
+                if self._expected_sequence is not None and sequence > self._expected_sequence:
+                    self.dropped_samples += sequence - self._expected_sequence
+                self._expected_sequence = sequence + n_samples
+        except (ConnectionError, OSError, ValueError):
+            pass
+        self.connected = False
+
+    def decode_frame(self, payload, n_float32_rows, n_float64_rows, n_samples):
+        """
+        Decodes the payload of a data frame into a BrainFlow-shaped array.
+
+        Args:
+            payload (bytes): Frame payload.
+            n_float32_rows (int): Number of float32 rows in the payload.
+            n_float64_rows (int): Number of float64 rows in the payload.
+            n_samples (int): Number of samples in the frame.
+
+        Returns:
+            numpy.ndarray: Array of shape (n_rows, n_samples), float64.
+        """
+        float32_size = 4 * n_float32_rows * n_samples
+        chunk = np.empty((self.metadata["n_rows"], n_samples), dtype=np.float64)
+        chunk[self._float32_rows] = np.frombuffer(payload, dtype="<f4", count=n_float32_rows * n_samples) \
+            .reshape(n_float32_rows, n_samples)
+        chunk[self._float64_rows] = np.frombuffer(payload, dtype="<f8", offset=float32_size) \
+            .reshape(n_float64_rows, n_samples)
+        return chunk
+
+    def get_sampling_rate(self):
+        """
+        Retrieves the sampling rate of the served board.
+
+        Returns:
+            int: The sampling rate.
+        """
+        return self.sampling_rate
+
+    def get_board_data_count(self):
+        """
+        Returns the number of samples available to get_board_data().
+
+        Returns:
+            int: Number of unread samples (at most the local buffer capacity).
+        """
+        return min(self.ring_buffer.total_written - self._read_position, self.ring_buffer.capacity)
+
+    def get_current_board_data(self, num_samples):
+        """
+        Retrieves the most recent num_samples received from the server.
+
+        Args:
+            num_samples (int): Number of recent samples to fetch.
+
+        Returns:
+            numpy.ndarray: Array of shape (n_rows, n), n <= num_samples if less data is available.
+        """
+        with self.ring_buffer._lock:
+            return self.ring_buffer.latest(num_samples).copy()
+
+    def get_board_data(self):
+        """
+        Retrieves all samples received since the previous get_board_data() call.
+
+        If more than the buffer capacity arrived in between, only the newest capacity samples are returned.
+
+        Returns:
+            numpy.ndarray: Array of shape (n_rows, n_new_samples).
+        """
+        with self.ring_buffer._lock:
+            total_written = self.ring_buffer.total_written
+            data = self.ring_buffer.latest(total_written - self._read_position).copy()
+        self._read_position = total_written
+        return data
+
+    def wait_for_samples(self, num_samples, timeout=5.0):
+        """
+        Blocks until at least num_samples have been received in total.
+
+        Args:
+            num_samples (int): Number of samples to wait for.
+            timeout (float): Maximum number of seconds to wait. Default is 5.
+
+        Returns:
+            bool: True if the samples arrived, False on timeout or disconnection.
+        """
+        deadline = time.perf_counter() + timeout
+        while self.ring_buffer.total_written < num_samples:
+            if not self.connected or time.perf_counter() > deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def close(self):
+        """
+        Disconnects from the server.
+        """
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+            self._thread.join(timeout=1.0)
+            self._sock = None
+            self.connected = False
+
+    def stop(self):
+        """
+        Alias of close(), so the client can be used wherever a BrainFlowBoardSetup is stopped.
+        """
+        self.close()
+
+
+#######
+# Example serving a synthetic board over localhost
+######
+if __name__ == "__main__":
+    from brainflow.board_shim import BoardIds
+    from brainflow_stream import BrainFlowBoardSetup
+
+    brainflow_board = BrainFlowBoardSetup(board_id=BoardIds.SYNTHETIC_BOARD.value, master_board=BoardIds.CYTON_BOARD.value,
+                                          name="Synthetic")
+    brainflow_board.setup()
+
+    with BrainFlowStreamServer(brainflow_board, port=0) as server:
+        client = BrainFlowStreamClient(port=server.address[1])
+        time.sleep(2)
+        data = client.get_board_data()
+        print(f"Client received {data.shape} from '{client.name}', {client.dropped_samples} samples dropped")
+        client.close()
+
+    brainflow_board.stop()
+
+## On the acquisition machine (listen on all interfaces):
+# server = BrainFlowStreamServer(brainflow_board, host="0.0.0.0", port=6500)
+# server.start()
+## On the decoding machine:
+# client = BrainFlowStreamClient(host="192.168.1.20", port=6500)
+# eeg = client.get_current_board_data(250)[client.eeg_channels]
@@ -0,0 +1,365 @@
+import functools
+
+import numpy as np
+from scipy.signal import butter, iirnotch, sosfilt, sosfilt_zi, sosfiltfilt, tf2sos
+
+
+@functools.lru_cache(maxsize=128)
+def _design_butter(kind, order, band, sfreq, output):
+    """
+    Returns read-only Butterworth coefficients, memoized.
+    """
+    coefficients = butter(order, band, btype=kind, fs=sfreq, output=output)
+    for array in (coefficients if output == "ba" else (coefficients,)):
+        array.flags.writeable = False
+    return coefficients
+
+
+def design_filter(kind, order, band, sfreq, output="sos"):
+    """
+    Designs a Butterworth filter, memoized per (kind, order, band, sampling rate, output).
+
+    Real-time loops that call a filtering helper on every update get the coefficients from the cache instead of
+    re-running the design. Copies of the cached arrays are returned, since scipy's sosfilt only accepts writeable
+    coefficients and callers must not be able to alter the cache.
+
+    Args:
+        kind (str): 'bandpass', 'bandstop', 'highpass' or 'lowpass'.
+        order (int): Filter order.
+        band (float or tuple): Cutoff frequency in Hz, or (low, high) for bandpass and bandstop filters.
+        sfreq (float): Sampling frequency in Hz.
+        output (str): 'sos' for second-order sections or 'ba' for transfer function coefficients. Default is 'sos'.
+
+    Returns:
+        numpy.ndarray: SOS array of shape (n_sections, 6) if output is 'sos'.
+        tuple: (b, a) if output is 'ba'.
+    """
+    coefficients = _design_butter(kind, order, band, sfreq, output)
+    if output == "ba":
+        return coefficients[0].copy(), coefficients[1].copy()
+    return coefficients.copy()
+
+
+@functools.lru_cache(maxsize=32)
+def _design_notch_section(freq, quality, sfreq):
+    """
+    Returns the read-only second-order section of one IIR notch, memoized.
+    """
+    sos = tf2sos(*iirnotch(freq, quality, fs=sfreq))
+    sos.flags.writeable = False
+    return sos
+
+
+def design_bandpass(sfreq, low, high, order=4):
+    """
+    Designs a Butterworth bandpass filter as second-order sections (memoized, see design_filter).
+
+    Args:
+        sfreq (float): Sampling frequency in Hz.
+        low (float): Low cutoff frequency in Hz.
+        high (float): High cutoff frequency in Hz.
+        order (int): Filter order. Default is 4.
+
+    Returns:
+        numpy.ndarray: SOS array of shape (n_sections, 6).
+    """
+    return design_filter("bandpass", order, (float(low), float(high)), float(sfreq))
+
+
+def design_highpass(sfreq, cutoff, order=2):
+    """
+    Designs a Butterworth highpass filter as second-order sections, e.g. to remove the DC offset and slow drifts
+    (memoized, see design_filter).
+
+    Args:
+        sfreq (float): Sampling frequency in Hz.
+        cutoff (float): Cutoff frequency in Hz.
+        order (int): Filter order. Default is 2.
+
+    Returns:
+        numpy.ndarray: SOS array of shape (n_sections, 6).
+    """
+    return design_filter("highpass", order, float(cutoff), float(sfreq))
+
+
+def design_notch(sfreq, freqs=(50.0,), quality=30.0):
+    """
+    Designs a chain of IIR notch filters as second-order sections, one section per frequency.
+
+    Args:
+        sfreq (float): Sampling frequency in Hz.
+        freqs (tuple): Line-noise frequencies to remove in Hz, e.g. (50,), (60,) or (50, 60). Frequencies at or
+            above Nyquist are skipped.
+        quality (float): Quality factor of each notch (center frequency / bandwidth). Default is 30.
+
+    Returns:
+        numpy.ndarray: SOS array of shape (n_sections, 6).
+    """
+    sections = [_design_notch_section(float(freq), float(quality), float(sfreq)) for freq in freqs
+                if freq < sfreq / 2]
+    return np.vstack(sections) if sections else np.empty((0, 6))
+
+
+class StreamingFilter:
+    """
+    Causal IIR filter for multichannel streams that carries its state from one chunk to the next.
+
+    The second-order sections are designed once and the per-channel filter state (zi) is kept between calls, so
+    every sample is filtered exactly once and the output is identical to filtering the whole stream in one
+    sosfilt call, without the edge transients of re-filtering each window.
+
+    Attributes:
+        sos (numpy.ndarray): Second-order sections of all chained filters, shape (n_sections, 6).
+        n_channels (int): Number of channels filtered.
+        samples_processed (int): Number of samples filtered since the last reset.
+    """
+
+    def __init__(self, sos, n_channels):
+        """
+        Initializes the filter.
+
+        Args:
+            sos (numpy.ndarray or list): SOS array, or a list of SOS arrays that are chained in order
+                (e.g. [design_highpass(...), design_notch(...), design_bandpass(...)]).
+            n_channels (int): Number of channels filtered.
+        """
+        if isinstance(sos, (list, tuple)):
+            sos = np.vstack(sos)
+        self.sos = np.asarray(sos, dtype=np.float64)
+        self.n_channels = n_channels
+        # Step response steady state of each section, scaled by the first sample of each channel on first use
+        self._zi_unit = sosfilt_zi(self.sos)[:, None, :]
+        self.reset()
+
+    @classmethod
+    def for_eeg(cls, sfreq, n_channels, bandpass=None, highpass=None, notch=None, order=4, notch_quality=30.0):
+        """
+        Builds the usual EEG chain: optional highpass (DC removal), line-noise notches and bandpass.
+
+        Args:
+            sfreq (float): Sampling frequency in Hz.
+            n_channels (int): Number of channels filtered.
+            bandpass (tuple, optional): (low, high) cutoffs in Hz.
+            highpass (float, optional): Highpass cutoff in Hz.
+            notch (tuple, optional): Line-noise frequencies in Hz, e.g. (50,) or (50, 60).
+            order (int): Order of the Butterworth bandpass. Default is 4. The highpass is second order.
+            notch_quality (float): Quality factor of the notches. Default is 30.
+
+        Returns:
+            StreamingFilter: The chained filter.
+
+        Raises:
+            ValueError: If no filter is requested.
+        """
+        sections = []
+        if highpass is not None:
+            sections.append(design_highpass(sfreq, highpass))
+        if notch:
+            sections.append(design_notch(sfreq, notch, notch_quality))
+        if bandpass is not None:
+            sections.append(design_bandpass(sfreq, bandpass[0], bandpass[1], order))
+        if not sections:
+            raise ValueError("At least one of bandpass, highpass or notch must be given.")
+        return cls(sections, n_channels)
+
+    def reset(self):
+        """
+        Clears the filter state. The next chunk starts the filter again from the steady state of its first sample.
+        """
+        self._zi = None
+        self.samples_processed = 0
+
+    def process(self, chunk):
+        """
+        Filters new samples, continuing from the state left by the previous chunk.
+
+        Args:
+            chunk (numpy.ndarray): New samples of shape (n_channels, n_new_samples).
+
+        Returns:
+            numpy.ndarray: Filtered samples, same shape as chunk.
+        """
+        if chunk.shape[1] == 0:
+            return np.empty(chunk.shape)
+        if self._zi is None:
+            # Starting from the steady state of the first sample avoids the step transient of large DC offsets
+            self._zi = self._zi_unit * chunk[None, :, :1]
+        filtered, self._zi = sosfilt(self.sos, chunk, axis=1, zi=self._zi)
+        self.samples_processed += chunk.shape[1]
+        return filtered
+
+
+class FilterBank:
+    """
+    Bank of K Butterworth bandpass filters applied to a multichannel block in one call, the output gaining a band axis.
+
+    The SOS of all bands are stacked into one (K, n_sections, 6) array (every band has the same order, hence the same
+    number of sections). The bank can be used on windows (apply, optionally zero-phase) or on a stream (process,
+    with the per-band, per-channel state carried between chunks like StreamingFilter). Filter-bank CCA,
+    band-limited envelopes and artifact detectors can share one bank.
+
+    Attributes:
+        bands (list): (low, high) edges of each band in Hz.
+        sfreq (float): Sampling frequency in Hz.
+        order (int): Order of every bandpass.
+        sos (numpy.ndarray): Stacked second-order sections, shape (K, n_sections, 6).
+    """
+
+    def __init__(self, bands, sfreq, order=4):
+        """
+        Initializes the bank. The coefficients come from the design cache.
+
+        Args:
+            bands (list): (low, high) edges of each band in Hz, e.g. [(6, 90), (14, 90), (22, 90)].
+            sfreq (float): Sampling frequency in Hz.
+            order (int): Order of every bandpass. Default is 4.
+        """
+        self.bands = [(float(low), float(high)) for low, high in bands]
+        self.sfreq = float(sfreq)
+        self.order = order
+        self.sos = np.stack([design_bandpass(self.sfreq, low, high, order) for low, high in self.bands])
+        self._zi_unit = np.stack([sosfilt_zi(sos) for sos in self.sos])[:, :, None, :]
+        self.reset()
+
+    def __len__(self):
+        return len(self.bands)
+
+    def apply(self, data, zero_phase=False, out=None):
+        """
+        Filters a block with every band of the bank, without keeping any state.
+
+        Args:
+            data (numpy.ndarray): Array of shape (n_channels, n_samples).
+            zero_phase (bool): Filter forwards and backwards (sosfiltfilt) instead of causally. Default is False.
+            out (numpy.ndarray, optional): Preallocated output of shape (K, n_channels, n_samples).
+
+        Returns:
+            numpy.ndarray: Filtered data of shape (K, n_channels, n_samples).
+        """
+        if out is None:
+            out = np.empty((len(self.bands),) + np.shape(data))
+        # scipy takes one SOS matrix per call, so the loop runs over the K bands and each call covers all channels
+        for k, sos in enumerate(self.sos):
+            out[k] = sosfiltfilt(sos, data, axis=-1) if zero_phase else sosfilt(sos, data, axis=-1)
+        return out
+
+    def reset(self):
+        """
+        Clears the streaming state used by process().
+        """
+        self._zi = None
+
+    def process(self, chunk):
+        """
+        Filters new samples of a stream with every band, continuing from the state left by the previous chunk.
+
+        Args:
+            chunk (numpy.ndarray): New samples of shape (n_channels, n_new_samples).
+
+        Returns:
+            numpy.ndarray: Filtered samples of shape (K, n_channels, n_new_samples).
+        """
+        out = np.empty((len(self.bands),) + chunk.shape)
+        if chunk.shape[1] == 0:
+            return out
+        if self._zi is None:
+            # (K, n_sections, n_channels, 2), starting from the steady state of the first sample
+            self._zi = self._zi_unit * chunk[None, None, :, :1]
+        for k, sos in enumerate(self.sos):
+            out[k], self._zi[k] = sosfilt(sos, chunk, axis=1, zi=self._zi[k])
+        return out
+
+
+class FilteredWindow:
+    """
+    Sliding window of the most recent filtered samples, fed chunk by chunk through a StreamingFilter.
+
+    Attributes:
+        filter (StreamingFilter): Filter applied to incoming samples.
+        window_samples (int): Length of the window in samples.
+        n_filled (int): Number of valid samples in the window (at most window_samples).
+    """
+
+    def __init__(self, streaming_filter, window_samples):
+        """
+        Initializes the window.
+
+        Args:
+            streaming_filter (StreamingFilter): Filter applied to incoming samples.
+            window_samples (int): Length of the window in samples.
+        """
+        self.filter = streaming_filter
+        self.window_samples = window_samples
+        self._window = np.zeros((streaming_filter.n_channels, window_samples))
+        self.n_filled = 0
+
+    @property
+    def full(self):
+        """
+        bool: Whether the window holds window_samples filtered samples.
+        """
+        return self.n_filled == self.window_samples
+
+    @property
+    def data(self):
+        """
+        numpy.ndarray: View of the valid filtered samples, shape (n_channels, n_filled), oldest first.
+        """
+        return self._window[:, self.window_samples - self.n_filled:]
+
+    def update(self, chunk):
+        """
+        Filters new samples and shifts them into the window.
+
+        Args:
+            chunk (numpy.ndarray): New samples of shape (n_channels, n_new_samples).
+
+        Returns:
+            numpy.ndarray: View of the valid filtered samples (see data).
+        """
+        filtered = self.filter.process(chunk)
+        n_new = min(filtered.shape[1], self.window_samples)
+        if n_new:
+            self._window[:, :self.window_samples - n_new] = self._window[:, n_new:]
+            self._window[:, self.window_samples - n_new:] = filtered[:, filtered.shape[1] - n_new:]
+            self.n_filled = min(self.n_filled + filtered.shape[1], self.window_samples)
+        return self.data
+
+    def reset(self):
+        """
+        Empties the window and resets the filter state.
+        """
+        self.filter.reset()
+        self.n_filled = 0
+
+
+#######
+# Example filtering the EEG channels of a live board once per sample and keeping the last 4 seconds for CCA
+######
+# if __name__ == "__main__":
+#     import time
+#
+#     from brainflow.board_shim import BoardIds
+#     from brainflow_stream import BrainFlowBoardSetup
+#
+#     brainflow_board = BrainFlowBoardSetup(board_id=BoardIds.CYTON_BOARD.value)
+#     brainflow_board.setup()
+#     sfreq = brainflow_board.get_sampling_rate()
+#     eeg_filter = StreamingFilter.for_eeg(sfreq, len(brainflow_board.eeg_channels), bandpass=(5.0, 30.0),
+#                                          highpass=1.0, notch=(50.0, 60.0))
+#     window = FilteredWindow(eeg_filter, window_samples=4 * sfreq)
+#     cursor = brainflow_board.create_cursor()
+#     while True:
+#         chunk = cursor.read(channels='eeg')
+#         if chunk is not None:
+#             window.update(chunk)
+#         if window.full:
+#             print(f"RMS: {np.sqrt(np.mean(window.data ** 2, axis=1)).round(2)}")
+#         time.sleep(0.1)
+
+## Alpha, beta and gamma envelopes of all channels from one filter bank
+# if __name__ == "__main__":
+#     bank = FilterBank([(8, 12), (12, 30), (30, 45)], sfreq=250)
+#     eeg = np.random.default_rng(0).standard_normal((8, 1000))
+#     sub_bands = bank.apply(eeg, zero_phase=True)  # (3 bands, 8 channels, 1000 samples)
+#     print(f"Sub-band RMS per channel:\n{np.sqrt(np.mean(sub_bands ** 2, axis=-1)).round(3)}")
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The modules under test are scripts, imported from the example-scripts directory like the benchmarks do
+EXAMPLE_SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "example-scripts"))
+sys.path.insert(0, EXAMPLE_SCRIPTS_DIR)
@@ -0,0 +1,67 @@
+import time
+
+import numpy as np
+import pytest
+from brainflow.board_shim import BoardIds
+
+from board_supervisor import BoardSupervisor, FaultInjector
+from brainflow_stream import BrainFlowBoardSetup
+
+
+@pytest.fixture
+def injector():
+    return FaultInjector()
+
+
+@pytest.fixture
+def synthetic_board(injector):
+    board = BrainFlowBoardSetup(board_id=BoardIds.SYNTHETIC_BOARD.value, master_board=BoardIds.CYTON_BOARD.value,
+                                name="Synthetic")
+    board.board_shim_class = injector.board_shim_class()
+    board.setup()
+    yield board
+    board.stop()
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+def test_stall_reconnects_and_splices_nan_samples(synthetic_board, injector):
+    supervisor = synthetic_board.start_supervisor(stall_timeout_ms=300, initial_backoff=0.1)
+    assert wait_until(lambda: supervisor.ring_buffer.total_written > 0)
+
+    injector.stall()
+    injector.fail_prepare(1)
+    assert wait_until(lambda: supervisor.get_metrics()["reconnects"] == 1)
+    assert wait_until(lambda: supervisor.get_metrics()["gap_samples"] > 0)
+
+    metrics = supervisor.get_metrics()
+    assert metrics["stall_events"] == 1
+    assert metrics["reconnect_attempts"] == 2  # the first attempt was made to fail
+    assert injector.prepare_calls == 3  # initial setup + two reconnect attempts
+    data = supervisor.get_board_data()
+    timestamps = data[synthetic_board.timestamp_channel]
+    assert np.all(np.diff(timestamps) > 0)
+    assert np.isnan(data[synthetic_board.eeg_channels[0]]).sum() == metrics["gap_samples"]
+
+
+def test_acquisition_thread_survives_the_board_being_released(synthetic_board):
+    synthetic_board.start_acquisition(buffer_seconds=5, poll_interval=0.005)
+    assert wait_until(lambda: synthetic_board.ring_buffer.total_written > 0)
+
+    # What the supervisor does on a reconnect, while the acquisition thread keeps polling
+    supervisor = BoardSupervisor(synthetic_board)
+    supervisor._release_board()
+    time.sleep(0.1)
+    assert synthetic_board._acquisition_thread.is_alive()
+
+    synthetic_board.setup()
+    written = synthetic_board.ring_buffer.total_written
+    assert wait_until(lambda: synthetic_board.ring_buffer.total_written > written)
+    assert synthetic_board._acquisition_thread.is_alive()
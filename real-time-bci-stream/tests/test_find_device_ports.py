@@ -0,0 +1,81 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from brainflow.board_shim import BoardIds, BrainFlowError, BrainFlowExitCodes
+
+import brainflow_stream
+from brainflow_stream import BrainFlowBoardSetup
+
+PORTS = [SimpleNamespace(device=f"/dev/ttyUSB{i}", serial_number=f"SN{i}", description=f"Dongle {i}") for i in range(4)]
+
+
+class StubBoardShim:
+    """
+    Stands in for BoardShim: only the session on `answering_port` can be prepared.
+    """
+
+    answering_port = "/dev/ttyUSB2"
+    prepared = []
+
+    def __init__(self, board_id, params):
+        self.params = params
+
+    def prepare_session(self):
+        StubBoardShim.prepared.append(self.params.serial_port)
+        if self.params.serial_port != self.answering_port:
+            raise BrainFlowError("no board", BrainFlowExitCodes.BOARD_NOT_READY_ERROR.value)
+
+    def release_session(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def port_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(brainflow_stream, "PORT_CACHE_PATH", str(tmp_path / "ports.json"))
+    StubBoardShim.prepared = []
+
+
+def test_brainflow_probe_finds_the_answering_port_and_caches_it():
+    board = BrainFlowBoardSetup(board_id=BoardIds.GANGLION_BOARD.value)
+    board.board_shim_class = StubBoardShim
+
+    found = board.find_device_ports(ports=PORTS)
+    assert [(d["port"], d["serial_number"], d["cached"]) for d in found] == [("/dev/ttyUSB2", "SN2", False)]
+    assert StubBoardShim.prepared == [port.device for port in PORTS]
+
+    # Warm start: the remembered device is returned without probing
+    StubBoardShim.prepared = []
+    found = board.find_device_ports(ports=PORTS)
+    assert [(d["port"], d["cached"]) for d in found] == [("/dev/ttyUSB2", True)]
+    assert StubBoardShim.prepared == []
+
+
+def test_cache_is_ignored_when_the_device_is_unplugged_or_for_another_board():
+    board = BrainFlowBoardSetup(board_id=BoardIds.GANGLION_BOARD.value)
+    board.board_shim_class = StubBoardShim
+    board.find_device_ports(ports=PORTS)
+
+    StubBoardShim.prepared = []
+    assert board.find_device_ports(ports=[p for p in PORTS if p.serial_number != "SN2"]) == []
+    assert len(StubBoardShim.prepared) == 3
+
+    other = BrainFlowBoardSetup(board_id=BoardIds.GANGLION_NATIVE_BOARD.value)
+    other.board_shim_class = StubBoardShim
+    StubBoardShim.prepared = []
+    assert [d["cached"] for d in other.find_device_ports(ports=PORTS)] == [False]
+    assert len(StubBoardShim.prepared) == 4
+
+
+def test_openbci_ports_are_probed_in_parallel(monkeypatch):
+    board = BrainFlowBoardSetup(board_id=BoardIds.CYTON_BOARD.value)
+
+    def slow_probe(port_device, timeout):
+        time.sleep(0.3)
+        return port_device == "/dev/ttyUSB1"
+
+    monkeypatch.setattr(board, "_probe_openbci_port", slow_probe)
+    start = time.perf_counter()
+    found = board.find_device_ports(ports=PORTS, use_cache=False)
+    assert time.perf_counter() - start < 0.3 * len(PORTS)
+    assert [d["port"] for d in found] == ["/dev/ttyUSB1"]
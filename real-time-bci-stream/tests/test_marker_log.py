@@ -0,0 +1,47 @@
+import numpy as np
+
+from brainflow_stream import MarkerLog
+
+
+def make_timestamps(start, n_samples, sampling_rate):
+    return start + np.arange(n_samples) / sampling_rate
+
+
+def test_markers_before_the_recording_do_not_shift_later_markers():
+    timestamps = make_timestamps(1100.0, 1000, 250)
+    log = MarkerLog(250)
+    log.append(np.ones(1000), np.linspace(1000.0, 1050.0, 1000))
+    log.append(2, 1102.0)
+
+    index = log.align(timestamps)
+
+    assert np.all(index[:1000] == -1)
+    assert index[1000] == 500
+    assert log.to_mne_events(timestamps).tolist() == [[500, 0, 2]]
+
+
+def test_markers_sharing_a_sample_land_on_the_following_samples():
+    timestamps = make_timestamps(1100.0, 1000, 250)
+    log = MarkerLog(250)
+    # A burst of three markers within one sample period, then a marker on the sample the burst spilled into
+    log.append([1, 2, 3], [1101.0, 1101.0005, 1101.001])
+    log.append(4, 1101.006)
+    # Logged out of time order: must not be pushed behind the burst
+    log.append(5, 1100.5)
+
+    index = log.align(timestamps, first_sample_index=40)
+
+    assert index.tolist() == [290, 291, 292, 293, 165]
+
+
+def test_markers_past_the_end_or_off_stream_are_left_out():
+    timestamps = make_timestamps(1100.0, 10, 250)
+    log = MarkerLog(250)
+    log.append([1, 2], [1100.034, 1100.035])
+    log.append(3, 1100.0, in_stream=False)
+    log.append(4, 1200.0)
+
+    index = log.align(timestamps)
+
+    assert index.tolist() == [9, -1, 0, -1]
+    assert log.to_mne_events().tolist() == [[9, 0, 1]]
@@ -0,0 +1,98 @@
+import json
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from brainflow_stream import RingBuffer
+from shared_stream import CONTROL_BYTES, CONTROL_FIELDS, MAGIC, METADATA_BYTES, SharedBoardSubscriber
+
+N_ROWS = 3
+CAPACITY = 64
+
+
+class ManualPublisher:
+    """
+    Lays out a shared memory block like SharedMemoryPublisher.start() and writes chunks on demand, following the
+    same sequence protocol, so tests control exactly when samples are published.
+    """
+
+    def __init__(self, shm_name):
+        metadata = json.dumps({"name": "Manual", "eeg_channels": [1, 2], "sampling_rate": 250,
+                               "timestamp_channel": 0, "package_num_channel": 0}).encode("utf-8")
+        size = CONTROL_BYTES + METADATA_BYTES + N_ROWS * 2 * CAPACITY * 8
+        self.shm = shared_memory.SharedMemory(name=shm_name, create=True, size=size)
+        self.control = np.ndarray((len(CONTROL_FIELDS),), dtype=np.int64, buffer=self.shm.buf)
+        self.shm.buf[CONTROL_BYTES:CONTROL_BYTES + len(metadata)] = metadata
+        storage = np.ndarray((N_ROWS, 2 * CAPACITY), dtype=np.float64, buffer=self.shm.buf,
+                             offset=CONTROL_BYTES + METADATA_BYTES)
+        self.ring_buffer = RingBuffer(N_ROWS, CAPACITY, buffer=storage)
+        self.control[:] = (MAGIC, N_ROWS, CAPACITY, 0, 0, len(metadata))
+
+    def write(self, n_samples):
+        start = self.ring_buffer.total_written
+        chunk = np.tile(np.arange(start, start + n_samples, dtype=np.float64), (N_ROWS, 1))
+        self.control[CONTROL_FIELDS.index("sequence")] += 1
+        self.ring_buffer.write(chunk)
+        self.control[CONTROL_FIELDS.index("total_written")] = self.ring_buffer.total_written
+        self.control[CONTROL_FIELDS.index("sequence")] += 1
+
+    def close(self):
+        self.ring_buffer = None
+        self.control = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+class WriteOnFirstCountRead:
+    """
+    Stands in for the subscriber's control block: the first read of total_written returns the current count, then
+    lets the publisher write before any later read.
+    """
+
+    def __init__(self, control, write):
+        self._control = control
+        self._write = write
+
+    def __getitem__(self, index):
+        value = self._control[index]
+        if index == CONTROL_FIELDS.index("total_written") and self._write is not None:
+            write, self._write = self._write, None
+            write()
+        return value
+
+
+@pytest.fixture
+def publisher():
+    publisher = ManualPublisher(f"test_shared_stream_{os.getpid()}")
+    yield publisher
+    publisher.close()
+
+
+def test_get_board_data_returns_every_sample_once_when_a_write_lands_mid_read(publisher):
+    subscriber = SharedBoardSubscriber(publisher.shm.name)
+    try:
+        publisher.write(10)
+        subscriber._control = WriteOnFirstCountRead(subscriber._control, lambda: publisher.write(5))
+
+        reads = [subscriber.get_board_data(), subscriber.get_board_data()]
+        publisher.write(7)
+        reads.append(subscriber.get_board_data())
+
+        samples = np.concatenate([data[0] for data in reads])
+        assert samples.tolist() == list(range(22))
+        assert all(np.array_equal(data, np.tile(data[0], (N_ROWS, 1))) for data in reads)
+    finally:
+        subscriber.close()
+
+
+def test_get_board_data_keeps_the_newest_capacity_samples_after_an_overrun(publisher):
+    subscriber = SharedBoardSubscriber(publisher.shm.name)
+    try:
+        publisher.write(CAPACITY + 20)
+        assert subscriber.get_board_data()[0].tolist() == list(range(20, CAPACITY + 20))
+        assert subscriber.get_board_data().shape == (N_ROWS, 0)
+        assert subscriber.get_current_board_data(5)[0].tolist() == list(range(CAPACITY + 15, CAPACITY + 20))
+    finally:
+        subscriber.close()
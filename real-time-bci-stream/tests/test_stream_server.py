@@ -0,0 +1,62 @@
+import socket
+
+import numpy as np
+import pytest
+from brainflow.board_shim import BoardIds
+
+from brainflow_stream import BrainFlowBoardSetup
+from stream_server import (FRAME_DATA, FRAME_HEADER, FRAME_MAGIC, FRAME_METADATA, BrainFlowStreamClient,
+                           BrainFlowStreamServer, _ClientConnection, _recv_exactly)
+
+
+@pytest.fixture
+def synthetic_board():
+    board = BrainFlowBoardSetup(board_id=BoardIds.SYNTHETIC_BOARD.value, master_board=BoardIds.CYTON_BOARD.value,
+                                name="Synthetic")
+    board.setup()
+    yield board
+    board.stop()
+
+
+def test_synthetic_round_trip(synthetic_board):
+    with BrainFlowStreamServer(synthetic_board, port=0, chunk_ms=20) as server:
+        client = BrainFlowStreamClient(port=server.address[1])
+        try:
+            assert client.wait_for_samples(100)
+            data = client.get_board_data()
+        finally:
+            client.close()
+
+    assert client.metadata["n_rows"] == data.shape[0]
+    assert client.dropped_samples == 0
+    board_data = synthetic_board.board.get_current_board_data(10 * synthetic_board.sampling_rate)
+    timestamps = board_data[synthetic_board.timestamp_channel]
+    # Every received sample is a board sample: exact timestamps, float32 precision for the signal rows
+    columns = np.searchsorted(timestamps, data[client.timestamp_channel])
+    assert np.array_equal(timestamps[columns], data[client.timestamp_channel])
+    eeg = client.eeg_channels
+    np.testing.assert_allclose(data[eeg], board_data[eeg][:, columns], rtol=1e-6, atol=1e-4)
+
+
+def test_metadata_frame_is_sent_before_queued_data():
+    server_side, client_side = socket.socketpair()
+    metadata_frame = FRAME_HEADER.pack(FRAME_MAGIC, FRAME_METADATA, 0, 0, 2, 0) + b"{}"
+    data_frame = FRAME_HEADER.pack(FRAME_MAGIC, FRAME_DATA, 0, 0, 0, 0)
+    connection = _ClientConnection(server_side, "test", max_queue_frames=2, on_close=lambda client: None,
+                                   metadata_frame=metadata_frame)
+    # The stream thread can queue (and overflow) data frames before the sender thread starts
+    for _ in range(5):
+        connection.enqueue(data_frame)
+    connection.start()
+    try:
+        client_side.settimeout(5.0)
+        _, kind, _, _, length, _ = FRAME_HEADER.unpack(_recv_exactly(client_side, FRAME_HEADER.size))
+        assert kind == FRAME_METADATA
+        assert _recv_exactly(client_side, length) == b"{}"
+        for _ in range(2):
+            _, kind, _, _, _, _ = FRAME_HEADER.unpack(_recv_exactly(client_side, FRAME_HEADER.size))
+            assert kind == FRAME_DATA
+        assert connection.dropped_frames == 3
+    finally:
+        connection.close()
+        client_side.close()
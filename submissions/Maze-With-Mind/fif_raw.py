@@ -11,6 +11,8 @@ from scipy.signal.windows import hann
 import threading
 from datetime import datetime
 
+from multitaper import multitaper_psd
+
 class FIFViewer:
     def __init__(self, root):
         self.root = root
@@ -30,6 +32,7 @@ class FIFViewer:
         self.filter_low = 0.5
         self.filter_high = 40
         self.filtered_data = None
+        self.mt_bandwidth = 0.5  # Hz, full bandwidth of the multitaper PSD
         
         # Create GUI
         self.setup_gui()
@@ -143,6 +146,18 @@ class FIFViewer:
             ttk.Radiobutton(view_frame, text=option, variable=self.view_type, 
                            value=option, command=self.update_plot).pack(anchor=tk.W)
         
+        # PSD estimator: Welch over the whole recording, or multitaper over the current time window with a
+        # bandwidth fine enough to separate close stimulation frequencies (e.g. 10.00 and 10.43 Hz)
+        ttk.Label(view_frame, text="PSD Method:").pack(anchor=tk.W)
+        self.psd_method = tk.StringVar(value="Welch")
+        for option in ["Welch", "Multitaper"]:
+            ttk.Radiobutton(view_frame, text=option, variable=self.psd_method,
+                           value=option, command=self.update_plot).pack(anchor=tk.W)
+        ttk.Label(view_frame, text="Multitaper bandwidth (Hz):").pack()
+        self.mt_bandwidth_var = tk.DoubleVar(value=self.mt_bandwidth)
+        ttk.Scale(view_frame, from_=0.1, to=4, variable=self.mt_bandwidth_var,
+                 orient=tk.HORIZONTAL).pack(fill=tk.X)
+
         # Plot controls
         ttk.Button(view_frame, text="Update Plot", command=self.update_plot).pack(fill=tk.X, pady=2)
         ttk.Button(view_frame, text="Save Plot", command=self.save_plot).pack(fill=tk.X, pady=2)
@@ -475,20 +490,30 @@ class FIFViewer:
         ax = self.fig.add_subplot(111)
         colors = plt.cm.tab10(np.linspace(0, 1, 10))
         
+        # Calculate the PSD of all selected channels at once
+        if self.psd_method.get() == "Multitaper":
+            start_sample = int(self.current_start_time * sfreq)
+            end_sample = min(int((self.current_start_time + self.window_duration) * sfreq),
+                             self.filtered_data.shape[1])
+            data_window = self.filtered_data[self.selected_channels, start_sample:end_sample]
+            # Tapers are cached per window length and bandwidth, so browsing with a fixed window reuses them
+            bandwidth = max(self.mt_bandwidth_var.get(), sfreq / data_window.shape[1])
+            freqs, psd = multitaper_psd(data_window, sfreq, bandwidth=bandwidth)
+            title = (f'Power Spectral Density (multitaper, {bandwidth:.2f} Hz bandwidth, '
+                     f'{self.current_start_time:.1f}-{self.current_start_time + self.window_duration:.1f}s)')
+        else:
+            data = self.filtered_data[self.selected_channels]
+            nperseg = min(2048, data.shape[1])
+            freqs, psd = welch(data, fs=sfreq, nperseg=nperseg, window='hann', noverlap=nperseg // 2, axis=-1)
+            title = 'Power Spectral Density (Welch)'
+        
         for i, ch_idx in enumerate(self.selected_channels):
-            # Calculate PSD
-            freqs, psd = welch(self.filtered_data[ch_idx], fs=sfreq, nperseg=2048, 
-                              window='hann', overlap=0.5)
-            
-            # Convert to dB
-            psd_db = 10 * np.log10(psd * 1e12)  # Convert to µV²/Hz and then dB
-            
-            ax.semilogy(freqs, psd, color=colors[i % 10], 
+            ax.semilogy(freqs, psd[i] * 1e12, color=colors[i % 10],  # Convert to µV²/Hz
                        label=self.raw.ch_names[ch_idx], linewidth=1.5)
         
         ax.set_xlabel('Frequency (Hz)')
         ax.set_ylabel('Power (µV²/Hz)')
-        ax.set_title('Power Spectral Density')
+        ax.set_title(title)
         ax.grid(True, alpha=0.3)
         ax.legend()
         ax.set_xlim(0, min(50, sfreq/2))
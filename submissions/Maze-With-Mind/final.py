@@ -3,18 +3,15 @@ import random
 import sys
 import math
 import scipy
-import numpy as np
 import time
 import threading
 from queue import Queue
 
-from sklearn.cross_decomposition import CCA
-from sklearn.preprocessing import StandardScaler
-from scipy.signal import butter, filtfilt
-
 import brainflow
 from brainflow.board_shim import BoardShim, BrainFlowInputParams, BrainFlowError, BoardIds
 from brainflow_stream import BrainFlowBoardSetup
+from ssvep_decoders import StreamingCCA  # Closed-form CCA updated per chunk, same scores as sklearn's CCA
+from streaming_filters import StreamingFilter
 
 # Initialize Pygame
 pygame.init()
@@ -57,50 +54,6 @@ pygame.display.set_caption('BCI Maze Game')
 clock = pygame.time.Clock()
 
 
-def bandpass_filter(data, lowcut, highcut, fs, order=4):
-    """Apply a Butterworth bandpass filter to multichannel data."""
-    nyq = 0.5 * fs
-    low = lowcut / nyq
-    high = highcut / nyq
-    b, a = butter(order, [low, high], btype='band')
-    return filtfilt(b, a, data, axis=1)
-
-
-def remove_dc_offset(data):
-    """Remove DC offset from EEG data."""
-    return data[1:9, :] - np.mean(data[1:9, :], axis=1, keepdims=True)
-
-
-def basic_cca(eeg_data, sfreq, freqs):
-    """Perform CCA analysis to detect SSVEP responses."""
-    n_channels, n_samples = eeg_data.shape 
-    if n_samples < 10: 
-        raise ValueError("Not enough samples for CCA.") 
-    t = np.arange(n_samples) / sfreq 
- 
-    # X: samples × channels 
-    X = eeg_data.T 
-    Xs = StandardScaler().fit_transform(X) 
- 
-    scores = {} 
-    for f in freqs: 
-        # Reference signals: sine/cosine at f and 2f 
-        ref = np.column_stack([ 
-            np.sin(2*np.pi*f*t), 
-            np.cos(2*np.pi*f*t), 
-            np.sin(2*np.pi*2*f*t), 
-            np.cos(2*np.pi*2*f*t) 
-        ]) 
-        Rs = StandardScaler().fit_transform(ref) 
- 
-        cca = CCA(n_components=1) 
-        U, V = cca.fit_transform(Xs, Rs) 
-        corr = np.corrcoef(U[:, 0], V[:, 0])[0, 1] 
-        scores[f] = float(np.abs(corr))
- 
-    return scores
-
-
 class BCIController:
     def __init__(self):
         self.board_id = BoardIds.CYTON_BOARD.value
@@ -141,24 +94,26 @@ class BCIController:
             
     def _monitor_brain_signals(self):
         """Monitor brain signals and detect movement intentions."""
+        # Causal 5-30 Hz bandpass that keeps its state between reads, so each sample is filtered exactly once
+        # (the bandpass also removes the DC offset)
+        eeg_filter = StreamingFilter.for_eeg(self.board_srate, n_channels=8, bandpass=(5.0, 30.0), order=4)
+        # CCA of the last CCA_WINDOW_SIZE samples, updated from running covariances with every read instead of
+        # being recomputed on the whole window (same scores as basic_cca)
+        stream_cca = StreamingCCA(self.board_srate, self.freqs, n_channels=3, window_samples=CCA_WINDOW_SIZE)
         while self.running:
             try:
-                # Get recent EEG data
-                raw_data = self.cyton_board.get_current_board_data(num_samples=CCA_WINDOW_SIZE)
-                if raw_data.shape[1] < CCA_WINDOW_SIZE:
+                # Get the EEG samples that arrived since the last update (they are removed from the board buffer)
+                raw_data = self.cyton_board.get_board_data()
+                if raw_data.shape[1] > 0:
+                    filtered_data = eeg_filter.process(raw_data[1:9, :])
+                    # Use selected channels for CCA (you can adjust these)
+                    stream_cca.update(filtered_data[[0, 4, 7], :])  # Channels 1, 5, 8
+                if not stream_cca.ready:
                     time.sleep(0.1)
                     continue
-                    
-                # Process the data
-                eeg_data = remove_dc_offset(raw_data)
-                filtered_data = bandpass_filter(eeg_data, lowcut=5.0, highcut=30.0, 
-                                              fs=self.board_srate, order=4)
-                
-                # Use selected channels for CCA (you can adjust these)
-                selected_data = filtered_data[[0, 4, 7], :]  # Channels 1, 5, 8
                 
                 # Perform CCA analysis
-                scores = basic_cca(selected_data, self.board_srate, self.freqs)
+                scores = stream_cca.scores()
                 
                 # Find the best frequency
                 best_freq = max(scores, key=scores.get)
@@ -9,9 +9,8 @@ from queue import Queue
 import mne
 from collections import deque
 
-from sklearn.cross_decomposition import CCA
-from sklearn.preprocessing import StandardScaler
-from scipy.signal import butter, filtfilt
+from ssvep_decoders import StreamingCCA  # Closed-form CCA updated per chunk, same scores as sklearn's CCA
+from streaming_filters import StreamingFilter
 
 # Initialize Pygame
 pygame.init()
@@ -55,45 +54,6 @@ pygame.display.set_caption('BCI Maze Game (FIF File Mode)')
 clock = pygame.time.Clock()
 
 
-def bandpass_filter(data, lowcut, highcut, fs, order=4):
-    """Apply a Butterworth bandpass filter to multichannel data."""
-    nyq = 0.5 * fs
-    low = lowcut / nyq
-    high = highcut / nyq
-    b, a = butter(order, [low, high], btype='band')
-    return filtfilt(b, a, data, axis=1)
-
-
-def basic_cca(eeg_data, sfreq, freqs):
-    """Perform CCA analysis to detect SSVEP responses."""
-    n_channels, n_samples = eeg_data.shape 
-    if n_samples < 10: 
-        raise ValueError("Not enough samples for CCA.") 
-    t = np.arange(n_samples) / sfreq 
- 
-    # X: samples × channels 
-    X = eeg_data.T 
-    Xs = StandardScaler().fit_transform(X) 
- 
-    scores = {} 
-    for f in freqs: 
-        # Reference signals: sine/cosine at f and 2f 
-        ref = np.column_stack([ 
-            np.sin(2*np.pi*f*t), 
-            np.cos(2*np.pi*f*t), 
-            np.sin(2*np.pi*2*f*t), 
-            np.cos(2*np.pi*2*f*t) 
-        ]) 
-        Rs = StandardScaler().fit_transform(ref) 
- 
-        cca = CCA(n_components=1) 
-        U, V = cca.fit_transform(Xs, Rs) 
-        corr = np.corrcoef(U[:, 0], V[:, 0])[0, 1] 
-        scores[f] = float(np.abs(corr))
- 
-    return scores
-
-
 class FIFDataController:
     def __init__(self, fif_file_path):
         self.fif_file_path = fif_file_path
@@ -232,6 +192,24 @@ class FIFDataController:
     def _process_data_stream(self):
         """Process the .fif data in chunks to simulate real-time processing."""
         samples_per_update = int(self.sfreq * UPDATE_INTERVAL)
+        # Causal 3-40 Hz bandpass that keeps its state between updates, so each sample is filtered exactly once
+        # (the bandpass also removes the DC offset)
+        eeg_filter = StreamingFilter.for_eeg(self.sfreq, n_channels=self.data_array.shape[0], bandpass=(3.0, 40.0),
+                                             order=4)
+        filtered_until = self.current_position  # First sample not yet filtered
+        
+        # Use posterior channels for SSVEP detection (simulating occipital electrodes)
+        n_channels = self.data_array.shape[0]
+        if n_channels >= 3:
+            # Use last 3 channels (simulating posterior electrodes)
+            selected_channels = slice(n_channels - 3, n_channels)
+        else:
+            # Use all available channels
+            selected_channels = slice(0, n_channels)
+        # CCA of the last CCA_WINDOW_SIZE samples, updated from running covariances with only the new samples
+        # instead of being recomputed on the whole window (same scores as basic_cca)
+        stream_cca = StreamingCCA(self.sfreq, self.freqs, n_channels=min(n_channels, 3),
+                                  window_samples=CCA_WINDOW_SIZE)
         
         while self.running:
             try:
@@ -239,33 +217,17 @@ class FIFDataController:
                 if self.current_position + CCA_WINDOW_SIZE >= self.data_array.shape[1]:
                     print("Reached end of data, looping back to beginning...")
                     self.current_position = 0
+                    eeg_filter.reset()
+                    stream_cca.reset()
+                    filtered_until = 0
                 
-                # Extract data window
-                start_idx = self.current_position
+                # Filter the samples that entered the window since the last update
                 end_idx = self.current_position + CCA_WINDOW_SIZE
-                data_window = self.data_array[:, start_idx:end_idx]
-                
-                # Remove DC offset
-                data_window = data_window - np.mean(data_window, axis=1, keepdims=True)
-                
-                # Apply bandpass filter
-                filtered_data = bandpass_filter(data_window, lowcut=3.0, highcut=40.0, 
-                                              fs=self.sfreq, order=4)
-                
-                # Use posterior channels for SSVEP detection (simulating occipital electrodes)
-                n_channels = filtered_data.shape[0]
-                if n_channels >= 8:
-                    # Use last 3 channels (simulating posterior electrodes)
-                    selected_data = filtered_data[-3:, :]
-                elif n_channels >= 3:
-                    # Use last 3 available channels
-                    selected_data = filtered_data[-3:, :]
-                else:
-                    # Use all available channels
-                    selected_data = filtered_data
+                filtered_data = eeg_filter.process(self.data_array[:, filtered_until:end_idx])
+                filtered_until = end_idx
                 
                 # Perform CCA analysis
-                scores = basic_cca(selected_data, self.sfreq, self.freqs)
+                scores = stream_cca.update(filtered_data[selected_channels, :])
                 
                 # Update latest scores for UI
                 self.latest_scores = scores.copy()
@@ -4,15 +4,14 @@ import matplotlib.pyplot as plt
 import time
 import mne
 
-from sklearn.cross_decomposition import CCA
-from sklearn.preprocessing import StandardScaler
-
-from scipy.signal import butter, filtfilt
+from scipy.signal import filtfilt
 
 import brainflow
 from brainflow.board_shim import BoardShim, BrainFlowInputParams, BrainFlowError, BoardIds
 
 from brainflow_stream import BrainFlowBoardSetup
+from ssvep_decoders import basic_cca  # Closed-form CCA, same scores as sklearn's CCA
+from streaming_filters import design_filter
 
 
 def bandpass_filter(data, lowcut, highcut, fs, order=4):
@@ -29,10 +28,8 @@ def bandpass_filter(data, lowcut, highcut, fs, order=4):
     Returns:
         np.ndarray: Filtered data, same shape as input
     """
-    nyq = 0.5 * fs
-    low = lowcut / nyq
-    high = highcut / nyq
-    b, a = butter(order, [low, high], btype='band')
+    # Coefficients come from the shared design cache (streaming_filters.design_filter)
+    b, a = design_filter('bandpass', order, (float(lowcut), float(highcut)), float(fs), output='ba')
     return filtfilt(b, a, data, axis=1)
 
 
@@ -97,33 +94,6 @@ axes[-1].set_xlabel('Samples')
 freqs = [5, 10, 15, 20] # Move Top, Right, Bottom, Left
 sfreq = board_srate
 # CCA Sampling
-def basic_cca(eeg_data, sfreq, freqs):
-    n_channels, n_samples = eeg_data.shape 
-    if n_samples < 10: 
-        raise ValueError("Not enough samples for CCA.") 
-    t = np.arange(n_samples) / sfreq 
- 
-    # X: samples × channels 
-    X = eeg_data.T 
-    Xs = StandardScaler().fit_transform(X) 
- 
-    scores = {} 
-    for f in freqs: 
-        # Reference signals: sine/cosine at f and 2f 
-        ref = np.column_stack([ 
-            np.sin(2*np.pi*f*t), 
-            np.cos(2*np.pi*f*t), 
-            np.sin(2*np.pi*2*f*t), 
-            np.cos(2*np.pi*2*f*t) 
-        ]) 
-        Rs = StandardScaler().fit_transform(ref) 
- 
-        cca = CCA(n_components=1) 
-        U, V = cca.fit_transform(Xs, Rs) 
-        corr = np.corrcoef(U[:, 0], V[:, 0])[0, 1] 
-        scores[f] = float(np.abs(corr))  # abs is common in SSVEP CCA 
- 
-    return scores 
 
 scores = basic_cca(data_to_use[[0, 4, 7], :], sfreq, freqs)
 
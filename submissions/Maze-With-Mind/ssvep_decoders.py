@@ -0,0 +1,710 @@
+import functools
+import re
+
+import numpy as np
+from scipy.linalg import eigh
+
+
+def _orthonormal_basis(a, tol=1e-10):
+    """
+    Returns an orthonormal basis of the column space of (stacks of) centered matrices, from their thin QR decomposition.
+
+    Columns whose R diagonal is negligible (constant or linearly dependent signals, e.g. a flat channel) are zeroed
+    so they cannot produce spurious correlations. Zeroing rather than dropping keeps the shapes of stacked inputs
+    equal; the zero columns only add zero singular values.
+
+    Args:
+        a (numpy.ndarray): Array of shape (..., n_samples, n_columns).
+        tol (float): Relative threshold on the R diagonal. Default is 1e-10.
+
+    Returns:
+        numpy.ndarray: Q of shape (..., n_samples, n_columns).
+    """
+    q, r = np.linalg.qr(a)
+    diagonal = np.abs(np.diagonal(r, axis1=-2, axis2=-1))
+    keep = diagonal > tol * diagonal.max(axis=-1, keepdims=True)
+    return q if keep.all() else q * keep[..., None, :]
+
+
+def canonical_correlations(x, y):
+    """
+    Computes all canonical correlations between two sets of signals in closed form.
+
+    Both sets are centered and orthonormalized by a thin QR decomposition; the canonical correlations are the
+    singular values of Qx^T Qy. The first one equals the correlation of the first pair of canonical variates found
+    by sklearn's iterative CCA (NIPALS), without its iterations and scaling.
+
+    Args:
+        x (numpy.ndarray): Array of shape (n_samples, p), e.g. EEG with samples in rows.
+        y (numpy.ndarray): Array of shape (n_samples, q), e.g. reference signals.
+
+    Returns:
+        numpy.ndarray: The min(p, q) canonical correlations, in decreasing order, within [0, 1] (zero beyond the
+            rank of x or y).
+    """
+    qx = _orthonormal_basis(x - x.mean(axis=0))
+    qy = _orthonormal_basis(y - y.mean(axis=0))
+    correlations = np.linalg.svd(qx.T @ qy, compute_uv=False)
+    return np.clip(correlations, 0.0, 1.0)
+
+
+class ReferenceBank:
+    """
+    Sine/cosine reference signals of a set of SSVEP frequencies, built and QR-factorized once per configuration.
+
+    The references of every frequency (sin and cos of each harmonic) are centered and orthonormalized when the bank
+    is created, so scoring a window only needs the QR decomposition of the EEG and one batched SVD of
+    Qx^T Qy over all frequencies. Banks are shared between decoders through get_reference_bank().
+
+    Attributes:
+        sfreq (float): Sampling frequency in Hz.
+        n_samples (int): Window length in samples.
+        freqs (tuple): Stimulation frequencies in Hz.
+        n_harmonics (int): Number of harmonics per frequency, including the fundamental.
+        references (numpy.ndarray): Read-only references of shape (n_freqs, n_samples, 2 * n_harmonics), columns
+            sin(2 pi h f t), cos(2 pi h f t) for h = 1..n_harmonics.
+        q (numpy.ndarray): Read-only orthonormal bases of the centered references, same shape as references.
+    """
+
+    def __init__(self, sfreq, n_samples, freqs, n_harmonics=2):
+        """
+        Builds and factorizes the references.
+
+        Args:
+            sfreq (float): Sampling frequency in Hz.
+            n_samples (int): Window length in samples.
+            freqs (list): Stimulation frequencies in Hz.
+            n_harmonics (int): Number of harmonics per frequency, including the fundamental. Default is 2.
+
+        Raises:
+            ValueError: If a harmonic reaches the Nyquist frequency.
+        """
+        self.sfreq = float(sfreq)
+        self.n_samples = int(n_samples)
+        self.freqs = tuple(float(f) for f in freqs)
+        self.n_harmonics = int(n_harmonics)
+        if max(self.freqs) * self.n_harmonics >= self.sfreq / 2:
+            raise ValueError(f"Harmonic {self.n_harmonics} of {max(self.freqs)} Hz reaches the Nyquist frequency "
+                             f"({self.sfreq / 2} Hz).")
+        t = np.arange(self.n_samples) / self.sfreq
+        # (n_freqs, n_harmonics, n_samples) phases -> columns sin h1, cos h1, sin h2, cos h2, ...
+        phases = 2 * np.pi * np.outer(self.freqs, np.arange(1, self.n_harmonics + 1))[:, :, None] * t
+        references = np.stack([np.sin(phases), np.cos(phases)], axis=2)
+        self.references = references.reshape(len(self.freqs), 2 * self.n_harmonics, self.n_samples) \
+            .transpose(0, 2, 1).copy()
+        self.q = _orthonormal_basis(self.references - self.references.mean(axis=1, keepdims=True))
+        self.references.flags.writeable = False
+        self.q.flags.writeable = False
+
+    @staticmethod
+    def factorize(eeg):
+        """
+        Centers and orthonormalizes EEG windows, once per window for all frequencies.
+
+        Args:
+            eeg (numpy.ndarray): Array of shape (..., n_channels, n_samples).
+
+        Returns:
+            numpy.ndarray: Qx of shape (..., n_samples, n_channels).
+        """
+        x = np.swapaxes(np.asarray(eeg, dtype=np.float64), -1, -2)
+        return _orthonormal_basis(x - x.mean(axis=-2, keepdims=True))
+
+    def correlations(self, eeg=None, qx=None):
+        """
+        Computes the canonical correlations of EEG windows with the references of every frequency.
+
+        Args:
+            eeg (numpy.ndarray, optional): Array of shape (..., n_channels, n_samples), e.g. one window or a stack
+                of sub-band windows.
+            qx (numpy.ndarray, optional): Output of factorize(), instead of eeg.
+
+        Returns:
+            numpy.ndarray: Correlations of shape (..., n_freqs, min(n_channels, 2 * n_harmonics)), in decreasing
+                order along the last axis.
+        """
+        if qx is None:
+            qx = self.factorize(eeg)
+        # (..., 1, n_channels, n_samples) @ (n_freqs, n_samples, 2H) -> (..., n_freqs, n_channels, 2H)
+        products = np.swapaxes(qx, -1, -2)[..., None, :, :] @ self.q
+        return np.clip(np.linalg.svd(products, compute_uv=False), 0.0, 1.0)
+
+    def scores(self, eeg):
+        """
+        Scores every frequency by its first canonical correlation with one window.
+
+        Args:
+            eeg (numpy.ndarray): Array of shape (n_channels, n_samples).
+
+        Returns:
+            dict: Frequency to first canonical correlation.
+        """
+        return dict(zip(self.freqs, self.correlations(eeg)[:, 0].tolist()))
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_reference_bank(sfreq, n_samples, freqs, n_harmonics):
+    return ReferenceBank(sfreq, n_samples, freqs, n_harmonics)
+
+
+def get_reference_bank(sfreq, n_samples, freqs, n_harmonics=2):
+    """
+    Returns the shared ReferenceBank of a configuration, building it on first use.
+
+    Args:
+        sfreq (float): Sampling frequency in Hz.
+        n_samples (int): Window length in samples.
+        freqs (list): Stimulation frequencies in Hz.
+        n_harmonics (int): Number of harmonics per frequency, including the fundamental. Default is 2.
+
+    Returns:
+        ReferenceBank: The bank, shared by every caller with the same configuration.
+    """
+    return _cached_reference_bank(float(sfreq), int(n_samples), tuple(float(f) for f in freqs), int(n_harmonics))
+
+
+def basic_cca(eeg_data, sfreq, freqs, n_harmonics=2):
+    """
+    Scores SSVEP frequencies by CCA between the EEG and sine/cosine references at f and its harmonics.
+
+    Drop-in replacement of basic_cca in the Maze-With-Mind games and the realtime notebook (sklearn CCA per
+    frequency), giving the same first canonical correlations in closed form. The references come from the shared
+    ReferenceBank of the configuration, and all frequencies are scored in one batched SVD.
+
+    Args:
+        eeg_data (numpy.ndarray): Array of shape (n_channels, n_samples).
+        sfreq (float): Sampling frequency in Hz.
+        freqs (list): Frequencies of interest in Hz.
+        n_harmonics (int): Number of harmonics in the references, including the fundamental. Default is 2 (f and
+            2f, as in the games).
+
+    Returns:
+        dict: Frequency to first canonical correlation, keyed by the given frequencies.
+
+    Raises:
+        ValueError: If there are fewer than 10 samples.
+    """
+    n_samples = eeg_data.shape[1]
+    if n_samples < 10:
+        raise ValueError("Not enough samples for CCA.")
+    bank = get_reference_bank(sfreq, n_samples, freqs, n_harmonics)
+    return dict(zip(freqs, bank.correlations(eeg_data)[:, 0].tolist()))
+
+
+class FBCCA:
+    """
+    Filter-bank CCA (Chen et al., 2015): CCA scores of several sub-bands of the EEG, combined with decreasing weights.
+
+    Sub-band k (k = 1..K) passes from just below the k-th harmonic of the lowest stimulation frequency up to a
+    common upper edge, so the higher sub-bands isolate the harmonics, which a single broad band leaves to the
+    noise. All sub-bands are filtered in one FilterBank call and all (sub-band, frequency) canonical correlations
+    come out of one batched ReferenceBank call. The score of a frequency is sum_k w_k * rho_k ** 2 with
+    w_k = k ** -a + b.
+
+    Attributes:
+        sfreq (float): Sampling frequency in Hz.
+        n_samples (int): Window length in samples.
+        freqs (tuple): Stimulation frequencies in Hz.
+        bands (list): (low, high) edges of the sub-bands in Hz.
+        weights (numpy.ndarray): Weight of each sub-band.
+        filter_bank (FilterBank): Sub-band filters.
+        reference_bank (ReferenceBank): Shared references.
+        zero_phase (bool): Whether windows are filtered forwards and backwards.
+    """
+
+    def __init__(self, sfreq, n_samples, freqs, n_bands=5, n_harmonics=2, bands=None, a=1.25, b=0.25, order=4,
+                 zero_phase=True):
+        """
+        Initializes the decoder: sub-band filters, weights and references are built once.
+
+        Args:
+            sfreq (float): Sampling frequency in Hz.
+            n_samples (int): Window length in samples.
+            freqs (list): Stimulation frequencies in Hz.
+            n_bands (int): Number of sub-bands K. Default is 5.
+            n_harmonics (int): Number of harmonics in the references, including the fundamental. Default is 2.
+            bands (list, optional): (low, high) edges of the sub-bands in Hz. Defaults to
+                (k * min(freqs) - 2, min(90, 0.45 * sfreq)) for k = 1..n_bands.
+            a (float): Weight decay exponent. Default is 1.25.
+            b (float): Weight offset. Default is 0.25.
+            order (int): Butterworth order of the sub-band filters. Default is 4.
+            zero_phase (bool): Filter forwards and backwards, as for offline epochs. Default is True.
+
+        Raises:
+            ValueError: If a sub-band is empty.
+        """
+        from streaming_filters import FilterBank
+
+        self.sfreq = float(sfreq)
+        self.n_samples = int(n_samples)
+        self.freqs = tuple(float(f) for f in freqs)
+        if bands is None:
+            high = min(90.0, 0.45 * self.sfreq)
+            bands = [(max(k * min(self.freqs) - 2.0, 1.0), high) for k in range(1, n_bands + 1)]
+        for low, high in bands:
+            if not 0 < low < high < self.sfreq / 2:
+                raise ValueError(f"Invalid sub-band ({low}, {high}) Hz at a sampling rate of {self.sfreq} Hz.")
+        self.bands = list(bands)
+        self.weights = np.arange(1, len(self.bands) + 1) ** -float(a) + b
+        self.filter_bank = FilterBank(self.bands, self.sfreq, order)
+        self.reference_bank = get_reference_bank(self.sfreq, self.n_samples, self.freqs, n_harmonics)
+        self.zero_phase = zero_phase
+
+    def sub_band_correlations(self, eeg):
+        """
+        Computes the first canonical correlation of every sub-band with every frequency.
+
+        Args:
+            eeg (numpy.ndarray): Array of shape (n_channels, n_samples), covering the sub-bands (DC removed or
+                high-passed, but not low-passed below the upper sub-band edge).
+
+        Returns:
+            numpy.ndarray: Correlations of shape (n_bands, n_freqs).
+        """
+        sub_bands = self.filter_bank.apply(eeg, zero_phase=self.zero_phase)
+        return self.reference_bank.correlations(sub_bands)[..., 0]
+
+    def scores(self, eeg):
+        """
+        Scores every frequency with the weighted sum of squared sub-band correlations.
+
+        Args:
+            eeg (numpy.ndarray): Array of shape (n_channels, n_samples).
+
+        Returns:
+            dict: Frequency to FBCCA score. The detected frequency is max(scores, key=scores.get).
+        """
+        return dict(zip(self.freqs, (self.weights @ self.sub_band_correlations(eeg) ** 2).tolist()))
+
+
+@functools.lru_cache(maxsize=16)
+def _cached_fbcca(sfreq, n_samples, freqs, n_bands, n_harmonics):
+    return FBCCA(sfreq, n_samples, freqs, n_bands=n_bands, n_harmonics=n_harmonics)
+
+
+def fbcca(eeg_data, sfreq, freqs, n_bands=5, n_harmonics=2):
+    """
+    Scores SSVEP frequencies with filter-bank CCA, with the same interface as basic_cca.
+
+    The decoder of each configuration is built once and reused.
+
+    Args:
+        eeg_data (numpy.ndarray): Array of shape (n_channels, n_samples). Unlike for basic_cca, the data should not
+            be low-passed below the upper sub-band edge (min(90, 0.45 * sfreq) Hz), only DC removed or high-passed.
+        sfreq (float): Sampling frequency in Hz.
+        freqs (list): Frequencies of interest in Hz.
+        n_bands (int): Number of sub-bands. Default is 5.
+        n_harmonics (int): Number of harmonics in the references, including the fundamental. Default is 2.
+
+    Returns:
+        dict: Frequency to FBCCA score, keyed by the given frequencies.
+
+    Raises:
+        ValueError: If there are fewer than 10 samples.
+    """
+    n_samples = eeg_data.shape[1]
+    if n_samples < 10:
+        raise ValueError("Not enough samples for CCA.")
+    decoder = _cached_fbcca(float(sfreq), n_samples, tuple(float(f) for f in freqs), n_bands, n_harmonics)
+    return dict(zip(freqs, decoder.scores(eeg_data).values()))
+
+
+
+def _labels_from_mne_epochs(epochs):
+    """
+    Reads the attended frequency of each epoch from Flicker event names such as 'Flicker/block_0/freq_10.43/...'.
+    """
+    names = {code: name for name, code in epochs.event_id.items()}
+    labels = []
+    for code in epochs.events[:, 2]:
+        match = re.search(r"freq_([0-9.]+)", names[code])
+        if match is None:
+            raise ValueError(f"No 'freq_' tag in the event name '{names[code]}', pass the labels explicitly.")
+        labels.append(float(match.group(1)))
+    return labels
+
+
+class TRCA:
+    """
+    Task-related component analysis (Nakanishi et al., 2018): an SSVEP decoder calibrated on a subject's own epochs.
+
+    For every stimulation frequency, fit() learns spatial filters that maximize the reproducibility of the
+    responses across training epochs, and an average template of those epochs. A window is scored by correlating
+    its spatially filtered data with each filtered template. The filters and the filtered templates are computed
+    once in fit(), so scoring is one matrix product with the filters and one correlation per frequency.
+
+    The templates are phase-locked to the epoch onsets, so the windows passed to scores() must start at the
+    stimulus onset (or a whole number of stimulus cycles after it), as the training epochs did. Windows shorter
+    than the epochs are compared with the beginning of the templates.
+
+    Attributes:
+        sfreq (float): Sampling frequency in Hz.
+        freqs (tuple): Stimulation frequencies in Hz, in the order of the scores.
+        ensemble (bool): Whether the filters of all frequencies are applied together (ensemble TRCA).
+        n_components (int): Number of spatial filters kept per frequency.
+        n_samples (int): Epoch length in samples, set by fit().
+        filters (numpy.ndarray): Spatial filters of shape (n_freqs, n_channels, n_components), set by fit().
+        templates (numpy.ndarray): Average training epoch of every frequency, shape (n_freqs, n_channels,
+            n_samples), set by fit().
+    """
+
+    def __init__(self, sfreq, freqs, ensemble=True, n_components=1):
+        """
+        Initializes an untrained decoder.
+
+        Args:
+            sfreq (float): Sampling frequency in Hz.
+            freqs (list): Stimulation frequencies in Hz.
+            ensemble (bool): Apply the filters of all frequencies to every window, which is more robust with few
+                training epochs. Default is True.
+            n_components (int): Number of spatial filters kept per frequency. Default is 1.
+        """
+        self.sfreq = float(sfreq)
+        self.freqs = tuple(float(f) for f in freqs)
+        self.ensemble = ensemble
+        self.n_components = n_components
+        self.n_samples = None
+        self.filters = None
+        self.templates = None
+        self._projection = None
+        self._filtered_templates = None
+
+    def fit(self, epochs, labels=None):
+        """
+        Learns the spatial filters and templates of every frequency.
+
+        Args:
+            epochs (numpy.ndarray or mne.Epochs): Stimulus-locked epochs of shape (n_epochs, n_channels,
+                n_samples), bandpass filtered. With mne.Epochs the data are read with get_data() and, when labels is
+                None, the frequencies are read from the 'freq_' tag of the event names.
+            labels (list, optional): Stimulation frequency of every epoch, matched to the nearest of freqs.
+
+        Returns:
+            TRCA: The fitted decoder.
+
+        Raises:
+            ValueError: If the labels are missing or a frequency has fewer than two epochs.
+        """
+        if hasattr(epochs, "get_data"):
+            if labels is None:
+                labels = _labels_from_mne_epochs(epochs)
+            epochs = epochs.get_data()
+        if labels is None:
+            raise ValueError("Labels are required for array epochs.")
+        data = np.asarray(epochs, dtype=np.float64)
+        data = data - data.mean(axis=-1, keepdims=True)
+        freqs = np.asarray(self.freqs)
+        classes = np.abs(np.asarray(labels, dtype=np.float64)[:, None] - freqs).argmin(axis=1)
+
+        n_channels = data.shape[1]
+        self.n_samples = data.shape[2]
+        self.filters = np.empty((len(freqs), n_channels, self.n_components))
+        self.templates = np.empty((len(freqs), n_channels, self.n_samples))
+        for i in range(len(freqs)):
+            trials = data[classes == i]
+            if len(trials) < 2:
+                raise ValueError(f"TRCA needs at least two epochs of {freqs[i]} Hz, got {len(trials)}.")
+            # S sums the covariances between different epochs, Q the covariance of all epochs
+            total = trials.sum(axis=0)
+            q = np.einsum("ecn,edn->cd", trials, trials)
+            s = total @ total.T - q
+            # Average-referenced data are rank deficient, so Q is regularized slightly to stay positive definite
+            q += 1e-9 * np.trace(q) / n_channels * np.eye(n_channels)
+            _, vectors = eigh(s, q)
+            self.filters[i] = vectors[:, ::-1][:, :self.n_components]
+            self.templates[i] = trials.mean(axis=0)
+
+        # Spatial projection applied to every window: (n_filters, n_channels) for the ensemble, otherwise
+        # (n_freqs, n_components, n_channels), one set of filters per frequency
+        if self.ensemble:
+            self._projection = self.filters.transpose(0, 2, 1).reshape(-1, n_channels)
+            self._filtered_templates = np.einsum("fc,kcn->kfn", self._projection, self.templates)
+        else:
+            self._projection = self.filters.transpose(0, 2, 1)
+            self._filtered_templates = np.einsum("kfc,kcn->kfn", self._projection, self.templates)
+        return self
+
+    def correlations(self, eeg):
+        """
+        Correlates the spatially filtered window with the filtered template of every frequency.
+
+        Args:
+            eeg (numpy.ndarray): Stimulus-locked window of shape (n_channels, n_samples), filtered like the
+                training epochs and at most as long as them.
+
+        Returns:
+            numpy.ndarray: Correlation with each frequency, shape (n_freqs,).
+
+        Raises:
+            RuntimeError: If the decoder has not been fitted.
+            ValueError: If the window is longer than the training epochs.
+        """
+        if self._projection is None:
+            raise RuntimeError("The decoder must be fitted before scoring.")
+        eeg = np.asarray(eeg, dtype=np.float64)
+        n_samples = eeg.shape[-1]
+        if n_samples > self.n_samples:
+            raise ValueError(f"The window has {n_samples} samples, more than the {self.n_samples} of the epochs.")
+        filtered = self._projection @ eeg
+        if self.ensemble:
+            filtered = filtered[None]
+        filtered = filtered - filtered.mean(axis=-1, keepdims=True)
+        templates = self._filtered_templates[..., :n_samples]
+        templates = templates - templates.mean(axis=-1, keepdims=True)
+        num = np.einsum("kfn,kfn->k", np.broadcast_to(filtered, templates.shape), templates)
+        den = np.sqrt(np.einsum("kfn,kfn->k", filtered, filtered) * np.einsum("kfn,kfn->k", templates, templates))
+        return num / (den + 1e-30)
+
+    def scores(self, eeg):
+        """
+        Scores every frequency, with the same output as basic_cca.
+
+        Args:
+            eeg (numpy.ndarray): Stimulus-locked window of shape (n_channels, n_samples).
+
+        Returns:
+            dict: Frequency to correlation. The detected frequency is max(scores, key=scores.get).
+        """
+        return dict(zip(self.freqs, self.correlations(eeg).tolist()))
+
+    def predict(self, eeg):
+        """
+        Detects the attended frequency of a window.
+
+        Args:
+            eeg (numpy.ndarray): Stimulus-locked window of shape (n_channels, n_samples).
+
+        Returns:
+            float: Frequency with the highest correlation.
+        """
+        return self.freqs[int(np.argmax(self.correlations(eeg)))]
+
+
+
+class StreamingCCA:
+    """
+    CCA scores of a stream, updated chunk by chunk from running covariances instead of re-running CCA on a window.
+
+    The sums of the data, of the sine/cosine references of every frequency and of their products are kept up to
+    date with every new chunk. The references are phase-continuous over the stream (indexed by the absolute sample
+    number), which spans the same space as references restarted at every window. A decision only whitens the
+    covariances (Cholesky factors of n_channels x n_channels and 2 * n_harmonics square matrices) and takes the
+    largest singular value of the whitened cross-covariance of every frequency, the square root of the largest
+    generalized eigenvalue of Cxy Cyy^-1 Cyx w = rho^2 Cxx w. The cost per chunk grows with the chunk length, not
+    the window length, so decisions can be taken at every chunk.
+
+    Two windows are supported:
+        sliding      The samples leaving the window are subtracted again, so the scores equal basic_cca on the
+                     latest window_samples samples. The sums are recomputed from the buffered window once per
+                     window length, so rounding errors cannot accumulate.
+        exponential  Older samples are down-weighted with a half-life, without keeping a buffer.
+
+    Attributes:
+        sfreq (float): Sampling frequency in Hz.
+        freqs (tuple): Stimulation frequencies in Hz.
+        n_channels (int): Number of channels of the stream.
+        n_harmonics (int): Number of harmonics in the references, including the fundamental.
+        window_samples (int): Length of the sliding window, or None for the exponential window.
+        half_life (float): Half-life of the exponential window in seconds, or None for the sliding window.
+    """
+
+    def __init__(self, sfreq, freqs, n_channels, window_samples=None, half_life=None, n_harmonics=2):
+        """
+        Initializes an empty stream.
+
+        Args:
+            sfreq (float): Sampling frequency in Hz.
+            freqs (list): Stimulation frequencies in Hz.
+            n_channels (int): Number of channels of the stream.
+            window_samples (int, optional): Length of the sliding window in samples.
+            half_life (float, optional): Half-life of the exponential window in seconds.
+            n_harmonics (int): Number of harmonics in the references, including the fundamental. Default is 2.
+
+        Raises:
+            ValueError: Unless exactly one of window_samples and half_life is given.
+        """
+        if (window_samples is None) == (half_life is None):
+            raise ValueError("Give exactly one of window_samples (sliding) and half_life (exponential).")
+        self.sfreq = float(sfreq)
+        self.freqs = tuple(float(f) for f in freqs)
+        self.n_channels = n_channels
+        self.n_harmonics = n_harmonics
+        self.window_samples = None if window_samples is None else int(window_samples)
+        self.half_life = half_life
+        # Per-sample forgetting factor of the exponential window
+        self._decay = None if half_life is None else 0.5 ** (1.0 / (half_life * self.sfreq))
+        self._omegas = 2 * np.pi * np.outer(self.freqs, np.arange(1, n_harmonics + 1)) / self.sfreq
+        self.reset()
+
+    def reset(self):
+        """
+        Clears the running sums, e.g. after a gap in the stream.
+        """
+        n_freqs, n_refs = len(self.freqs), 2 * self.n_harmonics
+        self._n_total = 0  # absolute index of the next sample, the phase origin of the references
+        self._weight = 0.0  # number (or total weight) of the samples in the sums
+        self._offset = None
+        self._sx = np.zeros(self.n_channels)
+        self._sy = np.zeros((n_freqs, n_refs))
+        self._sxx = np.zeros((self.n_channels, self.n_channels))
+        self._syy = np.zeros((n_freqs, n_refs, n_refs))
+        self._sxy = np.zeros((n_freqs, self.n_channels, n_refs))
+        if self.window_samples is not None:
+            self._buffer = np.zeros((self.n_channels, self.window_samples))
+            self._since_resync = 0
+
+    @property
+    def ready(self):
+        """
+        bool: Whether a full window (or one half-life of the exponential window) has been received.
+        """
+        if self.window_samples is not None:
+            return self._weight >= self.window_samples
+        return self._n_total >= self.half_life * self.sfreq
+
+    def _references(self, start, n_samples):
+        """
+        Returns the references of the samples start..start + n_samples - 1, shape (n_freqs, 2 * n_harmonics, n).
+        """
+        phases = self._omegas[..., None] * np.arange(start, start + n_samples)
+        return np.concatenate([np.sin(phases), np.cos(phases)], axis=1)
+
+    def _accumulate(self, x, y, sign=1.0, weights=None):
+        """
+        Adds (or subtracts) the sums of samples x of shape (n_channels, n) and references y of shape (n_freqs, 2H, n).
+        """
+        xw = x if weights is None else x * weights
+        yw = y if weights is None else y * weights
+        self._sx += sign * xw.sum(axis=1)
+        self._sy += sign * yw.sum(axis=2)
+        self._sxx += sign * (xw @ x.T)
+        self._syy += sign * (yw @ y.transpose(0, 2, 1))
+        self._sxy += sign * np.einsum("cn,fbn->fcb", xw, y)
+        self._weight += sign * (x.shape[1] if weights is None else weights.sum())
+
+    def _resync(self):
+        """
+        Recomputes the sliding sums exactly from the buffered window.
+        """
+        self._sx[:] = 0
+        self._sy[:] = 0
+        self._sxx[:] = 0
+        self._syy[:] = 0
+        self._sxy[:] = 0
+        self._weight = 0.0
+        self._accumulate(self._buffer, self._references(self._n_total - self.window_samples, self.window_samples))
+        self._since_resync = 0
+
+    def update(self, chunk):
+        """
+        Adds new samples of the stream and scores the current window.
+
+        Args:
+            chunk (numpy.ndarray): New samples of shape (n_channels, n_new_samples), filtered like the input of
+                basic_cca.
+
+        Returns:
+            dict: Frequency to canonical correlation of the current window (see scores()).
+            None: Until the window is ready.
+        """
+        chunk = np.asarray(chunk, dtype=np.float64)
+        n_new = chunk.shape[1]
+        if n_new:
+            if self._offset is None:
+                # A constant offset does not change the covariances but would cancel badly in the raw sums
+                self._offset = chunk.mean(axis=1, keepdims=True)
+            x = chunk - self._offset
+            if self.window_samples is None:
+                decay = self._decay ** n_new
+                for name in ("_sx", "_sy", "_sxx", "_syy", "_sxy"):
+                    getattr(self, name)[...] *= decay
+                self._weight *= decay
+                self._accumulate(x, self._references(self._n_total, n_new),
+                                 weights=self._decay ** np.arange(n_new - 1, -1, -1))
+                self._n_total += n_new
+            else:
+                self._slide(x)
+        return self.scores() if self.ready else None
+
+    def _slide(self, x):
+        """
+        Shifts offset-corrected samples into the sliding window and updates the sums.
+        """
+        window = self.window_samples
+        n_new = x.shape[1]
+        x = x[:, -window:]  # older samples of a long chunk never enter the window
+        n_shift = x.shape[1]
+        # Buffer positions before the shift that hold summed samples (the window may not be full yet)
+        first_valid = window - int(self._weight)
+        n_dropped = max(n_shift - first_valid, 0)
+        dropped = self._buffer[:, first_valid:n_shift].copy()
+        dropped_start = self._n_total - window + first_valid
+
+        self._buffer[:, :window - n_shift] = self._buffer[:, n_shift:]
+        self._buffer[:, window - n_shift:] = x
+        self._n_total += n_new
+        self._since_resync += n_new
+        if self._since_resync >= window:
+            self._resync()
+            return
+        if n_dropped:
+            self._accumulate(dropped, self._references(dropped_start, n_dropped), sign=-1.0)
+        self._accumulate(x, self._references(self._n_total - n_shift, n_shift))
+
+    def correlations(self):
+        """
+        Computes the first canonical correlation of the current window with every frequency.
+
+        Returns:
+            numpy.ndarray: Correlations of shape (n_freqs,).
+
+        Raises:
+            RuntimeError: If no samples have been received.
+        """
+        if self._weight <= 1:
+            raise RuntimeError("Not enough samples for CCA.")
+        mean_x = self._sx / self._weight
+        mean_y = self._sy / self._weight
+        cxx = self._sxx / self._weight - np.outer(mean_x, mean_x)
+        cyy = self._syy / self._weight - mean_y[:, :, None] * mean_y[:, None, :]
+        cxy = self._sxy / self._weight - mean_x[:, None] * mean_y[:, None, :]
+        # A tiny ridge keeps rank-deficient (e.g. average-referenced) data positive definite
+        cxx += (1e-10 * np.trace(cxx) / self.n_channels + 1e-300) * np.eye(self.n_channels)
+        cyy += 1e-10 * np.eye(cyy.shape[-1])
+        whiten_x = np.linalg.inv(np.linalg.cholesky(cxx))
+        whiten_y = np.linalg.inv(np.linalg.cholesky(cyy))
+        whitened = whiten_x @ cxy @ whiten_y.transpose(0, 2, 1)
+        return np.clip(np.linalg.svd(whitened, compute_uv=False)[:, 0], 0.0, 1.0)
+
+    def scores(self):
+        """
+        Scores every frequency of the current window, with the same output as basic_cca.
+
+        Returns:
+            dict: Frequency to canonical correlation. The detected frequency is max(scores, key=scores.get).
+        """
+        return dict(zip(self.freqs, self.correlations().tolist()))
+
+
+#######
+# Example comparing the closed-form CCA with sklearn on a synthetic 10 Hz response
+######
+if __name__ == "__main__":
+    import warnings
+
+    from sklearn.cross_decomposition import CCA
+    from sklearn.preprocessing import StandardScaler
+
+    sfreq, n_samples = 250, 1000
+    t = np.arange(n_samples) / sfreq
+    rng = np.random.default_rng(0)
+    eeg = 0.5 * np.sin(2 * np.pi * 10 * t + rng.uniform(0, 2 * np.pi, (3, 1))) + rng.standard_normal((3, n_samples))
+
+    scores = basic_cca(eeg, sfreq, [5, 10, 15, 20])
+    warnings.filterwarnings("ignore", message=".*did not converge.*")
+    for f, score in scores.items():
+        ref = np.column_stack([np.sin(2 * np.pi * f * t), np.cos(2 * np.pi * f * t),
+                               np.sin(2 * np.pi * 2 * f * t), np.cos(2 * np.pi * 2 * f * t)])
+        u, v = CCA(n_components=1, max_iter=5000, tol=1e-12).fit_transform(
+            StandardScaler().fit_transform(eeg.T), StandardScaler().fit_transform(ref))
+        print(f"{f:2d} Hz | closed form {score:.6f} | sklearn {abs(np.corrcoef(u[:, 0], v[:, 0])[0, 1]):.6f}")
@@ -344,9 +344,10 @@ class BrainFlowBoard:
 #     return band_powers
 
 import numpy as np
-from scipy.signal import welch
 from typing import Dict, Tuple, Sequence, Optional
 
+from .band_power import BandPowerEngine
+
 
 def compute_band_powers(data: np.ndarray, sf: float, bands: Dict[str, Tuple[float, float]] = None,
         window_sec: Optional[float] = None, overlap: float = 0.5, detrend: str = "constant", relative: bool = False,
@@ -369,8 +370,8 @@ def compute_band_powers(data: np.ndarray, sf: float, bands: Dict[str, Tuple[floa
         min(4 s, n_samples/sf), but at least 1 s.
     overlap : float
         Fractional overlap between segments in Welch. In [0, 1). Default 0.5.
-    detrend : {"constant", "linear", None}
-        Detrending applied before Welch.
+    detrend : {"constant", "linear", None, False}
+        Detrending applied before Welch (False, as accepted by scipy's welch, means no detrending like None).
     relative : bool
         If True, divide each bandpower by total power in `total_band`
         (or by the full [0, sf/2) range if total_band is None).
@@ -411,38 +412,19 @@ def compute_band_powers(data: np.ndarray, sf: float, bands: Dict[str, Tuple[floa
     nperseg = max(8, min(nperseg, n_samples))  # guardrails
     noverlap = int(round(nperseg * overlap)) if 0 <= overlap < 1 else 0
 
-    # Compute PSD: Pxx units are V^2/Hz if input is in volts
-    freqs, Pxx = welch(data, fs=sf, nperseg=nperseg, noverlap=noverlap, detrend=detrend, axis=-1, return_onesided=True,
-        scaling="density", average="mean", )
-    # Pxx shape: (n_channels, n_freqs)
-    # Integrate PSD over each band
-    labels = list(bands.keys())
-    bp = np.zeros((n_channels, len(labels)), dtype=float)
-
-    for j, (lo, hi) in enumerate(bands.values()):
-        if hi <= lo:
-            raise ValueError(f"Invalid band {labels[j]} with lo>=hi: {(lo, hi)}")
-        idx = np.logical_and(freqs >= lo, freqs < hi)
-        if not np.any(idx):
-            bp[:, j] = 0.0
-        else:
-            bp[:, j] = np.trapz(Pxx[:, idx], freqs[idx], axis=-1)
-
-    # Relative power normalization if requested
-    if relative:
-        if total_band is None:
-            lo_tot, hi_tot = (0.0, sf / 2.0 - 1e-12)  # upper open interval
-        else:
-            lo_tot, hi_tot = total_band
-            if hi_tot <= lo_tot:
-                raise ValueError(f"Invalid total_band with lo>=hi: {total_band}")
-        idx_tot = np.logical_and(freqs >= lo_tot, freqs < hi_tot)
-        if not np.any(idx_tot):
-            raise ValueError("total_band does not include any frequency bins; increase window length or adjust band.")
-        total_power = np.trapz(Pxx[:, idx_tot], freqs[idx_tot], axis=-1)  # (n_channels,)
-        # Avoid divide by zero
-        total_power = np.where(total_power <= 0, np.nan, total_power)
-        bp = bp / total_power[:, None]
+    if relative and total_band is not None and total_band[1] <= total_band[0]:
+        raise ValueError(f"Invalid total_band with lo>=hi: {total_band}")
+    # Bands are half-open [lo, hi); the default total range [0, sf/2) leaves out the Nyquist bin
+    total_band = total_band if total_band is not None else (0.0, sf / 2.0 - 1e-12)
+
+    # One batched Welch PSD for all channels, integrated with cached per-band weights (see band_power.py)
+    if detrend is False:
+        detrend = None
+    engine = BandPowerEngine(sf, bands=bands, nperseg=nperseg, noverlap=noverlap, detrend=detrend, ratios=[],
+                             total_band=total_band, include_high=False)
+    powers = engine.compute(data)
+    labels = powers["labels"]
+    bp = powers["relative"] if relative else powers["absolute"]
 
     if return_log:
         # 10*log10(power). Guard against log(0).
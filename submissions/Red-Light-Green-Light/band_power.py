@@ -0,0 +1,283 @@
+import functools
+
+import numpy as np
+
+DEFAULT_BANDS = {
+    "delta": (1, 4),
+    "theta": (4, 8),
+    "alpha": (8, 12),
+    "beta": (12, 30),
+    "gamma": (30, 100),
+}
+
+# (numerator, denominator) band pairs reported by default, when both bands exist
+DEFAULT_RATIOS = (("alpha", "beta"), ("theta", "beta"))
+
+
+@functools.lru_cache(maxsize=32)
+def _welch_window(nperseg, sfreq):
+    """
+    Returns the periodic Hann window used by Welch's method and its density scaling, memoized per segment length.
+
+    Args:
+        nperseg (int): Segment length in samples.
+        sfreq (float): Sampling frequency in Hz.
+
+    Returns:
+        tuple: (window, scale, freqs), with window read-only, scale = 1 / (sfreq * sum(window ** 2)) and freqs the
+            frequencies of the one-sided spectrum.
+    """
+    window = 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(nperseg) / nperseg)
+    window.flags.writeable = False
+    freqs = np.fft.rfftfreq(nperseg, 1.0 / sfreq)
+    freqs.flags.writeable = False
+    return window, 1.0 / (sfreq * np.sum(window ** 2)), freqs
+
+
+def segment_periodograms(segments, sfreq, detrend="constant"):
+    """
+    Computes the one-sided, density-scaled Hann periodogram of every segment, all in one batched FFT.
+
+    Args:
+        segments (numpy.ndarray): Array of shape (..., nperseg).
+        sfreq (float): Sampling frequency in Hz.
+        detrend (str): 'constant' to remove each segment's mean, 'linear' to remove its linear trend, or None.
+
+    Returns:
+        tuple: (freqs, periodograms), periodograms of shape (..., nperseg // 2 + 1).
+    """
+    nperseg = segments.shape[-1]
+    window, scale, freqs = _welch_window(nperseg, sfreq)
+    if detrend == "constant":
+        segments = segments - segments.mean(axis=-1, keepdims=True)
+    elif detrend == "linear":
+        t = np.arange(nperseg) - (nperseg - 1) / 2.0
+        centered = segments - segments.mean(axis=-1, keepdims=True)
+        slope = (centered @ t) / (t @ t)
+        segments = centered - slope[..., None] * t
+    elif detrend is not None:
+        raise ValueError(f"Unknown detrend option '{detrend}', use 'constant', 'linear' or None.")
+
+    spectrum = np.fft.rfft(segments * window, axis=-1)
+    periodograms = spectrum.real ** 2 + spectrum.imag ** 2
+    periodograms *= scale
+    # One-sided spectrum: double everything except DC and (for even lengths) the Nyquist bin
+    periodograms[..., 1:nperseg - nperseg // 2] *= 2
+    return freqs, periodograms
+
+
+def welch_psd(data, sfreq, nperseg=256, noverlap=None, detrend="constant"):
+    """
+    Welch power spectral density of all channels at once, numerically matching scipy.signal.welch with its defaults.
+
+    All segments of all channels are taken as strided views and transformed in a single batched FFT.
+
+    Args:
+        data (numpy.ndarray): Array of shape (n_channels, n_samples) (or any shape, samples on the last axis).
+        sfreq (float): Sampling frequency in Hz.
+        nperseg (int): Segment length in samples. Clipped to the number of samples. Default is 256.
+        noverlap (int, optional): Overlap between segments in samples. Defaults to nperseg // 2.
+        detrend (str): 'constant', 'linear' or None. Default is 'constant'.
+
+    Returns:
+        tuple: (freqs, psd), psd of shape (n_channels, nperseg // 2 + 1).
+    """
+    data = np.asarray(data, dtype=np.float64)
+    nperseg = min(int(nperseg), data.shape[-1])
+    noverlap = nperseg // 2 if noverlap is None else int(noverlap)
+    if nperseg < 2 or noverlap >= nperseg:
+        raise ValueError(f"Invalid Welch parameters: nperseg={nperseg}, noverlap={noverlap}.")
+    segments = np.lib.stride_tricks.sliding_window_view(data, nperseg, axis=-1)[..., ::nperseg - noverlap, :]
+    freqs, periodograms = segment_periodograms(segments, sfreq, detrend)
+    return freqs, periodograms.mean(axis=-2)
+
+
+@functools.lru_cache(maxsize=64)
+def get_band_weights(sfreq, nperseg, bands, include_high=True):
+    """
+    Returns the trapezoidal integration weights of each band over a one-sided spectrum, memoized.
+
+    Multiplying a PSD of shape (n_channels, n_freqs) by the weights gives the power of every band in one product,
+    equal to np.trapezoid over the bins of each band.
+
+    Args:
+        sfreq (float): Sampling frequency in Hz.
+        nperseg (int): Segment length the spectrum was computed with.
+        bands (tuple): ((name, low, high), ...) band edges in Hz.
+        include_high (bool): Whether a bin at exactly the high edge belongs to the band. Default is True.
+
+    Returns:
+        numpy.ndarray: Read-only weights of shape (n_freqs, n_bands). A band with fewer than two bins gets
+            all-zero weights (zero power).
+    """
+    _, _, freqs = _welch_window(nperseg, sfreq)
+    weights = np.zeros((len(freqs), len(bands)))
+    for j, (_, low, high) in enumerate(bands):
+        in_band = (freqs >= low) & ((freqs <= high) if include_high else (freqs < high))
+        idx = np.flatnonzero(in_band)
+        if len(idx) < 2:
+            continue
+        df = np.diff(freqs[idx])
+        weights[idx[:-1], j] += df / 2
+        weights[idx[1:], j] += df / 2
+    weights.flags.writeable = False
+    return weights
+
+
+class BandPowerEngine:
+    """
+    Computes band powers for all channels from a single multi-channel Welch PSD.
+
+    The per-band bin selections and integration weights are computed once per (sampling rate, segment length, bands)
+    and reused, so each update is one batched FFT plus one matrix product. Absolute, relative and log powers and
+    band ratios all come out of the same pass.
+
+    Attributes:
+        sfreq (float): Sampling frequency in Hz.
+        bands (dict): Band name to (low, high) edges in Hz.
+        labels (list): Band names, in the column order of the returned arrays.
+        nperseg (int): Welch segment length in samples.
+        ratios (list): (numerator, denominator) band pairs reported as ratios.
+    """
+
+    def __init__(self, sfreq, bands=None, nperseg=256, noverlap=None, detrend="constant", ratios=None,
+                 total_band=None, include_high=True):
+        """
+        Initializes the engine.
+
+        Args:
+            sfreq (float): Sampling frequency in Hz.
+            bands (dict, optional): Band name to (low, high) edges in Hz. Defaults to DEFAULT_BANDS.
+            nperseg (int): Welch segment length in samples, clipped to the window length. Default is 256.
+            noverlap (int, optional): Welch segment overlap in samples. Defaults to nperseg // 2.
+            detrend (str): Segment detrending, 'constant', 'linear' or None. Default is 'constant'.
+            ratios (list, optional): (numerator, denominator) band name pairs, e.g. [('alpha', 'beta')].
+                Defaults to alpha/beta and theta/beta when those bands exist.
+            total_band (tuple, optional): (low, high) range used as the denominator of relative powers.
+                Defaults to the whole spectrum.
+            include_high (bool): Whether a bin at exactly a band's high edge belongs to it. Default is True.
+
+        Raises:
+            ValueError: If a band has high <= low or a ratio names an unknown band.
+        """
+        self.sfreq = float(sfreq)
+        self.bands = dict(bands if bands is not None else DEFAULT_BANDS)
+        self.labels = list(self.bands)
+        for name, (low, high) in self.bands.items():
+            if high <= low:
+                raise ValueError(f"Invalid band {name}: {(low, high)}")
+        if ratios is None:
+            ratios = [pair for pair in DEFAULT_RATIOS if pair[0] in self.bands and pair[1] in self.bands]
+        for numerator, denominator in ratios:
+            if numerator not in self.bands or denominator not in self.bands:
+                raise ValueError(f"Ratio {numerator}/{denominator} uses a band that is not defined.")
+        self.ratios = list(ratios)
+        self.nperseg = int(nperseg)
+        self.noverlap = noverlap
+        self.detrend = detrend
+        self.include_high = include_high
+        total_band = total_band if total_band is not None else (0.0, self.sfreq / 2)
+        # The total power is integrated as one more band, so it comes out of the same matrix product
+        self._band_key = tuple((name, float(low), float(high)) for name, (low, high) in self.bands.items()) \
+            + (("total", float(total_band[0]), float(total_band[1])),)
+        self._ratio_columns = [(self.labels.index(n), self.labels.index(d)) for n, d in self.ratios]
+
+    def psd(self, eeg):
+        """
+        Computes the Welch PSD of a window with the engine's settings.
+
+        Args:
+            eeg (numpy.ndarray): Array of shape (n_channels, n_samples).
+
+        Returns:
+            tuple: (freqs, psd), psd of shape (n_channels, n_freqs).
+        """
+        return welch_psd(eeg, self.sfreq, nperseg=self.nperseg, noverlap=self.noverlap, detrend=self.detrend)
+
+    def powers_from_psd(self, psd, nperseg):
+        """
+        Turns a PSD into band powers, relative powers, log powers and ratios.
+
+        Args:
+            psd (numpy.ndarray): PSD of shape (n_channels, nperseg // 2 + 1), as returned by psd().
+            nperseg (int): Segment length the PSD was computed with.
+
+        Returns:
+            dict: See compute().
+        """
+        weights = get_band_weights(self.sfreq, nperseg, self._band_key, self.include_high)
+        integrated = psd @ weights
+        absolute = integrated[..., :-1]
+        total = integrated[..., -1:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            relative = np.where(total > 0, absolute / total, np.nan)
+        log = 10.0 * np.log10(np.maximum(absolute, np.finfo(float).tiny))
+        ratios = {f"{self.labels[n]}/{self.labels[d]}": absolute[..., n] / (absolute[..., d] + 1e-12)
+                  for n, d in self._ratio_columns}
+        return {"labels": self.labels, "absolute": absolute, "relative": relative, "log": log, "ratios": ratios}
+
+    def compute(self, eeg):
+        """
+        Computes the band powers of a window of EEG.
+
+        Args:
+            eeg (numpy.ndarray): Array of shape (n_channels, n_samples).
+
+        Returns:
+            dict: With keys
+                - 'labels': band names, in column order,
+                - 'absolute': band powers, shape (n_channels, n_bands), in units of the data squared,
+                - 'relative': band powers divided by the total power, shape (n_channels, n_bands),
+                - 'log': 10 * log10 of the absolute powers (dB), shape (n_channels, n_bands),
+                - 'ratios': ratio name ('alpha/beta') to per-channel ratio, shape (n_channels,).
+        """
+        _, psd = self.psd(eeg)
+        return self.powers_from_psd(psd, min(self.nperseg, np.shape(eeg)[-1]))
+
+
+@functools.lru_cache(maxsize=16)
+def _cached_engine(sfreq, bands, nperseg):
+    return BandPowerEngine(sfreq, bands=dict((name, (low, high)) for name, low, high in bands), nperseg=nperseg)
+
+
+def compute_band_powers(eeg_data, sfreq, bands=None, nperseg=256):
+    """
+    Drop-in replacement for the per-channel compute_band_powers loops, using a cached BandPowerEngine.
+
+    Args:
+        eeg_data (numpy.ndarray): Array of shape (n_channels, n_samples).
+        sfreq (float): Sampling frequency in Hz.
+        bands (dict, optional): Band name to (low, high) edges in Hz. Defaults to DEFAULT_BANDS.
+        nperseg (int): Welch segment length in samples. Default is 256.
+
+    Returns:
+        dict: Band name to absolute power per channel, shape (n_channels,).
+    """
+    bands = bands if bands is not None else DEFAULT_BANDS
+    engine = _cached_engine(float(sfreq), tuple((name, low, high) for name, (low, high) in bands.items()), int(nperseg))
+    powers = engine.compute(eeg_data)
+    return {band: powers["absolute"][..., j] for j, band in enumerate(powers["labels"])}
+
+
+#######
+# Example computing band powers from a live board
+######
+if __name__ == "__main__":
+    import time
+
+    from brainflow.board_shim import BoardIds
+    from brainflow_stream import BrainFlowBoardSetup
+
+    brainflow_board = BrainFlowBoardSetup(board_id=BoardIds.SYNTHETIC_BOARD.value, master_board=BoardIds.CYTON_BOARD.value)
+    brainflow_board.setup()
+    engine = BandPowerEngine(brainflow_board.get_sampling_rate())
+    time.sleep(2.5)
+
+    for _ in range(5):
+        eeg = brainflow_board.get_current_board_data(2 * brainflow_board.get_sampling_rate(), channels='eeg')
+        powers = engine.compute(eeg)
+        relative = dict(zip(powers["labels"], powers["relative"].mean(axis=0).round(3)))
+        print(f"Relative power: {relative} | alpha/beta: {powers['ratios']['alpha/beta'].mean():.2f}")
+        time.sleep(0.5)
+
+    brainflow_board.stop()
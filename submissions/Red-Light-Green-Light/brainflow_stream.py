@@ -1,6 +1,72 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
 import brainflow
 from brainflow.board_shim import BoardShim, BrainFlowInputParams, BrainFlowError, BoardIds
-import serial.tools.list_ports
+
+# Only needed for port detection, multi-board groups and asyncio streaming, so these are imported where they are used
+# to keep `import brainflow_stream` fast: asyncio, concurrent.futures, serial (pyserial)
+
+# Boards using the OpenBCI serial protocol: they answer a 'v' (version/reset) command with a message ending in '$$$'.
+# These can be probed directly with pyserial, in parallel (BrainFlow serializes prepare_session calls internally).
+OPENBCI_SERIAL_BOARDS = (BoardIds.CYTON_BOARD.value, BoardIds.CYTON_DAISY_BOARD.value)
+
+# Package number increment between samples, for boards where it is not 1 (the Daisy merges two packets per sample)
+PACKAGE_NUM_STEPS = {BoardIds.CYTON_DAISY_BOARD.value: 2, BoardIds.CYTON_DAISY_WIFI_BOARD.value: 2}
+
+# Last known {serial_number: {'port': ..., 'board_id': ...}} mapping, tried before probing on the next start
+PORT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".brainflow_stream_ports.json")
+
+
+@functools.lru_cache(maxsize=None)
+def get_board_descr(board_id):
+    """
+    Returns the BrainFlow description of a board, memoized per board ID.
+
+    BoardShim.get_board_descr() goes through the BrainFlow library every time; the description never changes while
+    the program runs, so it is only fetched once per board ID. Do not modify the returned dictionary.
+
+    Args:
+        board_id (int): The ID of the BrainFlow board.
+
+    Returns:
+        dict: The board description (channels, sampling rate, number of rows, ...).
+    """
+    return BoardShim.get_board_descr(board_id)
+
+
+def _load_port_cache():
+    """
+    Loads the cached serial number to port mapping from PORT_CACHE_PATH.
+
+    Returns:
+        dict: The cached mapping, or an empty dict if the cache is missing or unreadable.
+    """
+    try:
+        with open(PORT_CACHE_PATH, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_port_cache(cache):
+    """
+    Writes the serial number to port mapping to PORT_CACHE_PATH. Failures are ignored, the cache is only an optimization.
+
+    Args:
+        cache (dict): Mapping to write.
+    """
+    try:
+        with open(PORT_CACHE_PATH, "w") as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        print(f"Warning: could not write port cache {PORT_CACHE_PATH}: {e}")
+
 
 class BrainFlowBoardSetup:
     """
@@ -19,11 +85,21 @@ class BrainFlowBoardSetup:
         streaming (bool): Flag indicating if the board is actively streaming data.
         eeg_channels (list): List of EEG channel indices for the board (empty if not applicable).
         sampling_rate (int): Sampling rate of the board.
+        timestamp_channel (int): Row index of the BrainFlow timestamp channel (None if unavailable).
+        package_num_channel (int): Row index of the package number channel (None if unavailable).
+        ring_buffer (RingBuffer): Buffer filled by the background acquisition thread (None unless started).
+        buffer_size (int): Size of the BrainFlow ring buffer requested when streaming starts.
+        health (StreamHealth): Dropped-sample and latency tracker fed by every read (None if unavailable).
+        marker_log (MarkerLog): Every marker inserted through insert_marker() / insert_markers().
+        supervisor (BoardSupervisor): Reconnect supervisor started by start_supervisor() (None unless started).
+        board_shim_class (type): Class used to create the BoardShim. Can be replaced (e.g. per instance) with a
+            fault-injecting stand-in for testing, see board_supervisor.FaultInjector.
     """
 
     _id_counter = 0  # Class-level variable to assign default IDs
+    board_shim_class = BoardShim
 
-    def __init__(self, board_id, serial_port=None, master_board=None, name=None, **kwargs):
+    def __init__(self, board_id, serial_port=None, master_board=None, name=None, buffer_size=450000, **kwargs):
         """
         Initializes the BrainFlowBoardSetup class with the given board ID, serial port, master board, and additional parameters.
 
@@ -32,6 +108,7 @@ class BrainFlowBoardSetup:
             serial_port (str, optional): The serial port to which the BrainFlow board is connected.
             master_board (int, optional): The master board ID, used for playback or synthetic boards.
             name (str, optional): A user-friendly name or identifier for this instance. Defaults to 'Board X'.
+            buffer_size (int, optional): Number of samples BrainFlow keeps in its ring buffer. Default is 450000.
             **kwargs: Additional keyword arguments to be set as attributes on the BrainFlowInputParams instance.
         """
         self.instance_id = BrainFlowBoardSetup._id_counter  # Unique identifier for each instance
@@ -56,10 +133,15 @@ class BrainFlowBoardSetup:
         # Retrieve EEG channels and sampling rate based on the provided board or master board
         try:
             self.eeg_channels, self.sampling_rate = self.get_board_info()
+            layout_descr = get_board_descr(self.get_layout_board_id())
+            self.timestamp_channel = layout_descr.get("timestamp_channel")
+            self.package_num_channel = layout_descr.get("package_num_channel")
         except BrainFlowError as e:
             print(f"Error getting board info for board {self.board_id}: {e}")
             self.eeg_channels = []
             self.sampling_rate = None
+            self.timestamp_channel = None
+            self.package_num_channel = None
 
         # Apply additional parameters
         for key, value in kwargs.items():
@@ -72,6 +154,33 @@ class BrainFlowBoardSetup:
         self.board = None
         self.session_prepared = False
         self.streaming = False
+
+        # Stream health tracking (see get_stream_stats)
+        self.buffer_size = buffer_size
+        self.health = None
+        if self.timestamp_channel is not None:
+            self.health = StreamHealth(self.sampling_rate, self.timestamp_channel, self.package_num_channel,
+                                       package_num_step=PACKAGE_NUM_STEPS.get(self.get_layout_board_id(), 1))
+        self._stats_logging_thread = None
+        self._stats_logging_stop = threading.Event()
+
+        # Log of inserted markers (see insert_marker)
+        self.marker_log = MarkerLog(self.sampling_rate)
+
+        # Cache of resolved channel selections (see resolve_channels)
+        self._channel_selections = {}
+
+        # Shared memory publisher (see start_publishing)
+        self.publisher = None
+
+        # Reconnect supervisor (see start_supervisor)
+        self.supervisor = None
+
+        # Background acquisition state (see start_acquisition)
+        self.ring_buffer = None
+        self._acquisition_rows = None
+        self._acquisition_thread = None
+        self._acquisition_stop = threading.Event()
     
     def __getattr__(self, name):
         """
@@ -106,51 +215,150 @@ class BrainFlowBoardSetup:
             raise ValueError(f"Master board is only used for PLAYBACK_FILE_BOARD (-3) and SYNTHETIC_BOARD (-1). But {self.board_id} was provided.")
 
         board_to_use = self.master_board if self.master_board is not None else self.board_id
-        board_descr = BoardShim.get_board_descr(board_to_use)
+        board_descr = get_board_descr(board_to_use)
         
-        eeg_channels = board_descr.get("eeg_channels", [])
-        sampling_rate = BoardShim.get_sampling_rate(board_to_use)
+        eeg_channels = list(board_descr.get("eeg_channels", []))
+        sampling_rate = board_descr["sampling_rate"]
         
         return eeg_channels, sampling_rate
 
-    def find_device_ports(self):
+    def get_layout_board_id(self):
+        """
+        Returns the board ID whose description matches the rows of the data returned by BrainFlow.
+
+        Playback and streaming boards return data laid out like their master board, while the synthetic board
+        ignores master_board and always returns its own layout and sampling rate (e.g. 32 rows at 250 Hz with a
+        Cyton master board).
+
+        Returns:
+            int: The board ID to use with get_board_descr() and the BoardShim channel getters.
+        """
+        if self.master_board is not None and self.board_id != BoardIds.SYNTHETIC_BOARD.value:
+            return self.master_board
+        return self.board_id
+
+    def find_device_ports(self, ports=None, timeout=6.0, use_cache=True):
         """
         Finds all compatible BrainFlow devices by checking the available serial ports.
 
-        This method iterates over available serial ports on the computer and attempts
-        to detect and verify BrainFlow-compatible devices by initializing a session.
+        Devices remembered in the port cache (by USB serial number) are returned straight away if they are
+        currently plugged in, so a warm start does not need to probe anything. Otherwise every port is probed:
+        OpenBCI serial boards (Cyton, Cyton Daisy) are probed concurrently with a direct serial handshake,
+        other boards by preparing and releasing a BrainFlow session on each port.
+
+        Args:
+            ports (list, optional): Port objects with 'device', 'serial_number' and 'description' attributes.
+                Defaults to serial.tools.list_ports.comports().
+            timeout (float): Seconds to wait for each port to answer. Default is 6.0 (BrainFlow's own Cyton timeout).
+            use_cache (bool): Whether to return cached devices without probing. Default is True.
 
         Returns:
-            list: A list of dictionaries containing 'port', 'serial_number', and 'description' for each compatible device.
-                    Returns an empty list if no devices are found.
+            list: A list of dictionaries containing 'port', 'serial_number', 'description' and 'cached' for each
+                    compatible device. Returns an empty list if no devices are found.
         """
+        if ports is None:
+            import serial.tools.list_ports
+            ports = serial.tools.list_ports.comports()
+        ports = list(ports)
+        cache = _load_port_cache()
+
+        if use_cache:
+            cached_ports = [
+                {'port': port.device, 'serial_number': port.serial_number, 'description': port.description, 'cached': True}
+                for port in ports
+                if port.serial_number in cache and cache[port.serial_number]['board_id'] == self.board_id
+            ]
+            if cached_ports:
+                for device_info in cached_ports:
+                    print(f"Using cached device: Serial Number: {device_info['serial_number']}, Port: {device_info['port']}")
+                return cached_ports
+
         BoardShim.disable_board_logger()
-        ports = serial.tools.list_ports.comports()
-        compatible_ports = []
+        if self.board_id in OPENBCI_SERIAL_BOARDS and ports:
+            from concurrent.futures import ThreadPoolExecutor, wait
+
+            executor = ThreadPoolExecutor(max_workers=len(ports))
+            futures = {executor.submit(self._probe_openbci_port, port.device, timeout): port for port in ports}
+            # Each probe enforces its own timeout; the extra second only guards against a stuck driver
+            done, _ = wait(futures, timeout=timeout + 1.0)
+            compatible = [futures[f] for f in futures if f in done and f.result()]
+            executor.shutdown(wait=False, cancel_futures=True)
+        else:
+            compatible = [port for port in ports if self._probe_brainflow_port(port.device)]
+        BoardShim.enable_board_logger()
 
-        for port in ports:
-            try:
-                self.params.serial_port = port.device
-                board = BoardShim(self.board_id, self.params)
-                board.prepare_session()
-                board.release_session()
-                
-                device_info = {
-                    'port': port.device,
-                    'serial_number': port.serial_number,
-                    'description': port.description
-                }
-                print(f"Compatible device found: Serial Number: {port.serial_number}, Description: {port.description}")
-                compatible_ports.append(device_info)
-            except BrainFlowError:
-                continue
-        
-        if not compatible_ports:
+        compatible_ports = []
+        for port in compatible:
+            device_info = {
+                'port': port.device,
+                'serial_number': port.serial_number,
+                'description': port.description,
+                'cached': False
+            }
+            print(f"Compatible device found: Serial Number: {port.serial_number}, Description: {port.description}")
+            compatible_ports.append(device_info)
+            if port.serial_number:
+                cache[port.serial_number] = {'port': port.device, 'board_id': self.board_id}
+
+        if compatible_ports:
+            _save_port_cache(cache)
+        else:
             print(f"No compatible BrainFlow devices found.")
-        
-        BoardShim.enable_board_logger()
+
         return compatible_ports
 
+    def _probe_openbci_port(self, port_device, timeout):
+        """
+        Checks whether an OpenBCI serial board (Cyton, Cyton Daisy) answers on a port, without using BrainFlow.
+
+        Sends the 'v' command and waits for the '$$$' end-of-message marker, the same check BrainFlow
+        performs in prepare_session. Safe to run concurrently for different ports.
+
+        Args:
+            port_device (str): Port to probe, e.g. 'COM3' or '/dev/ttyUSB0'.
+            timeout (float): Seconds to wait for the board to answer.
+
+        Returns:
+            bool: True if the board answered, False otherwise.
+        """
+        import serial
+
+        try:
+            with serial.Serial(port_device, baudrate=115200, timeout=0.1, write_timeout=timeout) as connection:
+                connection.reset_input_buffer()
+                connection.write(b"v")
+                deadline = time.monotonic() + timeout
+                response = b""
+                while time.monotonic() < deadline:
+                    response += connection.read(connection.in_waiting or 1)
+                    if b"$$$" in response:
+                        return True
+        except (serial.SerialException, OSError, ValueError):
+            pass
+        return False
+
+    def _probe_brainflow_port(self, port_device):
+        """
+        Checks whether the board responds on a port by preparing and releasing a BrainFlow session.
+
+        Args:
+            port_device (str): Port to probe.
+
+        Returns:
+            bool: True if the session could be prepared, False otherwise.
+        """
+        params = BrainFlowInputParams()
+        for key, value in vars(self.params).items():
+            setattr(params, key, value)
+        params.serial_port = port_device
+        try:
+            board = self.board_shim_class(self.board_id, params)
+            board.prepare_session()
+            board.release_session()
+            return True
+        except BrainFlowError:
+            return False
+
     def setup(self):
         """
         Prepares the session and starts the data stream from the BrainFlow board.
@@ -161,6 +369,7 @@ class BrainFlowBoardSetup:
         Raises:
             BrainFlowError: If the board fails to prepare the session or start streaming.
         """
+        ports_info = []
         if self.serial_port is None and self.master_board is None:
             print("No serial port provided, attempting to auto-detect...")
             ports_info = self.find_device_ports()
@@ -172,16 +381,25 @@ class BrainFlowBoardSetup:
             self.serial_port = '' 
         
         self.params.serial_port = self.serial_port
-        self.board = BoardShim(self.board_id, self.params)
+        self.board = self.board_shim_class(self.board_id, self.params)
         try:
             self.board.prepare_session()
             self.session_prepared = True
-            self.board.start_stream(450000)
+            self.board.start_stream(self.buffer_size)
             self.streaming = True
+            self.marker_log.stream_start_time = time.time()
             print(f"[{self.name}, {self.serial_port}] Board setup and streaming started successfully.")
         except BrainFlowError as e:
             print(f"[{self.name}, {self.serial_port}] Error setting up board: {e}")
             self.board = None
+            if ports_info and ports_info[0]['cached']:
+                # The cached port is stale (device moved or replaced); forget it and probe all ports instead
+                print(f"[{self.name}] Cached port {self.serial_port} did not respond, probing all ports...")
+                cache = _load_port_cache()
+                cache.pop(ports_info[0]['serial_number'], None)
+                _save_port_cache(cache)
+                self.serial_port = None
+                self.setup()
 
     def show_params(self):
         """
@@ -220,54 +438,488 @@ class BrainFlowBoardSetup:
         """
         return self.name
     
-    def get_board_data(self):
+    def get_board_data(self, channels=None, dtype=None, out=None):
         """
         Retrieves all accumulated data from the BrainFlow board and clears it from the buffer.
 
+        Args:
+            channels (optional): Rows to return, see resolve_channels(). Defaults to all rows.
+            dtype (numpy.dtype, optional): Data type of the returned array, e.g. np.float32. Defaults to float64.
+            out (numpy.ndarray, optional): Preallocated (n_channels, max_samples) array to copy into. At most
+                max_samples samples are drained; samples arriving meanwhile stay in the BrainFlow buffer.
+
         Returns:
-            numpy.ndarray: The current data from the BrainFlow board if the board is set up.
+            numpy.ndarray: The current data from the BrainFlow board if the board is set up (a view of out if given).
             None: If the board is not set up.
+
+        Raises:
+            ValueError: If out has fewer columns than the samples in the buffer. Nothing is drained in that case.
         """
         if self.board is not None:
-            return self.board.get_board_data()
+            if out is None:
+                return self._select(self._observe(self.board.get_board_data(), consecutive=True), channels, dtype, out)
+            buffered = self.board.get_board_data_count()
+            if buffered > out.shape[1]:
+                raise ValueError(f"[{self.name}] {buffered} samples are buffered but out only holds {out.shape[1]}.")
+            data = self.board.get_board_data(out.shape[1])
+            return self._select(self._observe(data, consecutive=True), channels, dtype, out)
         else:
             print("Board is not set up.")
             return None
 
-    def get_current_board_data(self, num_samples):
+    def get_current_board_data(self, num_samples, channels=None, dtype=None, out=None):
         """
         Retrieves the most recent num_samples data from the BrainFlow board without clearing it from the buffer.
 
+        Selecting channels here (and optionally copying into a reusable out buffer) replaces the usual
+        data[eeg_channels, :] slicing, which makes a second copy of data BrainFlow has just copied.
+
         Args:
             num_samples (int): Number of recent samples to fetch.
+            channels (optional): Rows to return, see resolve_channels(). Defaults to all rows.
+            dtype (numpy.dtype, optional): Data type of the returned array, e.g. np.float32. Defaults to float64.
+            out (numpy.ndarray, optional): Preallocated (n_channels, >= num_samples) array to copy into.
 
         Returns:
-            numpy.ndarray: The latest num_samples data from the BrainFlow board if the board is set up.
+            numpy.ndarray: The latest num_samples data from the BrainFlow board if the board is set up
+                (a view of out if given, holding fewer columns if fewer samples are available).
             None: If the board is not set up.
         """
         if self.board is not None:
-            return self.board.get_current_board_data(num_samples)
+            return self._select(self._observe(self.board.get_current_board_data(num_samples)), channels, dtype, out)
         else:
             print("Board is not set up.")
             return None
 
+    def resolve_channels(self, channels):
+        """
+        Resolves a channel selection to row indices of the BrainFlow data array. Results are cached per selection.
+
+        Args:
+            channels: One of
+                - 'eeg' for all EEG channels,
+                - a list of channel names from the board description (e.g. ['O1', 'O2'] on the Cyton),
+                - a list of row indices (e.g. [1, 5, 8]).
+
+        Returns:
+            slice or numpy.ndarray: A slice when the rows are contiguous (so selecting them does not copy),
+                an index array otherwise.
+
+        Raises:
+            ValueError: If a channel name is not found in the board description.
+        """
+        key = channels if isinstance(channels, str) else tuple(channels)
+        if key in self._channel_selections:
+            return self._channel_selections[key]
+
+        if isinstance(channels, str) and channels == 'eeg':
+            rows = list(self.eeg_channels)
+        else:
+            # Names come from the same description as eeg_channels (see get_board_info)
+            board_to_use = self.master_board if self.master_board is not None else self.board_id
+            eeg_names = get_board_descr(board_to_use).get("eeg_names", "")
+            name_to_row = dict(zip(eeg_names.split(","), self.eeg_channels)) if eeg_names else {}
+            rows = []
+            for channel in ([channels] if isinstance(channels, str) else channels):
+                if isinstance(channel, str):
+                    if channel not in name_to_row:
+                        raise ValueError(f"[{self.name}] Unknown channel '{channel}'. Known channels: {list(name_to_row)}")
+                    rows.append(name_to_row[channel])
+                else:
+                    rows.append(int(channel))
+
+        if rows and rows == list(range(rows[0], rows[0] + len(rows))):
+            selection = slice(rows[0], rows[0] + len(rows))
+        else:
+            selection = np.asarray(rows, dtype=np.intp)
+        self._channel_selections[key] = selection
+        return selection
+
+    def _select(self, data, channels, dtype, out):
+        """
+        Selects rows from a BrainFlow block, converts them to dtype and optionally copies them into out, in one copy.
+
+        Args:
+            data (numpy.ndarray): Block of board data.
+            channels: Channel selection (see resolve_channels()), or None for all rows.
+            dtype (numpy.dtype): Output data type, or None to keep float64.
+            out (numpy.ndarray): Preallocated output array, or None.
+
+        Returns:
+            numpy.ndarray: The selected data (a view of out if given).
+
+        Raises:
+            ValueError: If out has fewer columns than the block.
+        """
+        if channels is None and dtype is None and out is None:
+            return data
+        rows = self.resolve_channels(channels) if channels is not None else slice(None)
+
+        if out is None:
+            if isinstance(rows, slice):
+                selected = data[rows]  # a view
+                return selected.astype(dtype) if dtype is not None else selected
+            if dtype is None:
+                return data[rows]  # fancy indexing, one copy
+            target = np.empty((len(rows), data.shape[1]), dtype=dtype)
+        else:
+            self._check_out(out, data.shape[1])
+            target = out[:, :data.shape[1]]
+
+        if isinstance(rows, slice):
+            np.copyto(target, data[rows], casting='same_kind')
+        else:
+            # Row by row, so no temporary array is created for the fancy-indexed selection
+            for i, row in enumerate(rows):
+                np.copyto(target[i], data[row], casting='same_kind')
+        return target
+
+    def _check_out(self, out, n_samples):
+        """
+        Checks that a preallocated output array can hold n_samples samples.
+
+        Raises:
+            ValueError: If out has fewer than n_samples columns.
+        """
+        if out.shape[1] < n_samples:
+            raise ValueError(f"[{self.name}] out holds {out.shape[1]} samples, {n_samples} need to be copied.")
+
+    def create_cursor(self, max_samples=None):
+        """
+        Creates a read cursor that only returns samples newer than its previous read.
+
+        Each consumer (plot, game loop, decoder, ...) should create its own cursor so they can read
+        the same board independently without re-copying data they have already processed.
+
+        Args:
+            max_samples (int, optional): Maximum number of samples returned by a single read.
+                Defaults to 10 seconds of data at the board's sampling rate.
+
+        Returns:
+            BoardCursor: A new cursor positioned at the start of the currently buffered data.
+        """
+        return BoardCursor(self, max_samples=max_samples)
+
+    async def stream(self, chunk_ms=50, max_samples=None):
+        """
+        Asynchronously yields new data from the board, for use with asyncio.
+
+        Every chunk_ms milliseconds the stream reads the samples that arrived since the previous chunk through its own
+        BoardCursor. Reading never blocks (BrainFlow copies from its in-memory buffer), so several streams, decoders,
+        loggers and UIs can share one event loop without extra threads:
+
+            async for chunk in board.stream(chunk_ms=50):
+                process(chunk)
+
+        The stream ends when the board stops streaming.
+
+        Args:
+            chunk_ms (float): Interval between reads in milliseconds. Default is 50.
+            max_samples (int, optional): Maximum number of samples per chunk, see create_cursor().
+
+        Yields:
+            numpy.ndarray: Array of shape (n_rows, n_new_samples) with at least one sample.
+        """
+        import asyncio
+
+        if self.board is None or not self.streaming:
+            print("Board is not streaming, cannot start stream.")
+            return
+
+        cursor = self.create_cursor(max_samples=max_samples)
+        interval = chunk_ms / 1000.0
+        loop = asyncio.get_running_loop()
+        next_read = loop.time()
+        while self.streaming and self.board is not None:
+            chunk = cursor.read()
+            if chunk is not None and chunk.shape[1] > 0:
+                yield chunk
+            # Schedule against a fixed clock so time spent by the consumer does not accumulate as drift
+            next_read = max(next_read + interval, loop.time())
+            await asyncio.sleep(next_read - loop.time())
+
+    def start_acquisition(self, buffer_seconds=30, channels=None, poll_interval=0.01):
+        """
+        Starts a background thread that drains the BrainFlow buffer into a preallocated ring buffer.
+
+        Consumers then call get_latest_window() to get read-only views of the most recent samples, without any
+        per-request allocation. Note that the thread empties BrainFlow's internal buffer, so while acquisition is
+        running get_board_data(), get_current_board_data() and cursors will only see what arrived since the last drain.
+
+        Args:
+            buffer_seconds (float): Length of the ring buffer in seconds. Windows up to this length can be viewed.
+            channels (list, optional): Board rows to keep. Defaults to the EEG channels.
+            poll_interval (float): Seconds to wait between drains of the BrainFlow buffer. Default is 0.01.
+        """
+        if self.board is None or not self.streaming:
+            print("Board is not streaming, cannot start acquisition.")
+            return
+        if self._acquisition_thread is not None:
+            print(f"[{self.name}] Acquisition is already running.")
+            return
+
+        self._acquisition_rows = list(channels) if channels is not None else list(self.eeg_channels)
+        capacity = int(buffer_seconds * self.sampling_rate)
+        self.ring_buffer = RingBuffer(len(self._acquisition_rows), capacity)
+
+        self._acquisition_stop.clear()
+        self._acquisition_thread = threading.Thread(target=self._acquisition_loop, args=(poll_interval,),
+                                                    name=f"{self.name} acquisition", daemon=True)
+        self._acquisition_thread.start()
+
+    def _acquisition_loop(self, poll_interval):
+        """
+        Body of the acquisition thread: repeatedly moves new samples from BrainFlow into the ring buffer.
+
+        Args:
+            poll_interval (float): Seconds to wait between drains of the BrainFlow buffer.
+        """
+        while not self._acquisition_stop.is_set():
+            # A supervisor may release the board (set it to None) and set it up again at any time
+            board = self.board
+            if board is None:
+                self._acquisition_stop.wait(poll_interval)
+                continue
+            try:
+                data = self._observe(board.get_board_data(), consecutive=True)
+            except BrainFlowError as e:
+                print(f"[{self.name}] Error reading board in acquisition thread: {e}")
+                self._acquisition_stop.wait(poll_interval)
+                continue
+            if data.shape[1] > 0:
+                self.ring_buffer.write(data[self._acquisition_rows])
+            self._acquisition_stop.wait(poll_interval)
+
+    def stop_acquisition(self):
+        """
+        Stops the background acquisition thread. The ring buffer keeps its contents.
+        """
+        if self._acquisition_thread is not None:
+            self._acquisition_stop.set()
+            self._acquisition_thread.join()
+            self._acquisition_thread = None
+
+    def start_publishing(self, shm_name, buffer_seconds=30, poll_interval=0.01):
+        """
+        Publishes the board's data into a shared memory ring buffer, so other processes can read it.
+
+        Only one process can own the board's serial port; with a publisher running, any number of processes can
+        attach a SharedBoardSubscriber (see shared_stream.py) using the same shm_name and read the data through
+        the usual get_current_board_data / get_board_data API.
+
+        Args:
+            shm_name (str): Name of the shared memory block, used by subscribers to attach.
+            buffer_seconds (float): Length of the shared ring buffer in seconds. Default is 30.
+            poll_interval (float): Seconds between writes to shared memory. Default is 0.01.
+
+        Returns:
+            SharedMemoryPublisher: The running publisher (also stored as self.publisher).
+        """
+        from shared_stream import SharedMemoryPublisher
+
+        if self.publisher is not None:
+            print(f"[{self.name}] Already publishing to shared memory '{self.publisher.shm_name}'.")
+            return self.publisher
+        self.publisher = SharedMemoryPublisher(self, shm_name, buffer_seconds=buffer_seconds, poll_interval=poll_interval)
+        self.publisher.start()
+        return self.publisher
+
+    def stop_publishing(self):
+        """
+        Stops publishing to shared memory and removes the shared memory block.
+        """
+        if self.publisher is not None:
+            self.publisher.stop()
+            self.publisher = None
+
+    def start_supervisor(self, stall_timeout_ms=1000, buffer_seconds=30, **kwargs):
+        """
+        Starts a supervisor that reconnects the board when the stream stalls (e.g. when the dongle hiccups).
+
+        While the supervisor runs, read through it (supervisor.get_current_board_data / get_board_data) rather than
+        through this instance: its buffer keeps a continuous time axis, with NaN-filled samples for any outage.
+
+        Args:
+            stall_timeout_ms (float): Milliseconds without new samples after which the stream is considered stalled.
+            buffer_seconds (float): Length of the supervisor's buffer in seconds. Default is 30.
+            **kwargs: Further BoardSupervisor options (poll_interval, initial_backoff, max_backoff).
+
+        Returns:
+            BoardSupervisor: The running supervisor (also stored as self.supervisor).
+        """
+        from board_supervisor import BoardSupervisor
+
+        if self.supervisor is not None:
+            print(f"[{self.name}] Supervisor is already running.")
+            return self.supervisor
+        self.supervisor = BoardSupervisor(self, stall_timeout_ms=stall_timeout_ms, buffer_seconds=buffer_seconds, **kwargs)
+        self.supervisor.start()
+        return self.supervisor
+
+    def stop_supervisor(self):
+        """
+        Stops the reconnect supervisor. The board keeps streaming if it is connected.
+        """
+        if self.supervisor is not None:
+            self.supervisor.stop()
+            self.supervisor = None
+
+    def get_latest_window(self, num_samples):
+        """
+        Returns a read-only view of the most recent num_samples from the acquisition ring buffer.
+
+        Args:
+            num_samples (int): Number of recent samples to view.
+
+        Returns:
+            numpy.ndarray: Read-only view of shape (n_channels, n), where n <= num_samples if less data is available.
+            None: If acquisition has not been started.
+        """
+        if self.ring_buffer is None:
+            print("Acquisition is not running, start it with start_acquisition().")
+            return None
+        return self.ring_buffer.latest(num_samples)
+
     def insert_marker(self, marker, verbose=True):
         """
         Inserts a marker into the data stream at the current time. Useful for tagging events in the data stream.
 
+        Every call is also recorded in marker_log (code, wall-clock time, sample index), including markers that
+        could not be inserted because the board was not streaming.
+
         Args:
             marker (float): The marker value to be inserted.
             verbose (bool): Whether to print a confirmation message. Default is True.
+
+        Returns:
+            bool: True if the marker was inserted into the stream, False otherwise.
         """
+        wall_time = time.time()
         if self.board is not None and self.streaming:
             try:
                 self.board.insert_marker(marker)
+                self.marker_log.append(marker, wall_time)
                 if verbose:
                     print(f"[{self.name}] Marker {marker} inserted successfully.")
+                return True
             except BrainFlowError as e:
                 print(f"[{self.name}] Error inserting marker: {e}")
         else:
             print("Board is not streaming, cannot insert marker.")
+        self.marker_log.append(marker, wall_time, in_stream=False)
+        return False
+
+    def insert_markers(self, markers):
+        """
+        Inserts a burst of markers without printing, logging them in marker_log as one batch.
+
+        Note that BrainFlow writes at most one marker per sample: markers inserted faster than the sampling rate are
+        queued and land on consecutive samples.
+
+        Args:
+            markers (array-like): The marker values to be inserted, in order.
+
+        Returns:
+            int: Number of markers inserted into the stream.
+        """
+        markers = np.atleast_1d(np.asarray(markers, dtype=np.float64))
+        wall_times = np.empty(len(markers))
+        inserted = 0
+        if self.board is not None and self.streaming:
+            insert = self.board.insert_marker
+            try:
+                for inserted, marker in enumerate(markers):
+                    wall_times[inserted] = time.time()
+                    insert(float(marker))
+                inserted = len(markers)
+            except BrainFlowError as e:
+                print(f"[{self.name}] Error inserting marker: {e}")
+        else:
+            print("Board is not streaming, cannot insert markers.")
+        wall_times[inserted:] = time.time()
+        self.marker_log.append(markers[:inserted], wall_times[:inserted])
+        self.marker_log.append(markers[inserted:], wall_times[inserted:], in_stream=False)
+        return inserted
+
+    def _observe(self, data, consecutive=False):
+        """
+        Passes a block read from BrainFlow to the health tracker.
+
+        Args:
+            data (numpy.ndarray): Block of board data just read from BrainFlow.
+            consecutive (bool): Whether the block was drained with get_board_data (see StreamHealth.observe()).
+
+        Returns:
+            numpy.ndarray: The same block, so reads can be wrapped in a single expression.
+        """
+        if self.health is not None:
+            self.health.observe(data, consecutive=consecutive)
+        return data
+
+    def get_stream_stats(self):
+        """
+        Returns a snapshot of the stream health: dropped samples, effective sampling rate, buffer fill and read latency.
+
+        Statistics are collected from every read made through this class (including cursors, streams and the
+        acquisition thread), so they describe the data the consumers actually received.
+
+        Returns:
+            dict: Stream statistics, see StreamHealth.snapshot(). Also includes 'buffer_count' (samples currently in
+                the BrainFlow buffer) and 'buffer_fill' (fraction of buffer_size in use; 1.0 means the oldest samples
+                are being overwritten before they are read).
+            None: If the board is not set up or has no timestamp channel.
+        """
+        board = self.board  # may be released by a supervisor meanwhile
+        if board is None or self.health is None:
+            return None
+        stats = self.health.snapshot()
+        try:
+            stats['buffer_count'] = int(board.get_board_data_count())
+        except BrainFlowError:
+            stats['buffer_count'] = None
+        stats['buffer_fill'] = stats['buffer_count'] / self.buffer_size if stats['buffer_count'] is not None else None
+        return stats
+
+    def start_stats_logging(self, interval=5.0):
+        """
+        Starts a background thread that prints a one-line stream health summary every interval seconds.
+
+        Args:
+            interval (float): Seconds between log lines. Default is 5.0.
+        """
+        if self._stats_logging_thread is not None:
+            return
+        self._stats_logging_stop.clear()
+        self._stats_logging_thread = threading.Thread(target=self._stats_logging_loop, args=(interval,),
+                                                      name=f"{self.name} stats", daemon=True)
+        self._stats_logging_thread.start()
+
+    def _stats_logging_loop(self, interval):
+        """
+        Body of the stats logging thread.
+
+        Args:
+            interval (float): Seconds between log lines.
+        """
+        while not self._stats_logging_stop.wait(interval):
+            stats = self.get_stream_stats()
+            if stats is None:
+                continue
+            rate = f"{stats['effective_rate']:.1f}" if stats['effective_rate'] is not None else "n/a"
+            latency = f"{stats['latency_ms']:.0f}" if stats['latency_ms'] is not None else "n/a"
+            fill = f"{stats['buffer_fill'] * 100:.1f}%" if stats['buffer_fill'] is not None else "n/a"
+            print(f"[{self.name}] {stats['samples']} samples | {stats['dropped_samples']} dropped "
+                  f"({stats['gap_events']} gaps) | {rate} Hz | latency {latency} ms "
+                  f"(max {stats['max_latency_ms']:.0f} ms) | buffer {fill}")
+
+    def stop_stats_logging(self):
+        """
+        Stops the stats logging thread.
+        """
+        if self._stats_logging_thread is not None:
+            self._stats_logging_stop.set()
+            self._stats_logging_thread.join()
+            self._stats_logging_thread = None
 
     def stop(self):
         """
@@ -277,6 +929,14 @@ class BrainFlowBoardSetup:
         It also resets the streaming and session flags.
         """
         try:
+            if hasattr(self, 'supervisor'):
+                self.stop_supervisor()  # first, so it does not reconnect the board while it is being stopped
+            if hasattr(self, '_acquisition_thread'):
+                self.stop_acquisition()
+            if hasattr(self, '_stats_logging_thread'):
+                self.stop_stats_logging()
+            if hasattr(self, 'publisher'):
+                self.stop_publishing()
             if hasattr(self, 'board') and self.board is not None:
                 if self.streaming:
                     self.board.stop_stream()
@@ -299,6 +959,657 @@ class BrainFlowBoardSetup:
 
 
 
+class BoardCursor:
+    """
+    A per-consumer read position into the data stream of a BrainFlowBoardSetup instance.
+
+    BrainFlow only offers "the latest N samples" (get_current_board_data) or "everything, and clear the buffer"
+    (get_board_data). A cursor sits between the two: every call to read() returns only the samples that arrived
+    since the previous call, without clearing the shared BrainFlow buffer for other consumers.
+    New samples are identified using the board's timestamp channel, and the number of samples fetched from
+    BrainFlow is estimated from the wall-clock time since the last read, so only a small slice is copied.
+
+    Attributes:
+        board_setup (BrainFlowBoardSetup): The board this cursor reads from.
+        max_samples (int): Maximum number of samples returned by a single read.
+        last_timestamp (float): Timestamp of the newest sample returned so far (None before the first read).
+        samples_read (int): Total number of samples returned by this cursor.
+        overruns (int): Number of reads where older unread samples had already left the BrainFlow buffer.
+    """
+
+    def __init__(self, board_setup, max_samples=None):
+        """
+        Initializes the cursor. Use BrainFlowBoardSetup.create_cursor() rather than calling this directly.
+
+        Args:
+            board_setup (BrainFlowBoardSetup): The board to read from.
+            max_samples (int, optional): Maximum number of samples returned by a single read.
+                Defaults to 10 seconds of data at the board's sampling rate.
+        """
+        if board_setup.timestamp_channel is None:
+            raise ValueError(f"[{board_setup.name}] Board has no timestamp channel, cannot create a cursor.")
+
+        self.board_setup = board_setup
+        self.max_samples = int(max_samples or 10 * (board_setup.sampling_rate or 250))
+        self.last_timestamp = None
+        self.samples_read = 0
+        self.overruns = 0
+        self._consumed_at_last_timestamp = 0  # samples sharing last_timestamp that were already returned
+        self._last_read_time = None
+
+    def _estimate_num_samples(self):
+        """
+        Estimates how many samples to fetch so that all unread samples are included in a single copy.
+
+        Returns:
+            int: Number of samples to request from BrainFlow.
+        """
+        if self._last_read_time is None:
+            return self.max_samples
+        srate = self.board_setup.sampling_rate or 250
+        elapsed = time.perf_counter() - self._last_read_time
+        # 25% headroom plus 100 ms of slack covers jitter in sample delivery and timestamping
+        estimate = int(np.ceil(elapsed * srate * 1.25 + srate * 0.1)) + 1
+        return min(max(estimate, 1), self.max_samples)
+
+    def read(self, channels=None, dtype=None, out=None):
+        """
+        Returns the samples that arrived since the previous read.
+
+        The first read returns up to max_samples of the most recent buffered data. The timestamp row is always used
+        to find the new samples, whatever channels are selected.
+
+        Args:
+            channels (optional): Rows to return, see BrainFlowBoardSetup.resolve_channels(). Defaults to all rows.
+            dtype (numpy.dtype, optional): Data type of the returned array, e.g. np.float32. Defaults to float64.
+            out (numpy.ndarray, optional): Preallocated (n_channels, max_samples) array to copy into.
+
+        Returns:
+            numpy.ndarray: Array of shape (n_rows, n_new_samples); n_new_samples may be 0 (a view of out if given).
+            None: If the board is not set up.
+        """
+        board = self.board_setup.board
+        if board is None:
+            print("Board is not set up.")
+            return None
+
+        num_samples = self._estimate_num_samples()
+        data = self.board_setup._observe(board.get_current_board_data(num_samples))
+        start = self._find_new_start(data)
+
+        # All fetched samples are new, so there may be more unread ones further back in the buffer
+        if start == 0 and self.last_timestamp is not None and num_samples < self.max_samples \
+                and data.shape[1] == num_samples:
+            data = self.board_setup._observe(board.get_current_board_data(self.max_samples))
+            start = self._find_new_start(data)
+
+        if start == 0 and self.last_timestamp is not None and data.shape[1] > 0 \
+                and data[self.board_setup.timestamp_channel, 0] > self.last_timestamp:
+            self.overruns += 1
+
+        new_data = data[:, start:]
+        if out is not None:
+            self.board_setup._check_out(out, new_data.shape[1])  # before the cursor moves past these samples
+        self._last_read_time = time.perf_counter()
+        if new_data.shape[1] > 0:
+            timestamps = new_data[self.board_setup.timestamp_channel]
+            newest = timestamps[-1]
+            same_as_newest = int(np.count_nonzero(timestamps == newest))
+            if newest == self.last_timestamp:
+                self._consumed_at_last_timestamp += same_as_newest
+            else:
+                self._consumed_at_last_timestamp = same_as_newest
+            self.last_timestamp = newest
+            self.samples_read += new_data.shape[1]
+        return self.board_setup._select(new_data, channels, dtype, out)
+
+    def _find_new_start(self, data):
+        """
+        Finds the column index of the first unread sample in a block returned by BrainFlow.
+
+        Args:
+            data (numpy.ndarray): Block of board data, oldest sample first.
+
+        Returns:
+            int: Index of the first sample not yet returned by this cursor.
+        """
+        if self.last_timestamp is None or data.shape[1] == 0:
+            return 0
+        timestamps = data[self.board_setup.timestamp_channel]
+        start = int(np.searchsorted(timestamps, self.last_timestamp, side="right"))
+        # Samples can share a timestamp; skip only the ones already returned by the previous read
+        first_same = int(np.searchsorted(timestamps, self.last_timestamp, side="left"))
+        unread_same = max((start - first_same) - self._consumed_at_last_timestamp, 0)
+        return start - unread_same
+
+    def reset(self):
+        """
+        Resets the cursor so the next read starts again from the most recent buffered data.
+        """
+        self.last_timestamp = None
+        self._consumed_at_last_timestamp = 0
+        self._last_read_time = None
+
+
+
+class StreamHealth:
+    """
+    Tracks the health of a BrainFlow data stream from the blocks read out of it.
+
+    Each sample is accounted for once, even when consumers read overlapping windows: only samples with a timestamp
+    newer than the last one seen are counted. Package numbers of adjacent samples are compared to detect samples
+    lost between the board and BrainFlow (e.g. radio dropouts on the Cyton dongle), and sample timestamps are
+    compared to the wall clock at read time to measure how far behind the consumers are.
+
+    Samples are only compared with their neighbors in the BrainFlow buffer: within a block, and across blocks only
+    for consecutive drains (get_board_data), whose blocks follow each other. Windows read with
+    get_current_board_data may skip samples the board did deliver, so their first sample is not compared with
+    earlier reads. A package number wraps around after package_num_modulus / package_num_step samples, so the
+    timestamps of the two samples are used to count the wraps of longer gaps.
+
+    Attributes:
+        sampling_rate (int): Nominal sampling rate of the board.
+        package_num_modulus (int): Value at which the package number wraps around (256 for OpenBCI boards).
+        package_num_step (int): Package number increment between samples (2 for the Cyton + Daisy, whose samples
+            merge two packets).
+        rate_window (float): Length in seconds of the window used to compute the effective sampling rate.
+    """
+
+    def __init__(self, sampling_rate, timestamp_channel, package_num_channel=None, package_num_modulus=256,
+                 rate_window=5.0, package_num_step=1):
+        """
+        Initializes the tracker.
+
+        Args:
+            sampling_rate (int): Nominal sampling rate of the board.
+            timestamp_channel (int): Row index of the timestamp channel.
+            package_num_channel (int, optional): Row index of the package number channel. Gap detection is
+                disabled if None.
+            package_num_modulus (int): Value at which the package number wraps around. Default is 256.
+            rate_window (float): Seconds of data used for the effective sampling rate. Default is 5.0.
+            package_num_step (int): Package number increment between samples. Default is 1.
+        """
+        self.sampling_rate = sampling_rate
+        self.package_num_modulus = package_num_modulus
+        self.package_num_step = package_num_step
+        self.rate_window = rate_window
+        self._timestamp_channel = timestamp_channel
+        self._package_num_channel = package_num_channel
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Clears all collected statistics.
+        """
+        with self._lock:
+            self._last_timestamp = None
+            self._last_package_num = None  # (package number, timestamp) of the last sample of the last drain
+            self._samples = 0
+            self._dropped = 0
+            self._gap_events = 0
+            self._latency = None
+            self._max_latency = 0.0
+            self._history = deque()  # (newest timestamp, cumulative sample count) per observed block
+
+    def observe(self, data, consecutive=False):
+        """
+        Updates the statistics with a block of data just read from BrainFlow.
+
+        Args:
+            data (numpy.ndarray): Block of board data, oldest sample first.
+            consecutive (bool): Whether the block was drained from BrainFlow (get_board_data), so it directly follows
+                the previous drained block. Default is False (a window of the latest samples).
+        """
+        if data is None or data.shape[1] == 0:
+            return
+        read_time = time.time()  # BrainFlow timestamps are UNIX time in seconds
+        timestamps = data[self._timestamp_channel]
+        with self._lock:
+            start = 0 if self._last_timestamp is None else int(np.searchsorted(timestamps, self._last_timestamp, side="right"))
+
+            if self._package_num_channel is not None:
+                package_nums = data[self._package_num_channel]
+                pair_timestamps = timestamps
+                previous = self._last_package_num if consecutive else None
+                if previous is not None:
+                    package_nums = np.concatenate(([previous[0]], package_nums))
+                    pair_timestamps = np.concatenate(([previous[1]], timestamps))
+                # Only pairs ending on a new sample are counted, so overlapping reads do not count a gap twice
+                first_pair = start if previous is not None else max(start - 1, 0)
+                self._count_missing(package_nums[first_pair:], pair_timestamps[first_pair:])
+                if consecutive:
+                    self._last_package_num = (data[self._package_num_channel, -1], timestamps[-1])
+
+            if start >= timestamps.size:
+                return
+            new_timestamps = timestamps[start:]
+
+            self._samples += new_timestamps.size
+            self._last_timestamp = new_timestamps[-1]
+            self._latency = read_time - new_timestamps[-1]
+            self._max_latency = max(self._max_latency, self._latency)
+
+            self._history.append((new_timestamps[-1], self._samples))
+            while len(self._history) > 2 and self._history[-1][0] - self._history[1][0] >= self.rate_window:
+                self._history.popleft()
+
+    def _count_missing(self, package_nums, timestamps):
+        """
+        Counts the samples missing between adjacent samples, from their package numbers and timestamps.
+
+        Args:
+            package_nums (numpy.ndarray): Package numbers of adjacent samples.
+            timestamps (numpy.ndarray): Their timestamps.
+        """
+        if package_nums.size < 2:
+            return
+        step = self.package_num_step
+        missing = ((np.diff(package_nums) - step) % self.package_num_modulus) // step
+        # A gap of a whole wrap (or more) aliases to fewer missing samples; the elapsed time tells how many wraps
+        period = self.package_num_modulus // step
+        missing_in_time = np.diff(timestamps) * self.sampling_rate - 1
+        wraps = np.maximum(np.round((missing_in_time - missing) / period), 0)
+        missing = missing + wraps * period
+        self._dropped += int(missing.sum())
+        self._gap_events += int(np.count_nonzero(missing))
+
+    def snapshot(self):
+        """
+        Returns the current statistics.
+
+        Returns:
+            dict: With keys 'samples' (samples seen), 'dropped_samples' (samples missing according to package
+                numbers), 'gap_events' (number of discontinuities), 'drop_rate' (dropped / expected),
+                'effective_rate' (samples per second over the last rate_window seconds, None until known),
+                'nominal_rate', 'latency_ms' (age of the newest sample at the last read) and 'max_latency_ms'.
+        """
+        with self._lock:
+            effective_rate = None
+            if len(self._history) >= 2:
+                (t_first, n_first), (t_last, n_last) = self._history[0], self._history[-1]
+                if t_last > t_first:
+                    effective_rate = float((n_last - n_first) / (t_last - t_first))
+            expected = self._samples + self._dropped
+            return {
+                'samples': self._samples,
+                'dropped_samples': self._dropped,
+                'gap_events': self._gap_events,
+                'drop_rate': self._dropped / expected if expected else 0.0,
+                'effective_rate': effective_rate,
+                'nominal_rate': self.sampling_rate,
+                'latency_ms': float(self._latency * 1000) if self._latency is not None else None,
+                'max_latency_ms': float(self._max_latency * 1000),
+            }
+
+
+class MarkerLog:
+    """
+    An in-memory log of the markers inserted into a stream, kept as a growing numpy structured array.
+
+    Each entry holds the marker code, the wall-clock time of the insertion (time.time(), the clock BrainFlow uses for
+    its timestamp channel), an estimate of the stream sample index it lands on and whether it reached the stream.
+    The estimate assumes a constant sampling rate since the stream started; align() replaces it with the exact index
+    found from the timestamp channel of recorded data.
+
+    Attributes:
+        sampling_rate (int): Sampling rate used to estimate sample indices.
+        stream_start_time (float): Wall-clock time the stream started (None before streaming).
+    """
+
+    dtype = np.dtype([("code", np.float64), ("wall_time", np.float64), ("sample_index", np.int64),
+                      ("in_stream", np.bool_)])
+
+    def __init__(self, sampling_rate, capacity=1024):
+        """
+        Initializes an empty log.
+
+        Args:
+            sampling_rate (int): Sampling rate of the stream.
+            capacity (int): Initial number of entries allocated. The log grows as needed. Default is 1024.
+        """
+        self.sampling_rate = sampling_rate
+        self.stream_start_time = None
+        self._entries = np.zeros(capacity, dtype=self.dtype)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def markers(self):
+        """
+        numpy.ndarray: View of the logged entries (fields 'code', 'wall_time', 'sample_index', 'in_stream').
+        """
+        return self._entries[:self._count]
+
+    def append(self, codes, wall_times, in_stream=True):
+        """
+        Appends a batch of markers under a single lock.
+
+        Args:
+            codes (array-like): Marker codes.
+            wall_times (array-like): Wall-clock insertion times, one per code.
+            in_stream (bool): Whether the markers were inserted into the stream. Default is True.
+        """
+        codes = np.atleast_1d(np.asarray(codes, dtype=np.float64))
+        wall_times = np.atleast_1d(np.asarray(wall_times, dtype=np.float64))
+        with self._lock:
+            n = self._count + len(codes)
+            if n > len(self._entries):
+                grown = np.zeros(max(n, 2 * len(self._entries)), dtype=self.dtype)
+                grown[:self._count] = self._entries[:self._count]
+                self._entries = grown
+            block = self._entries[self._count:n]
+            block["code"] = codes
+            block["wall_time"] = wall_times
+            if self.stream_start_time is not None and self.sampling_rate:
+                block["sample_index"] = np.floor((wall_times - self.stream_start_time) * self.sampling_rate)
+            else:
+                block["sample_index"] = -1
+            block["in_stream"] = in_stream
+            self._count = n
+
+    def align(self, timestamps, first_sample_index=0):
+        """
+        Sets the sample index of every logged marker from the timestamp channel of recorded data.
+
+        A marker is assigned to the first sample with a timestamp at or after its insertion time, which is where
+        BrainFlow writes it in the marker channel; markers that share a sample are moved to the following samples, in
+        logging order. Markers outside the data get a sample index of -1.
+
+        Args:
+            timestamps (numpy.ndarray): Timestamp channel of the data, oldest sample first.
+            first_sample_index (int): Sample index of the first timestamp. Default is 0.
+
+        Returns:
+            numpy.ndarray: The aligned sample indices.
+        """
+        with self._lock:
+            markers = self._entries[:self._count]
+            index = np.searchsorted(timestamps, markers["wall_time"], side="left")
+            valid = index < len(timestamps)
+            if len(timestamps):
+                # Markers from before the data started do not belong to it (allow one sample period of jitter)
+                valid &= markers["wall_time"] >= timestamps[0] - 1.0 / (self.sampling_rate or 1)
+            # BrainFlow writes one marker per sample, so markers sharing a sample land on the following ones
+            burst = np.flatnonzero(valid & markers["in_stream"])
+            burst = burst[np.argsort(index[burst], kind="stable")]
+            order = np.arange(len(burst))
+            index[burst] = np.maximum.accumulate(index[burst] - order) + order
+            valid &= index < len(timestamps)
+            markers["sample_index"] = np.where(valid, index + first_sample_index, -1)
+            return markers["sample_index"].copy()
+
+    def to_mne_events(self, timestamps=None, first_sample_index=0):
+        """
+        Returns the logged markers as an MNE events array.
+
+        Args:
+            timestamps (numpy.ndarray, optional): Timestamp channel of the data the events refer to. If given, the
+                sample indices are aligned to it first (see align()); otherwise the estimated indices are used.
+            first_sample_index (int): Sample index of the first timestamp. Default is 0.
+
+        Returns:
+            numpy.ndarray: Integer array of shape (n_events, 3): sample index, 0, marker code. Markers that did not
+                reach the stream or fall outside the data are left out.
+        """
+        if timestamps is not None:
+            self.align(timestamps, first_sample_index)
+        markers = self.markers
+        markers = markers[markers["in_stream"] & (markers["sample_index"] >= 0)]
+        events = np.zeros((len(markers), 3), dtype=np.int64)
+        events[:, 0] = markers["sample_index"]
+        events[:, 2] = markers["code"].astype(np.int64)
+        return events
+
+    def clear(self):
+        """
+        Removes all logged markers.
+        """
+        with self._lock:
+            self._count = 0
+
+
+class RingBuffer:
+    """
+    A fixed-size, preallocated multichannel ring buffer that hands out windows as zero-copy views.
+
+    Every sample is written twice, at position i and i + capacity of a (n_channels, 2 * capacity) array.
+    This way the latest N samples (N <= capacity) are always one contiguous slice, so reading a window never
+    allocates or copies sample data. A view stays valid until the writer has advanced by (capacity - N) samples,
+    so choose a capacity comfortably larger than the longest window you need.
+
+    Attributes:
+        n_channels (int): Number of channels (rows) stored.
+        capacity (int): Number of samples kept per channel.
+        total_written (int): Total number of samples written since creation.
+    """
+
+    def __init__(self, n_channels, capacity, dtype=np.float64, buffer=None):
+        """
+        Allocates the buffer.
+
+        Args:
+            n_channels (int): Number of channels (rows) to store.
+            capacity (int): Number of samples to keep per channel.
+            dtype (numpy.dtype): Data type of the buffer. Default is float64, matching BrainFlow.
+            buffer (numpy.ndarray, optional): Existing (n_channels, 2 * capacity) array to use as storage,
+                e.g. one backed by shared memory. Allocated if not given.
+        """
+        if capacity <= 0:
+            raise ValueError(f"Ring buffer capacity must be positive, got {capacity}.")
+        if buffer is not None and buffer.shape != (n_channels, 2 * capacity):
+            raise ValueError(f"Ring buffer storage must have shape {(n_channels, 2 * capacity)}, got {buffer.shape}.")
+        self.n_channels = n_channels
+        self.capacity = capacity
+        self.total_written = 0
+        self._buffer = buffer if buffer is not None else np.zeros((n_channels, 2 * capacity), dtype=dtype)
+        self._lock = threading.Lock()
+
+    def write(self, block):
+        """
+        Appends a block of samples, overwriting the oldest data when full.
+
+        Args:
+            block (numpy.ndarray): Array of shape (n_channels, n_samples).
+        """
+        n_samples = block.shape[1]
+        with self._lock:
+            skipped = max(n_samples - self.capacity, 0)  # only the newest `capacity` samples can be kept
+            block = block[:, skipped:]
+            head = (self.total_written + skipped) % self.capacity
+            first = min(block.shape[1], self.capacity - head)
+            rest = block.shape[1] - first
+            for offset in (0, self.capacity):
+                self._buffer[:, offset + head:offset + head + first] = block[:, :first]
+                self._buffer[:, offset:offset + rest] = block[:, first:]
+            self.total_written += n_samples
+
+    def latest(self, num_samples):
+        """
+        Returns a read-only view of the most recent samples.
+
+        Args:
+            num_samples (int): Number of recent samples to view.
+
+        Returns:
+            numpy.ndarray: View of shape (n_channels, n) with n = min(num_samples, capacity, total_written).
+        """
+        total_written = self.total_written
+        num_samples = min(num_samples, self.capacity, total_written)
+        end = total_written % self.capacity + self.capacity
+        view = self._buffer[:, end - num_samples:end]
+        view.flags.writeable = False
+        return view
+
+
+class BoardGroup:
+    """
+    Runs several BrainFlowBoardSetup instances as one synchronized acquisition.
+
+    Boards are read in parallel (one worker thread per board) and their samples are aligned on the BrainFlow
+    timestamp channel: the first board is the reference, and for each of its samples the nearest-in-time sample of
+    every other board is taken. Only the time span covered by all boards is returned, as one combined array.
+
+    Attributes:
+        boards (list): The BrainFlowBoardSetup instances in the group.
+        channels (list): Per board, the list of rows included in the combined array (EEG channels by default).
+        board_rows (list): Per board, the slice of rows it occupies in the combined array.
+        skew (dict): Per board name, the median timestamp difference (seconds) to the reference board in the
+            last aligned block. Also reflects the start offset of each stream.
+    """
+
+    def __init__(self, boards, channels=None):
+        """
+        Initializes the group.
+
+        Args:
+            boards (list): BrainFlowBoardSetup instances. The first one is the timing reference.
+            channels (list, optional): Per board, the rows to include. Defaults to each board's EEG channels.
+        """
+        if not boards:
+            raise ValueError("BoardGroup needs at least one board.")
+        self.boards = list(boards)
+        self.channels = [list(c) for c in channels] if channels is not None else [list(b.eeg_channels) for b in self.boards]
+
+        self.board_rows = []
+        start = 0
+        for board_channels in self.channels:
+            self.board_rows.append(slice(start, start + len(board_channels)))
+            start += len(board_channels)
+
+        self.skew = {board.name: 0.0 for board in self.boards}
+
+        from concurrent.futures import ThreadPoolExecutor
+        self._executor = ThreadPoolExecutor(max_workers=len(self.boards), thread_name_prefix="BoardGroup")
+
+    @classmethod
+    def detect(cls, board_id, num_boards, **kwargs):
+        """
+        Finds compatible devices and creates a group with one BrainFlowBoardSetup per device.
+
+        Ports are sorted by serial number so the same physical board gets the same position on every run.
+
+        Args:
+            board_id (int): The ID of the BrainFlow boards to look for.
+            num_boards (int): Number of boards required.
+            **kwargs: Additional keyword arguments passed to each BrainFlowBoardSetup.
+
+        Returns:
+            BoardGroup: The new group (not yet set up).
+            None: If fewer than num_boards compatible devices were found.
+        """
+        detector = BrainFlowBoardSetup(board_id=board_id, name="Detector")
+        compatible_ports = sorted(detector.find_device_ports(), key=lambda p: (p['serial_number'] or '', p['port']))
+        if len(compatible_ports) < num_boards:
+            print(f"Found {len(compatible_ports)} compatible devices, but {num_boards} are required.")
+            return None
+        boards = [BrainFlowBoardSetup(board_id=board_id, serial_port=port_info['port'], name=f"Board {i + 1}", **kwargs)
+                  for i, port_info in enumerate(compatible_ports[:num_boards])]
+        return cls(boards)
+
+    def setup(self):
+        """
+        Sets up and starts streaming on every board in the group.
+
+        Returns:
+            bool: True if all boards are streaming, False otherwise.
+        """
+        for board in self.boards:
+            board.setup()
+        return self.is_streaming()
+
+    def is_streaming(self):
+        """
+        Checks if every board in the group is streaming.
+
+        Returns:
+            bool: True if all boards are streaming, False otherwise.
+        """
+        return all(board.is_streaming() for board in self.boards)
+
+    def get_board_data(self):
+        """
+        Retrieves and clears all accumulated data from every board, aligned into one array.
+
+        Returns:
+            tuple: (combined, timestamps), with combined of shape (n_channels_total, n_samples) and
+                timestamps of shape (n_samples,) taken from the reference board.
+            None: If any board is not set up.
+        """
+        return self._read(lambda board: board.get_board_data())
+
+    def get_current_board_data(self, num_samples):
+        """
+        Retrieves the most recent num_samples from every board without clearing them, aligned into one array.
+
+        Args:
+            num_samples (int): Number of recent samples to fetch from each board.
+
+        Returns:
+            tuple: (combined, timestamps) as for get_board_data(). May hold fewer than num_samples samples if
+                the boards' recent data only partially overlaps in time.
+            None: If any board is not set up.
+        """
+        return self._read(lambda board: board.get_current_board_data(num_samples))
+
+    def _read(self, read_fn):
+        """
+        Reads all boards in parallel with read_fn and aligns the results.
+
+        Args:
+            read_fn (callable): Function taking a BrainFlowBoardSetup and returning its data block.
+
+        Returns:
+            tuple: (combined, timestamps), or None if any board returned no data block.
+        """
+        blocks = list(self._executor.map(read_fn, self.boards))
+        if any(block is None for block in blocks):
+            return None
+        return self._align(blocks)
+
+    def _align(self, blocks):
+        """
+        Aligns per-board data blocks on their timestamp channels.
+
+        Args:
+            blocks (list): Per board, a data block of shape (n_rows, n_samples), oldest sample first.
+
+        Returns:
+            tuple: (combined, timestamps) restricted to the time span covered by every block.
+        """
+        n_channels_total = self.board_rows[-1].stop
+        timestamps = [block[board.timestamp_channel] for board, block in zip(self.boards, blocks)]
+        if any(ts.size == 0 for ts in timestamps):
+            return np.empty((n_channels_total, 0)), np.empty(0)
+
+        overlap_start = max(ts[0] for ts in timestamps)
+        overlap_end = min(ts[-1] for ts in timestamps)
+        reference = timestamps[0]
+        reference = reference[(reference >= overlap_start) & (reference <= overlap_end)]
+
+        combined = np.empty((n_channels_total, reference.size))
+        for board, block, ts, rows, board_channels in zip(self.boards, blocks, timestamps, self.board_rows, self.channels):
+            # Nearest sample in time: compare the neighbours on either side of each reference timestamp
+            right = np.minimum(np.searchsorted(ts, reference), ts.size - 1)
+            left = np.maximum(right - 1, 0)
+            idx = np.where(np.abs(ts[left] - reference) <= np.abs(ts[right] - reference), left, right)
+            combined[rows] = block[board_channels][:, idx]
+            if reference.size > 0:
+                self.skew[board.name] = float(np.median(ts[idx] - reference))
+        return combined, reference
+
+    def stop(self):
+        """
+        Stops streaming and releases the session of every board in the group.
+        """
+        for board in self.boards:
+            board.stop()
+        self._executor.shutdown(wait=False)
+
+
 #######
 # Example streaming from a single board
 ######
@@ -322,6 +1633,25 @@ if __name__ == "__main__":
     brainflow_board.stop()
 
 
+#######
+# Example consuming a single board from an asyncio event loop
+######
+# if __name__ == "__main__":
+#     import asyncio
+
+#     async def main():
+#         brainflow_board = BrainFlowBoardSetup(board_id=BoardIds.CYTON_BOARD.value)
+#         brainflow_board.setup()
+#         n_samples = 0
+#         async for chunk in brainflow_board.stream(chunk_ms=50):
+#             n_samples += chunk.shape[1]
+#             if n_samples >= 5 * brainflow_board.get_sampling_rate():
+#                 break
+#         brainflow_board.stop()
+
+#     asyncio.run(main())
+
+
 ############
 # Example streaming from two boards simultaneously
 ###########
@@ -404,3 +1734,22 @@ if __name__ == "__main__":
 
 #     else:
 #         print("Not enough compatible devices found.")
+
+## Method 3 - BoardGroup: detects the devices, reads them in parallel and aligns them on their timestamps
+# if __name__ == "__main__":
+#     import time
+
+#     board_id_cyton = BoardIds.CYTON_BOARD.value
+
+#     # Find two compatible devices (sorted by serial number, so assignment is consistent between runs)
+#     group = BoardGroup.detect(board_id=board_id_cyton, num_boards=2)
+
+#     if group is not None and group.setup():
+#         # Stream from both boards for 5 seconds
+#         time.sleep(5)
+
+#         # One (16 x n_samples) array: rows group.board_rows[0] from board 1, group.board_rows[1] from board 2
+#         combined, timestamps = group.get_current_board_data(num_samples=1000)
+#         print(f"Combined data: {combined.shape}, inter-board skew (s): {group.skew}")
+
+#         group.stop()
@@ -1,8 +1,8 @@
 import time
 import numpy as np
-from scipy.signal import welch
 import matplotlib.pyplot as plt
 
+from band_power import compute_band_powers  # batched Welch PSD for all channels, cached band weights
 from brainflow_stream import BrainFlowBoardSetup
 import brainflow
 
@@ -11,33 +11,6 @@ def remove_dc_offset(eeg_data: np.ndarray) -> np.ndarray:
     return eeg_data - np.mean(eeg_data, axis=1, keepdims=True)
 
 
-def compute_band_powers(eeg_data: np.ndarray, sfreq: float, bands=None, nperseg: int = 256):
-    if bands is None:
-        bands = {
-            "delta": (1, 4),
-            "theta": (4, 8),
-            "alpha": (8, 12),
-            "beta": (12, 30),
-            "gamma": (30, 100),
-        }
-
-    n_channels = eeg_data.shape[0]
-    band_powers = {band: np.zeros(n_channels) for band in bands}
-
-    for ch in range(n_channels):
-        seg = min(nperseg, eeg_data.shape[1])
-        seg = max(seg, 64)
-        freqs, psd = welch(eeg_data[ch], sfreq, nperseg=seg)
-        for band, (low, high) in bands.items():
-            idx = (freqs >= low) & (freqs <= high)
-            if np.any(idx):
-                band_powers[band][ch] = np.trapezoid(psd[idx], freqs[idx])
-            else:
-                band_powers[band][ch] = 0.0
-
-    return band_powers
-
-
 def main(serial_port: str = None, window_seconds: int = 2, refresh_hz: float = 5.0):
     board_id = brainflow.BoardIds.CYTON_BOARD.value
     setup = BrainFlowBoardSetup(board_id=board_id, serial_port=serial_port, name="Cyton")
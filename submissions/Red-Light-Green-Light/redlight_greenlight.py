@@ -1,3 +1,4 @@
+import functools
 import sys
 import random
 import pygame
@@ -5,23 +6,24 @@ import math
 import os
 import time
 import numpy as np
-import brainflow_stream
 
 # Optional BrainFlow import (graceful fallback if unavailable)
 EEG_AVAILABLE = False
 BrainFlowBoardSetup = None
+BoardGroup = None
 BoardIds = None
 try:
     _this_dir = os.path.dirname(os.path.abspath(__file__))
     _parent_dir = os.path.abspath(os.path.join(_this_dir, os.pardir))
     if _parent_dir not in sys.path:
         sys.path.insert(0, _parent_dir)
-    from brainflow_stream import BrainFlowBoardSetup  # uses your repo helper
+    from brainflow_stream import BrainFlowBoardSetup, BoardGroup  # uses your repo helper
     import brainflow
     from brainflow.board_shim import BoardIds  # correct enum import
     EEG_AVAILABLE = True
 except Exception:
     BrainFlowBoardSetup = None
+    BoardGroup = None
     BoardIds = None
     EEG_AVAILABLE = False
 
@@ -62,32 +64,23 @@ _CAR_IMG_SCALE_CACHE = {}
 def _remove_dc_offset(eeg_data: np.ndarray) -> np.ndarray:
     return eeg_data - np.mean(eeg_data, axis=1, keepdims=True)
 
-try:
-    from scipy.signal import welch
-    SCIPY_AVAILABLE = True
-except ImportError:
-    SCIPY_AVAILABLE = False
-    welch = None
+from band_power import BandPowerEngine
+
+
+@functools.lru_cache(maxsize=8)
+def _alpha_beta_engine(sfreq, nperseg, alpha_band, beta_band):
+    return BandPowerEngine(sfreq, bands={"alpha": alpha_band, "beta": beta_band}, nperseg=nperseg)
+
 
 def _band_power_ratio_fft(eeg_data, sfreq, bands=None, nperseg=1024):
     """
     Compute a single scalar: the alpha:beta power ratio averaged across all channels
-    using Welch's method.
+    using Welch's method (one batched PSD for all channels, see band_power.py).
     """
-    if not SCIPY_AVAILABLE:
-        return 1.0, 1.0, 1.0  # fallback if scipy not available (ratio, alpha_avg, beta_avg)
-        
     if bands is None:
-        bands = {
-            "delta": (1, 4),
-            "theta": (4, 8),
-            "alpha": (8, 12),
-            "beta": (12, 30),
-            "gamma": (30, 100),
-        }
-
-    alpha_band = bands.get("alpha", (8, 12))
-    beta_band = bands.get("beta", (12, 30))
+        bands = {}
+    alpha_band = tuple(bands.get("alpha", (8, 12)))
+    beta_band = tuple(bands.get("beta", (12, 30)))
 
     eeg = np.asarray(eeg_data)
     if eeg.ndim == 1:
@@ -97,25 +90,14 @@ def _band_power_ratio_fft(eeg_data, sfreq, bands=None, nperseg=1024):
     if nperseg <= 1 or sfreq <= 0:
         return 1.0, 1.0, 1.0
 
-    freqs, psd = welch(eeg, fs=sfreq, nperseg=nperseg, axis=1)  # psd: (n_channels, n_freqs)
-
-    def band_power(low, high):
-        mask = (freqs >= low) & (freqs <= high)
-        if not np.any(mask):
-            return np.zeros(psd.shape[0], dtype=float)
-        return np.trapezoid(psd[:, mask], freqs[mask], axis=1)
-
-    alpha_power = band_power(*alpha_band)
-    beta_power = band_power(*beta_band)
+    powers = _alpha_beta_engine(float(sfreq), nperseg, alpha_band, beta_band).compute(eeg)
+    alpha_power, beta_power = powers["absolute"][:, 0], powers["absolute"][:, 1]
 
     # Calculate averages across channels
     alpha_avg = float(np.mean(alpha_power))
     beta_avg = float(np.mean(beta_power))
+    ratio_avg = float(np.mean(powers["ratios"]["alpha/beta"]))  # per-channel ratio, averaged
 
-    epsilon = 1e-12
-    ratios = alpha_power / (beta_power + epsilon)  # per-channel ratio
-    ratio_avg = float(np.mean(ratios))
-    
     return ratio_avg, alpha_avg, beta_avg
 
 # ---------------- Drawing helpers (copied from v2) ---------------- #
@@ -358,7 +340,7 @@ def show_center_text(screen, text, color, font):
     rect = msg.get_rect(center=(WIDTH // 2, HEIGHT // 2))
     screen.blit(msg, rect)
 
-def main(serial_port: str = None):
+def main(serial_port: str = None, serial_port_p2: str = None):
     pygame.init()
     screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
     info = pygame.display.Info()
@@ -475,18 +457,30 @@ def main(serial_port: str = None):
     alpha_ratio_p2_timer = 0
     alpha_ratio_p2_interval = 1500  # Different interval for P2 to make them independent
 
-    # EEG integration (alpha controls P1)
+    # EEG integration (alpha controls P1, and P2 when a second board is given)
     eeg_ready = False
+    p2_eeg_ready = False
     eeg_setup = None
+    eeg_group = None
     sfreq = 0
     eeg_chs = []
 
-    # BrainFlow setup for P1
+    # BrainFlow setup for P1 (and P2)
     if EEG_AVAILABLE:
         try:
             board_id = brainflow.BoardIds.CYTON_BOARD.value
-            eeg_setup = BrainFlowBoardSetup(board_id=board_id, serial_port=serial_port, name="Cyton")
-            eeg_setup.setup()
+            eeg_setup = BrainFlowBoardSetup(board_id=board_id, serial_port=serial_port, name="Cyton P1")
+            if serial_port_p2:
+                # Two headsets: both boards are read in parallel and aligned on their timestamps
+                p2_setup = BrainFlowBoardSetup(board_id=board_id, serial_port=serial_port_p2, name="Cyton P2")
+                eeg_group = BoardGroup([eeg_setup, p2_setup])
+                p2_eeg_ready = eeg_group.setup()
+                if not p2_eeg_ready:
+                    print("P2 board not available - P2 uses test values")
+                    p2_setup.stop()
+                    eeg_group = None
+            else:
+                eeg_setup.setup()
             sfreq = eeg_setup.get_sampling_rate() or 0
             if sfreq > 0:
                 eeg_chs = getattr(eeg_setup, "eeg_channels", []) or list(range(1, 9))
@@ -494,10 +488,14 @@ def main(serial_port: str = None):
                 eeg_ready = True
                 print(f"EEG ready: {sfreq} Hz, channels: {eeg_chs}")
                 print("Alpha/Beta ratio monitoring started...")
+            if p2_eeg_ready:
+                print("P2 EEG ready, inter-board skew is reported with each update")
         except Exception as e:
             print("EEG init failed:", e)
             eeg_setup = None
+            eeg_group = None
             eeg_ready = False
+            p2_eeg_ready = False
     else:
         print("BrainFlow not available - using fallback mode")
 
@@ -560,10 +558,24 @@ def main(serial_port: str = None):
                 eeg_accum_ms += dt
                 if eeg_accum_ms >= eeg_refresh_ms:
                     eeg_accum_ms = 0
-                    data = eeg_setup.get_current_board_data(num_samples=samples_needed)
-                    if data is not None and data.size > 0:
-                        eeg = data[eeg_chs, :]
-                        eeg = _remove_dc_offset(eeg)
+                    eeg_p1 = eeg_p2 = None
+                    if eeg_group is not None:
+                        group_data = eeg_group.get_current_board_data(num_samples=samples_needed)
+                        if group_data is not None and group_data[0].shape[1] > 0:
+                            eeg_p1 = group_data[0][eeg_group.board_rows[0]]
+                            eeg_p2 = group_data[0][eeg_group.board_rows[1]]
+                    else:
+                        data = eeg_setup.get_current_board_data(num_samples=samples_needed)
+                        if data is not None and data.size > 0:
+                            eeg_p1 = data[eeg_chs, :]
+
+                    if eeg_p2 is not None:
+                        ratio_p2, alpha_power_p2, beta_power_p2 = _band_power_ratio_fft(_remove_dc_offset(eeg_p2), sfreq)
+                        alpha_ratio_p2 = ratio_p2
+                        print(f"P2 EEG | Alpha Power: {alpha_power_p2:.3f} | Beta Power: {beta_power_p2:.3f} | Ratio (α/β): {alpha_ratio_p2:.3f} | Skew: {eeg_group.skew[eeg_group.boards[1].name] * 1000:.1f} ms")
+
+                    if eeg_p1 is not None:
+                        eeg = _remove_dc_offset(eeg_p1)
                         ratio, alpha_power, beta_power = _band_power_ratio_fft(eeg, sfreq)  # alpha:beta ratio + individual powers
                         
                         # Fallback for zero/very low alpha ratio - simulate reasonable values
@@ -578,9 +590,9 @@ def main(serial_port: str = None):
                         # Print alpha/beta ratio and individual band powers for debugging
                         print(f"P1 EEG | Alpha Power: {alpha_power:.3f} | Beta Power: {beta_power:.3f} | Ratio (α/β): {alpha_ratio_p1:.3f} | Speed Mult: {max(0.0, min(1.6, alpha_ratio_p1 * 0.5)):.3f}")
 
-            # Update P2 test alpha ratio periodically
+            # Update P2 test alpha ratio periodically (only when P2 has no EEG board)
             alpha_ratio_p2_timer += dt
-            if alpha_ratio_p2_timer >= alpha_ratio_p2_interval:
+            if not p2_eeg_ready and alpha_ratio_p2_timer >= alpha_ratio_p2_interval:
                 alpha_ratio_p2 = random.uniform(0.1, 3.0)
                 alpha_ratio_p2_timer = 0
                 
@@ -847,7 +859,7 @@ def main(serial_port: str = None):
             draw_player(screen, sx - int(player_size * sc * 0.5), sy - int(player_size * sc * 0.8), int(player_size * sc), accent_color=accent, anim_phase=phase, moving=moving)
 
         if light_state == "green":
-            state_text = "GREEN - P1: Alpha/Beta EEG  |  P2: Alpha (TEST)"
+            state_text = "GREEN - P1: Alpha/Beta EEG  |  P2: " + ("Alpha/Beta EEG" if p2_eeg_ready else "Alpha (TEST)")
             state_color = GREEN
         elif light_state == "red":
             state_text = "RED - Do NOT move"
@@ -883,10 +895,14 @@ def main(serial_port: str = None):
         eeg_status = "EEG: Connected" if eeg_ready else "EEG: Fallback"
         eeg_color = P1_ACCENT if eeg_ready else (255, 100, 100)
         screen.blit(font_small.render(f"P1 Speed (α/β: {alpha_ratio_p1:.2f}) - {eeg_status}", True, eeg_color), (bar_x + bar_w + 10, p1_bar_y - 6))
-        screen.blit(font_small.render(f"P2 Speed (α: {alpha_ratio_p2:.2f}) - TEST", True, P2_ACCENT), (bar_x + bar_w + 10, p2_bar_y - 6))
+        p2_label = f"P2 Speed (α/β: {alpha_ratio_p2:.2f}) - EEG: Connected" if p2_eeg_ready else f"P2 Speed (α: {alpha_ratio_p2:.2f}) - TEST"
+        screen.blit(font_small.render(p2_label, True, P2_ACCENT), (bar_x + bar_w + 10, p2_bar_y - 6))
 
         # Mode indicator
-        mode_text = "REAL EEG P1 + TEST P2" if eeg_ready else "FALLBACK MODE - Both Test"
+        if p2_eeg_ready:
+            mode_text = "REAL EEG P1 + REAL EEG P2"
+        else:
+            mode_text = "REAL EEG P1 + TEST P2" if eeg_ready else "FALLBACK MODE - Both Test"
         mode_color = (100, 255, 100) if eeg_ready else (255, 100, 100)
         screen.blit(font_small.render(mode_text, True, mode_color), (10, 80))
 
@@ -900,7 +916,10 @@ def main(serial_port: str = None):
     # EEG cleanup
     if EEG_AVAILABLE and eeg_setup is not None:
         try:
-            eeg_setup.stop()
+            if eeg_group is not None:
+                eeg_group.stop()
+            else:
+                eeg_setup.stop()
         except Exception:
             pass
     pygame.quit()
@@ -910,8 +929,10 @@ if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Red Light Green Light with real EEG alpha/beta control for P1")
     parser.add_argument("--port", type=str, default=None, help="Serial port like \\\\.\\COM3 (Windows) or /dev/ttyUSB0 (Linux)")
+    parser.add_argument("--port2", type=str, default=None, help="Serial port of a second Cyton board for P2 (optional)")
     args = parser.parse_args()
     
     # Try environment variable if no CLI arg
     serial_port = args.port or os.environ.get("BRAIN_PORT")
-    main(serial_port=serial_port)
\ No newline at end of file
+    serial_port_p2 = args.port2 or os.environ.get("BRAIN_PORT_P2")
+    main(serial_port=serial_port, serial_port_p2=serial_port_p2)
\ No newline at end of file